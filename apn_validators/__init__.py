@@ -1,41 +1,46 @@
+import sys
 
-def err_to_list(errors: dict) -> list:
-    """
-    Convert a dictionary of error messages to a single list of error messages.
+from .errors import ValidationError, err_to_list, render_errors
+from .schema import CompiledSchema, compile_schema
 
-    Parameters:
-        errors (dict[list]): A dictionary where keys are field names and values are lists of error messages.
+# imported on first use, like the rules (`csv` and `json` for the streams, the metrics)
+_LAZY = {
+    "Hooks": "instrumentation",
+    "MetricsCollector": "instrumentation",
+    "validate_stream": "stream",
+}
 
-    Returns:
-        list: A list of all error messages. If the input is None, returns None. If the input is a string, returns a list containing the string.
 
-    Example:
-        errors = {
-            'username': ['Username is required', 'Username must be at least 3 characters'],
-            'email': ['Email is invalid'],
-        }
-        error_list = err_to_list(errors)
-        # error_list will be ['Username is required', 'Username must be at least 3 characters', 'Email is invalid']
-    """
-    if errors is None:
-        return []
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    __import__(module, globals(), None, (), 1)
+    value = getattr(sys.modules[__name__ + "." + module], name)
+    globals()[name] = value
+    return value
 
-    if isinstance(errors, str):
-        return [errors]
 
-    error_messages = []
-    for messages in errors.values():
-        error_messages.extend(messages)
-    return error_messages
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
 
 
-def validate(schema: dict, values: dict, is_err_to_list=False):
+def validate(schema: dict, values: dict, is_err_to_list=False, lazy=False, bail=False, max_errors=None):
     """
     Validate the provided values against the specified validation schema.
 
     Parameters:
-        schema (dict): A dictionary where keys are field names and values are lists of validation rule objects.
+        schema (dict | CompiledSchema): A dictionary where keys are field names and values are lists of validation rule objects,
+            nested schemas (dictionaries) or `Each(...)` for lists. The errors of nested fields are keyed by path, e.g. `lines.42.qty`.
+            A nested schema is compiled on every call, use `compile_schema` once to validate many values against it.
         values (dict): A dictionary where keys are field names and values are the values to be validated.
+        is_err_to_list (bool, optional): Return the errors as a single list of messages (default: False).
+        lazy (bool, optional): Keep the `ValidationError` records returned by the rules instead of rendering them to messages.
+            Use `render_errors` or `err_to_list` to get the messages later (default: False).
+        bail (bool, optional): Stop running the rules of a field after its first error, e.g. skip `Email` once
+            `NotBlank` has failed (default: False).
+        max_errors (int, optional): Stop validating the record once this many errors have been collected.
+            `validated` then only has the fields that were reached (default: no limit).
 
     Returns:
         tuple: A tuple containing two dictionaries:
@@ -63,10 +68,29 @@ def validate(schema: dict, values: dict, is_err_to_list=False):
         else:
             print("All values are valid:", validated)
     """
+    if isinstance(schema, CompiledSchema):
+        return schema.validate(values, is_err_to_list, lazy, bail, max_errors)
+    if max_errors is not None and max_errors < 1:
+        raise ValueError("max_errors must be greater than 0")
+
     errors = {}
     validated = {}
+    error_count = 0
 
     for field_name, rules in schema.items():
+        if type(rules) is not list and type(rules) is not tuple:
+            # a nested schema or `Each(...)`, its values are walked by a compiled schema of the field
+            budget = None if max_errors is None else max_errors - error_count
+            compiled = compile_schema({field_name: rules})
+            field_validated, field_errors = compiled.validate(values, False, True, bail, budget)
+            validated.update(field_validated)
+            for path, field_messages in field_errors.items():
+                errors[path] = field_messages
+                error_count += len(field_messages)
+            if error_count == max_errors:
+                break
+            continue
+
         value = values.get(field_name)
         validated[field_name] = value
 
@@ -77,7 +101,89 @@ def validate(schema: dict, values: dict, is_err_to_list=False):
                     errors[field_name] = [error_message]
                 else:
                     errors[field_name].append(error_message)
+                error_count += 1
+                if bail or error_count == max_errors:
+                    break
+        if error_count == max_errors:
+            break
 
     if is_err_to_list:
         errors = err_to_list(errors)
+    elif errors and not lazy:
+        errors = render_errors(errors)
     return validated, errors
+
+
+async def avalidate(schema, values: dict, is_err_to_list=False, concurrency=None, lazy=False):
+    """
+    Validate the provided values against the specified validation schema inside an event loop.
+
+    Rules can be synchronous or have a `validate` method that returns a coroutine, e.g. a rule that
+    checks a database. The asynchronous rules of all fields are awaited concurrently.
+
+    Parameters:
+        schema (dict | CompiledSchema): A dictionary where keys are field names and values are lists of validation rule objects.
+        values (dict): A dictionary where keys are field names and values are the values to be validated.
+        is_err_to_list (bool, optional): Return the errors as a single list of messages (default: False).
+        concurrency (int, optional): The maximum number of asynchronous rules awaited at the same time (default: no limit).
+        lazy (bool, optional): Keep the `ValidationError` records instead of rendering them to messages (default: False).
+
+    Returns:
+        tuple: The same `(validated, errors)` tuple as `validate`.
+
+    Example:
+        validated, err = await avalidate(
+            {"username": [NotBlank(), UniqueRule("users", "username")]},
+            {"username": "agung"},
+            concurrency=10,
+        )
+    """
+    return await compile_schema(schema).avalidate(values, is_err_to_list, concurrency, lazy)
+
+
+def validate_many(
+    schema, rows, is_err_to_list=False, workers=None, chunk_size=1000, lazy=False, bail=False, max_errors=None
+):
+    """
+    Validate many records against the same validation schema.
+
+    The schema is compiled once and reused for every record, so the result is the same as
+    calling `validate` for each record without paying the schema setup on every row.
+
+    Parameters:
+        schema (dict | CompiledSchema): A dictionary where keys are field names and values are lists of validation rule objects.
+        rows (Iterable[dict]): The records to validate.
+        is_err_to_list (bool, optional): Return the errors of each record as a single list of messages (default: False).
+        workers (int, optional): Validate the records in this many worker processes. `None` or `1` validates in the current process (default: None).
+        chunk_size (int, optional): The number of records sent to a worker process at once (default: 1000).
+        lazy (bool, optional): Keep the `ValidationError` records instead of rendering them to messages.
+            Ignored with `workers`, the worker processes always send rendered messages back (default: False).
+        bail (bool, optional): Stop running the rules of a field after its first error (default: False).
+        max_errors (int, optional): Stop validating the batch once this many errors have been collected.
+            The record that reaches the budget is returned partially validated and the remaining rows are skipped (default: no limit).
+
+    Returns:
+        tuple: A tuple containing:
+            - results (list[tuple]): The `(validated, errors)` tuple of each record, in the order of `rows`.
+            - counts (dict): Aggregate counts with the keys `total`, `valid`, `invalid`, `errors` and
+              `aborted` (True when `max_errors` stopped the batch).
+
+    Example:
+        results, counts = validate_many(schema, rows)
+        print("{invalid} of {total} rows are invalid".format_map(counts))
+        for validated, err in results:
+            ...
+
+        # use 8 processes for a large upload
+        results, counts = validate_many(schema, rows, workers=8, chunk_size=5000)
+    """
+    compiled = compile_schema(schema)
+    if workers is None or workers == 1:
+        return compiled.validate_many(rows, is_err_to_list, lazy, bail, max_errors)
+    return compiled.validate_many_parallel(rows, is_err_to_list, workers, chunk_size, bail, max_errors)
+
+
+if sys.version_info < (3, 7):
+    # module level __getattr__ (PEP 562) is not available
+    from .instrumentation import Hooks, MetricsCollector
+    from .stream import validate_stream
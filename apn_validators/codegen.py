@@ -0,0 +1,276 @@
+"""
+Generate the Python source of a validation function specialised for one schema.
+
+The checks of the built-in rules are written inline, with their parameters as constants, in one
+function per schema: a valid value costs no method call and no attribute load. When an inlined
+check fails, the rule's own `validate` is called to build the error, so the errors are the very
+same as without code generation. Other rules (custom rules, `Memoize`, the date and file rules,
+subclasses of the built-in rules) are called as usual, and so are all the rules of a field when
+its value is bytes-like, as the string rules check the bytes without decoding them.
+
+The compiled code is cached by source, schemas with the same rules share it. Use
+`generate_source(schema)` (or `CompiledSchema.source`) to read the generated code; it is also
+registered with `linecache`, so tracebacks show the generated lines.
+"""
+
+import linecache
+import math
+import threading
+from collections import OrderedDict
+
+from .rules.number_validators import (
+    DecimalRange,
+    DigitsBetween,
+    GreaterThen,
+    GreaterThenOrEqual,
+    LessThen,
+    LessThenOrEqual,
+    Numeric,
+    NumberRange,
+)
+from .rules.pattern_validators import Email, MatchRegex, NotMatchRegex
+from .rules.string_validators import (
+    _BYTES_LIKE,
+    DoesntEndsWith,
+    DoesntStartsWith,
+    EndsWith,
+    Equals,
+    InList,
+    Length,
+    MaxLength,
+    MinLength,
+    NotBlank,
+    NotEquals,
+    StartsWith,
+)
+
+_FILENAME = "<apn_validators.codegen {}>"
+_CACHE_SIZE = 256
+
+# the inlined rules that check a bytes-like value otherwise than its `str`
+_BYTES_RULES = frozenset(
+    {Length, MinLength, MaxLength, InList, StartsWith, DoesntStartsWith, EndsWith, DoesntEndsWith, MatchRegex, NotMatchRegex}
+)
+
+# the comparison of the number rules that fails, as in their `validate`
+_THRESHOLDS = {
+    GreaterThenOrEqual: "<",
+    GreaterThen: "<=",
+    LessThenOrEqual: ">",
+    LessThen: ">=",
+}
+
+
+def _run_rules(value, field_name, checks):
+    """Run the rules of a field one by one, return the errors or None."""
+    errors = [error for error in (check(value, field_name) for check in checks) if error is not None]
+    return errors or None
+
+
+class _Writer:
+    """The lines and the constants of the generated function."""
+
+    def __init__(self):
+        self.lines = []
+        self.namespace = {}
+        self.depth = 0
+
+    def emit(self, line, indent=1):
+        self.lines.append("    " * (indent + self.depth) + line if line else "")
+
+    def ref(self, prefix, value):
+        """Return the name of a constant of the namespace."""
+        name = "{}_{}".format(prefix, len(self.namespace))
+        self.namespace[name] = value
+        return name
+
+    def literal(self, value, prefix="const"):
+        """Return `value` as a literal when its repr reads back as the same value, else a constant."""
+        if type(value) in (str, int, bool) or value is None:
+            return repr(value)
+        if type(value) is float and math.isfinite(value):
+            return repr(value)
+        return self.ref(prefix, value)
+
+
+def _inline(rule, writer):
+    """
+    Return `(setup_lines, condition, uses_str)`: the statements and the expression that is True
+    when the rule fails for `v` (`s` is `str(v)` when `uses_str`), or None when the rule is not inlined.
+    """
+    kind = type(rule)
+    literal = writer.literal
+
+    if kind is NotBlank:
+        return [], "v is None or not s.strip()", True
+    if kind is Length:
+        return [], "not ({} <= len(s) <= {})".format(literal(rule.min_length), literal(rule.max_length)), True
+    if kind is MinLength:
+        return [], "v is not None and len(s) < {}".format(literal(rule.min)), True
+    if kind is MaxLength:
+        return [], "v is not None and len(s) > {}".format(literal(rule.max)), True
+    if kind is InList:
+        index = writer.ref("index", rule._index)
+        if rule._normalize is None:
+            return [], "s not in {}".format(index), True
+        return [], "{}(s) not in {}".format(writer.ref("normalize", rule._normalize), index), True
+    if kind in (StartsWith, DoesntStartsWith, EndsWith, DoesntEndsWith):
+        affixes = rule._affixes()
+        if affixes._scan is not None:
+            test = "s.{}({})".format("endswith" if affixes.suffix else "startswith", writer.ref("affixes", affixes._scan))
+        else:
+            test = "{}(s)".format(writer.ref("found", affixes.found))
+        return [], test if kind in (DoesntStartsWith, DoesntEndsWith) else "not " + test, True
+    if kind is Equals or kind is NotEquals:
+        other = literal(str(rule.another_value))
+        return [], "s {} {}".format("!=" if kind is Equals else "==", other), True
+    if kind is DigitsBetween:
+        digits = "s"
+        if not rule.decimal_include:
+            digits = '{}.split(".")[0]'.format(digits)
+        if not rule.dot_include:
+            digits = '{}.replace(".", "")'.format(digits)
+        return [], "not ({} <= len({}) <= {})".format(literal(rule.min), digits, literal(rule.max)), True
+    if kind is DecimalRange:
+        return [], "not {}(s)".format(writer.ref("match", rule._regex.match)), True
+    if kind is MatchRegex:
+        return [], "not {}(v)".format(writer.ref("match", rule._match)), False
+    if kind is NotMatchRegex:
+        return [], "{}(v)".format(writer.ref("match", rule._match)), False
+    if kind is Email:
+        return [], "type(v) is not str or not {}(v)".format(writer.ref("match", rule._regex.match)), False
+
+    if kind is Numeric:
+        test = ["float(v)", "failed = False"]
+    elif kind is NumberRange:
+        test = ["number = float(v)", "failed = number < {} or number > {}".format(literal(rule.min), literal(rule.max))]
+    elif kind in _THRESHOLDS:
+        test = ["failed = float(v) {} {}".format(_THRESHOLDS[kind], literal(rule.threshold))]
+    else:
+        return None
+    # the number rules only catch ValueError, a TypeError (e.g. None) propagates the same way
+    setup = ["try:"] + ["    " + line for line in test] + ["except ValueError:", "    failed = True"]
+    return setup, "failed", False
+
+
+def _generate(schema):
+    """Return the source and the namespace of the validation function of a schema."""
+    writer = _Writer()
+    emit = writer.emit
+    emit("def validate(values):", 0)
+    emit("get = values.get")
+    emit("errors = {}")
+
+    returned = []
+    for position, (field_name, rules) in enumerate(schema):
+        field = writer.literal(field_name, "field") if type(field_name) is str else writer.ref("field", field_name)
+        value = "v{}".format(position)
+        returned.append("{}: {}".format(field, value))
+
+        emit("")
+        # escaped to printable ASCII, a field name cannot end the comment (nor the repr of another key)
+        emit("# {}".format(ascii(field_name if type(field_name) is str else repr(field_name))))
+        emit("v = {} = get({})".format(value, field))
+        inlined = [_inline(rule, writer) for rule in rules]
+        checks = [writer.ref("check", rule.validate) for rule in rules]
+        if any(result is not None and type(rule) in _BYTES_RULES for rule, result in zip(rules, inlined)):
+            # the inlined checks read `str(v)`, the rules check a bytes-like value themselves
+            emit("if type(v) in bytes_like:")
+            emit("e = run_rules(v, {}, [{}])".format(field, ", ".join(checks)), 2)
+            emit("else:")
+            writer.depth = 1
+        emit("e = None")
+        has_str = False
+        for check, result in zip(checks, inlined):
+            if result is None:
+                emit("error = {}(v, {})".format(check, field))
+                emit("if error is not None:")
+                indent = 2
+            else:
+                setup, condition, uses_str = result
+                if uses_str and not has_str:
+                    emit("s = str(v)")
+                    has_str = True
+                for line in setup:
+                    emit(line)
+                emit("if {}:".format(condition))
+                # the rule builds its own error
+                emit("error = {}(v, {})".format(check, field), 2)
+                emit("if error is not None:", 2)
+                indent = 3
+            emit("if e is None:", indent)
+            emit("e = [error]", indent + 1)
+            emit("else:", indent)
+            emit("e.append(error)", indent + 1)
+        writer.depth = 0
+        emit("if e is not None:")
+        emit("errors[{}] = e".format(field), 2)
+
+    emit("")
+    emit("return {{{}}}, errors".format(", ".join(returned)))
+    writer.namespace.update(bytes_like=_BYTES_LIKE, run_rules=_run_rules)
+    return "\n".join(writer.lines) + "\n", writer.namespace
+
+
+# the code of the most recent sources and their file names, the oldest first
+_compiled = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+def _compile(source):
+    """
+    Return the code of a generated source, compiled once. The lines of the cached sources are in
+    `linecache`, they are removed with the code when the source is evicted from the cache.
+    """
+    with _compiled_lock:
+        cached = _compiled.get(source)
+        if cached is not None:
+            _compiled.move_to_end(source)
+            return cached[0]
+
+    filename = _FILENAME.format(hash(source) & 0xFFFFFFFF)
+    code = compile(source, filename, "exec")
+    with _compiled_lock:
+        _compiled[source] = (code, filename)
+        # tracebacks and debuggers read the generated lines from linecache
+        linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+        while len(_compiled) > _CACHE_SIZE:
+            _, (_, evicted) = _compiled.popitem(last=False)
+            linecache.cache.pop(evicted, None)
+    return code
+
+
+def generate_source(schema) -> str:
+    """
+    Return the generated source of the validation function of a schema, to read or debug it.
+
+    Parameters:
+        schema (dict | CompiledSchema): A dictionary where keys are field names and values are lists of validation rule objects.
+
+    Returns:
+        str: The source of a `validate(values)` function returning `(validated, errors)`, the
+        errors being `ValidationError` records. The names such as `check_3` or `index_4` are the
+        rules' methods and data, bound when the function is built.
+
+    Example:
+        print(generate_source({"username": [NotBlank(), Length(min=3, max=20)]}))
+    """
+    if hasattr(schema, "schema"):
+        schema = schema.schema
+    return _generate(tuple((field_name, tuple(rules)) for field_name, rules in schema.items()))[0]
+
+
+def build_validator(schema):
+    """
+    Return the generated validation function of a schema and its source.
+
+    Parameters:
+        schema (tuple): The `(field_name, rules)` pairs of the schema.
+
+    Returns:
+        tuple: `(function, source)`, the function takes the values and returns `(validated, errors)`
+        with unrendered errors.
+    """
+    source, namespace = _generate(schema)
+    exec(_compile(source), namespace)
+    return namespace["validate"], source
@@ -0,0 +1,155 @@
+"""
+Fast parsing of date strings for the date rules.
+
+`datetime.datetime.strptime` is slow: it looks the format up in a locale aware cache and builds a
+`time.struct_time` on every call. A `DateParser` resolves its format once:
+
+- "%Y-%m-%d" strings go to `datetime.date.fromisoformat`,
+- formats made of numeric directives (%Y %y %m %d %H %M %S) are matched with a precompiled regex,
+- any other format falls back to `strptime`.
+
+Every parser also keeps a bounded LRU of the strings it has already parsed.
+"""
+
+import datetime
+import re
+from functools import lru_cache
+
+from .regex_registry import registry
+
+_ISO_DATE = registry.compile(r"\d{4}-\d{2}-\d{2}", re.ASCII)
+
+# the same expressions `_strptime` uses, so both accept exactly the same strings
+_DIRECTIVES = {
+    "d": r"(?P<d>3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9])",
+    "m": r"(?P<m>1[0-2]|0[1-9]|[1-9])",
+    "y": r"(?P<y>\d\d)",
+    "Y": r"(?P<Y>\d\d\d\d)",
+    "H": r"(?P<H>2[0-3]|[0-1]\d|\d)",
+    "M": r"(?P<M>[0-5]\d|\d)",
+    "S": r"(?P<S>6[0-1]|[0-5]\d|\d)",
+}
+
+
+def _format_regex(date_format):
+    """Translate a strptime format to a regex, or return None when it uses another directive."""
+    parts = []
+    index = 0
+    while index < len(date_format):
+        char = date_format[index]
+        if char == "%":
+            directive = date_format[index + 1 : index + 2]
+            if directive == "%":
+                parts.append("%")
+            elif directive in _DIRECTIVES:
+                parts.append(_DIRECTIVES[directive])
+            else:
+                return None
+            index += 2
+        elif char.isspace():
+            while index < len(date_format) and date_format[index].isspace():
+                index += 1
+            parts.append(r"\s+")
+        else:
+            parts.append(re.escape(char))
+            index += 1
+    try:
+        return re.compile("".join(parts), re.IGNORECASE)
+    except re.error:
+        # e.g. a directive used twice, let strptime report it
+        return None
+
+
+class DateParser:
+    """
+    Parse the date strings of one strptime format.
+
+    Attributes:
+        date_format (str): The strptime format.
+        cache_size (int): The maximum number of parsed strings remembered.
+    """
+
+    def __init__(self, date_format: str, cache_size: int = 4096):
+        self.date_format = date_format
+        self.cache_size = cache_size
+
+        self._regex = _format_regex(date_format)
+        if date_format == "%Y-%m-%d":
+            parse = self._parse_iso
+        elif self._regex is not None:
+            parse = self._parse_regex
+        else:
+            parse = self._parse_strptime
+        self.parse = lru_cache(maxsize=cache_size)(parse)
+
+    def __reduce__(self):
+        return DateParser, (self.date_format, self.cache_size)
+
+    def _parse_iso(self, value):
+        if _ISO_DATE.fullmatch(value) is None:
+            # strptime also accepts e.g. "2024-1-5"
+            return self._parse_regex(value)
+        try:
+            return datetime.date.fromisoformat(value)
+        except ValueError:
+            return None
+
+    def _parse_regex(self, value):
+        # match + length check instead of fullmatch, the same way strptime picks its groups
+        found = self._regex.match(value)
+        if found is None or found.end() != len(value):
+            return None
+
+        fields = found.groupdict()
+        if "Y" in fields:
+            year = int(fields["Y"])
+        elif "y" in fields:
+            year = int(fields["y"])
+            year += 2000 if year <= 68 else 1900
+        else:
+            year = 1900
+        try:
+            parsed = datetime.datetime(
+                year,
+                int(fields.get("m", 1)),
+                int(fields.get("d", 1)),
+                int(fields.get("H", 0)),
+                int(fields.get("M", 0)),
+                int(fields.get("S", 0)),
+            )
+        except ValueError:
+            return None
+        return parsed.date()
+
+    def _parse_strptime(self, value):
+        try:
+            return datetime.datetime.strptime(value, self.date_format).date()
+        except ValueError:
+            return None
+
+    def __call__(self, value: str):
+        """
+        Parse a date string.
+
+        Parameters:
+            value (str): The date string.
+
+        Returns:
+            datetime.date or None: The parsed date, None when the string does not match the format.
+        """
+        return self.parse(value)
+
+    def cache_info(self):
+        """Return the `functools.lru_cache` statistics of the parsed strings."""
+        return self.parse.cache_info()
+
+
+_parsers = {}
+
+
+def get_parser(date_format: str) -> DateParser:
+    """Return the `DateParser` of a format, shared by every rule using the same format."""
+    parser = _parsers.get(date_format)
+    if parser is None:
+        parser = _parsers[date_format] = DateParser(date_format)
+    return parser
@@ -0,0 +1,161 @@
+from collections import defaultdict
+from functools import lru_cache
+
+
+def err_to_list(errors: dict) -> list:
+    """
+    Convert a dictionary of error messages to a single list of error messages.
+
+    Parameters:
+        errors (dict[list]): A dictionary where keys are field names and values are lists of error messages or `ValidationError` records.
+
+    Returns:
+        list: A list of all error messages. If the input is None, returns None. If the input is a string, returns a list containing the string.
+
+    Example:
+        errors = {
+            'username': ['Username is required', 'Username must be at least 3 characters'],
+            'email': ['Email is invalid'],
+        }
+        error_list = err_to_list(errors)
+        # error_list will be ['Username is required', 'Username must be at least 3 characters', 'Email is invalid']
+    """
+    if errors is None:
+        return []
+
+    if isinstance(errors, str):
+        return [errors]
+
+    error_messages = []
+    for messages in errors.values():
+        for message in messages:
+            error_messages.append(message.message if type(message) is ValidationError else message)
+    return error_messages
+
+
+def render_errors(errors: dict) -> dict:
+    """
+    Render the error records of a `validate(..., lazy=True)` result into a dictionary of error messages.
+
+    Parameters:
+        errors (dict[list]): A dictionary where keys are field names and values are lists of errors.
+
+    Returns:
+        dict[list[str]]: The same dictionary with every error rendered to its message.
+    """
+    return {
+        field_name: [
+            message.message if type(message) is ValidationError else message
+            for message in messages
+        ]
+        for field_name, messages in errors.items()
+    }
+
+
+class MessageTemplate:
+    """
+    An error message template that is parsed once and rendered many times.
+
+    Renders the same text as `template.format_map(defaultdict(str, **params))`: placeholders
+    without a value are rendered as an empty string.
+    """
+
+    __slots__ = ("source", "_parts")
+
+    def __init__(self, source: str):
+        self.source = source
+        # imported here, `string` imports `re` and the package is imported without it
+        from string import Formatter
+
+        parts = []
+        try:
+            for literal, name, spec, conversion in Formatter().parse(source):
+                if literal:
+                    parts.append(literal)
+                if name is None:
+                    continue
+                if not name.isidentifier() or "{" in spec:
+                    # attribute, index or nested placeholders are left to str.format_map
+                    parts = None
+                    break
+                parts.append((name, spec, conversion))
+        except ValueError:
+            parts = None
+        self._parts = parts
+
+    def render(self, params: dict) -> str:
+        if self._parts is None:
+            return self.source.format_map(defaultdict(str, params))
+
+        rendered = []
+        for part in self._parts:
+            if type(part) is str:
+                rendered.append(part)
+                continue
+            name, spec, conversion = part
+            value = params.get(name, "")
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "s":
+                value = str(value)
+            elif conversion == "a":
+                value = ascii(value)
+            rendered.append(format(value, spec))
+        return "".join(rendered)
+
+
+@lru_cache(maxsize=1024)
+def compile_template(source: str) -> MessageTemplate:
+    """Return the parsed `MessageTemplate` of a message, shared by every rule using the same message."""
+    return MessageTemplate(source)
+
+
+class ValidationError:
+    """
+    A validation failure returned by a rule.
+
+    The message is only rendered the first time it is read (`str(error)` or `error.message`), so
+    building the error is cheap. It compares equal to its rendered message.
+
+    Attributes:
+        rule: The rule object that failed.
+        field (str): The name of the field being validated.
+        code (str): A stable identifier of the failure, e.g. "min_length".
+        params (dict): The values available to the message template.
+    """
+
+    __slots__ = ("rule", "field", "code", "params", "_template", "_message")
+
+    def __init__(self, rule, field: str, code: str, params: dict, template: MessageTemplate):
+        self.rule = rule
+        self.field = field
+        self.code = code
+        self.params = params
+        self._template = template
+        self._message = None
+
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            params = dict(self.params)
+            params.setdefault("field_name", self.field)
+            self._message = self._template.render(params)
+        return self._message
+
+    def __str__(self):
+        return self.message
+
+    def __repr__(self):
+        return "ValidationError(field={!r}, code={!r}, message={!r})".format(
+            self.field, self.code, self.message
+        )
+
+    def __eq__(self, other):
+        if isinstance(other, ValidationError):
+            return self.message == other.message
+        if isinstance(other, str):
+            return self.message == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.message)
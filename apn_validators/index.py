@@ -0,0 +1,297 @@
+"""
+Memory-mapped sorted index of strings for the `InIndex` and `NotInIndex` rules.
+
+An index file holds deduplicated, sorted UTF-8 keys, the offsets of the keys and optionally a
+Bloom filter. It is memory-mapped read-only, so the pages are loaded on demand and shared by every
+process that opens the same file. A lookup bisects a small in-memory sample (one key in 256) and
+then binary searches the keys of one block in the file. The Bloom
+filter answers most lookups of missing values (the common case of a deny-list) without touching
+the keys at all.
+
+Build the file offline with `build_index`, or from a text file with one value per line:
+
+    python -m apn_validators.index domains.txt domains.idx --ignore-case --strip
+
+File layout (little-endian):
+
+    header   magic "APNIDX1\\0", flags (u32), bloom hashes (u32), count (u64), bloom bits (u64)
+    bloom    bloom bits / 8 bytes, padded to 8 bytes
+    offsets  count + 1 offsets (u64) of the keys, relative to the start of the keys
+    keys     the sorted keys
+"""
+
+import argparse
+import array
+import contextlib
+import hashlib
+from bisect import bisect_right
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+
+_MAGIC = b"APNIDX1\0"
+_HEADER = struct.Struct("<8sIIQQ")
+_OFFSET = struct.Struct("<Q")
+
+_IGNORE_CASE = 1
+_STRIP = 2
+
+_SAMPLE_EVERY = 256
+"""Every this many keys, one is kept in memory to narrow the binary search down"""
+
+
+def _strip_casefold(value):
+    return value.strip().casefold()
+
+
+def _normalizer(flags):
+    if flags & _IGNORE_CASE and flags & _STRIP:
+        return _strip_casefold
+    if flags & _IGNORE_CASE:
+        return str.casefold
+    if flags & _STRIP:
+        return str.strip
+    return None
+
+
+def _bloom_hashes(key):
+    # double hashing: the positions are h1 + i * h2, from one 128 bit digest
+    digest = int.from_bytes(hashlib.blake2b(key, digest_size=16).digest(), "little")
+    return digest & 0xFFFFFFFFFFFFFFFF, (digest >> 64) | 1
+
+
+def build_index(values, path, ignore_case=False, strip=False, bloom=True, false_positive_rate=0.01) -> int:
+    """
+    Write the index file of a collection of strings.
+
+    The values are sorted in memory, so building the index of N values needs a few times the size
+    of the values in memory once; opening the index afterwards does not.
+
+    Parameters:
+        values (Iterable[str]): The values of the index. Other values are converted with `str`.
+        path (str | os.PathLike): The path of the index file.
+        ignore_case (bool, optional): Store and look the values up without case (default: False).
+        strip (bool, optional): Ignore the leading and trailing whitespace of the values (default: False).
+        bloom (bool, optional): Add a Bloom filter in front of the sorted keys (default: True).
+        false_positive_rate (float, optional): The false positive rate the Bloom filter is sized for (default: 0.01).
+
+    Returns:
+        int: The number of distinct values written.
+    """
+    flags = (_IGNORE_CASE if ignore_case else 0) | (_STRIP if strip else 0)
+    normalize = _normalizer(flags)
+    keys = set()
+    for value in values:
+        value = str(value)
+        if normalize is not None:
+            value = normalize(value)
+        keys.add(value.encode("utf-8", "surrogatepass"))
+    keys = sorted(keys)
+    count = len(keys)
+
+    bloom_bits = bloom_hashes = 0
+    bloom_array = b""
+    if bloom and count:
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+        bloom_bits = max(64, math.ceil(-count * math.log(false_positive_rate) / math.log(2) ** 2))
+        bloom_bits += -bloom_bits % 64
+        bloom_hashes = max(1, round(bloom_bits / count * math.log(2)))
+        bloom_array = bytearray(bloom_bits // 8)
+        for key in keys:
+            h1, h2 = _bloom_hashes(key)
+            for i in range(bloom_hashes):
+                position = (h1 + i * h2) % bloom_bits
+                bloom_array[position >> 3] |= 1 << (position & 7)
+
+    # written next to the file and renamed over it: a process that has the old file mapped keeps
+    # reading it, truncating a mapped file would crash the process (SIGBUS)
+    path = os.fspath(path)
+    temporary = "{}.{}.{}.tmp".format(path, os.getpid(), threading.get_ident())
+    try:
+        with open(temporary, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, flags, bloom_hashes, count, bloom_bits))
+            file.write(bloom_array)
+            offset = 0
+            offsets = bytearray(_OFFSET.pack(0))
+            for key in keys:
+                offset += len(key)
+                offsets += _OFFSET.pack(offset)
+            file.write(offsets)
+            for key in keys:
+                file.write(key)
+        os.replace(temporary, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temporary)
+        raise
+    return count
+
+
+class SortedIndex:
+    """
+    A read-only, memory-mapped index file written by `build_index`.
+
+    A pickled index only holds the path of the file, so sending it to worker processes is cheap and
+    every worker maps the same pages.
+
+    Attributes:
+        path (str): The path of the index file.
+        ignore_case (bool): The values are looked up without case.
+        strip (bool): The leading and trailing whitespace of the values is ignored.
+
+    Example:
+        domains = SortedIndex("disposable-domains.idx")
+        "mailinator.com" in domains
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < _HEADER.size:
+                raise ValueError("{!r} is not an index file".format(self.path))
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, flags, hashes, count, bits = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            self._map.close()
+            raise ValueError("{!r} is not an index file".format(self.path))
+
+        self.ignore_case = bool(flags & _IGNORE_CASE)
+        self.strip = bool(flags & _STRIP)
+        self._normalize = _normalizer(flags)
+        self._count = count
+        self._bloom_bits = bits
+        self._bloom_hashes = hashes
+        self._bloom_start = _HEADER.size
+        self._offsets_start = self._bloom_start + bits // 8
+        self._keys_start = self._offsets_start + (count + 1) * _OFFSET.size
+
+        offsets = memoryview(self._map)[self._offsets_start : self._keys_start]
+        if sys.byteorder == "little":
+            # read the offsets in place, without a copy
+            self._offsets = offsets.cast("Q")
+        else:
+            self._offsets = array.array("Q", offsets)
+            self._offsets.byteswap()
+            offsets.release()
+
+        keys = self._keys_start
+        self._sample = [
+            self._map[keys + self._offsets[i] : keys + self._offsets[i + 1]]
+            for i in range(0, count, _SAMPLE_EVERY)
+        ]
+
+    def __reduce__(self):
+        return get_index, (self.path,)
+
+    def __repr__(self):
+        return "SortedIndex({!r})".format(self.path)
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, value):
+        if not isinstance(value, str):
+            value = str(value)
+        if self._normalize is not None:
+            value = self._normalize(value)
+        key = value.encode("utf-8", "surrogatepass")
+
+        data = self._map
+        bits = self._bloom_bits
+        if bits:
+            start = self._bloom_start
+            h1, h2 = _bloom_hashes(key)
+            for i in range(self._bloom_hashes):
+                position = (h1 + i * h2) % bits
+                if not data[start + (position >> 3)] >> (position & 7) & 1:
+                    return False
+
+        # the sample gives the block of keys the value can be in, then a binary search in the block
+        block = bisect_right(self._sample, key) - 1
+        if block < 0:
+            return False
+        low = block * _SAMPLE_EVERY
+        high = min(low + _SAMPLE_EVERY, self._count)
+        offsets = self._offsets
+        keys = self._keys_start
+        while low < high:
+            middle = (low + high) >> 1
+            found = data[keys + offsets[middle] : keys + offsets[middle + 1]]
+            if found < key:
+                low = middle + 1
+            elif found > key:
+                high = middle
+            else:
+                return True
+        return False
+
+    def close(self):
+        """Unmap the file."""
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._map.close()
+
+
+# the path of each index file: the modification time and the inode of the file, and its index
+_indexes = {}
+
+
+def get_index(path) -> SortedIndex:
+    """
+    Return the `SortedIndex` of a file, shared by every rule using the same file in this process.
+
+    A file rebuilt since it was opened (another modification time or inode) is opened again, the
+    rules built before keep the index of the old file.
+    """
+    path = os.fspath(path)
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_ino)
+    cached = _indexes.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    index = SortedIndex(path)
+    _indexes[path] = (version, index)
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m apn_validators.index",
+        description="Build the index file of InIndex / NotInIndex from a text file with one value per line.",
+    )
+    parser.add_argument("source", help="the text file, '-' for the standard input")
+    parser.add_argument("output", help="the index file to write")
+    parser.add_argument("--ignore-case", action="store_true", help="look the values up without case")
+    parser.add_argument("--strip", action="store_true", help="ignore leading and trailing whitespace")
+    parser.add_argument("--no-bloom", action="store_true", help="do not add a Bloom filter")
+    parser.add_argument("--false-positive-rate", type=float, default=0.01, help="of the Bloom filter (default: 0.01)")
+    parser.add_argument("--encoding", default="utf-8", help="of the source file (default: utf-8)")
+    args = parser.parse_args(argv)
+
+    if args.source == "-":
+        source = sys.stdin
+    else:
+        source = open(args.source, encoding=args.encoding)
+    try:
+        values = (line.rstrip("\r\n") for line in source)
+        count = build_index(
+            (value for value in values if value),
+            args.output,
+            ignore_case=args.ignore_case,
+            strip=args.strip,
+            bloom=not args.no_bloom,
+            false_positive_rate=args.false_positive_rate,
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print("{} values written to {}".format(count, args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Instrumentation of the validation engine.
+
+A `CompiledSchema` compiled with `hooks=...` calls the hooks around every rule and after every
+record validated with `validate`, `validate_many` or `validate_stream` in the current process.
+Without hooks the engine runs its usual loop, the only cost is one attribute check per call.
+
+`MetricsCollector` is a ready-made set of hooks that counts the calls and failures of every rule
+and keeps latency histograms, to find which rule makes an endpoint slow.
+"""
+
+import contextlib
+import math
+import os
+import threading
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 5e-3, 1e-2, 0.1)
+"""The upper bounds of the latency histograms, in seconds"""
+
+# the indexes of the items of a list in a path, e.g. "lines.42.qty"
+_INDEX = r"(?<=\.)\d+(?=\.|$)"
+
+
+class Hooks:
+    """
+    The hook interface of the validation engine, every method does nothing by default.
+
+    Subclass it and override the methods you need. `schema_name` is the `name` the schema was
+    compiled with (None when it has none). The hooks are called from the validating thread and must be thread safe when
+    a schema is shared between threads.
+
+    Example:
+        class SlowRules(Hooks):
+            def after_rule(self, schema_name, field_name, rule, value, error, elapsed):
+                if elapsed > 0.01:
+                    logger.warning("%s.%s: %s took %.3fs", schema_name, field_name, rule, elapsed)
+
+        signup = compile_schema(schema, hooks=SlowRules(), name="signup")
+    """
+
+    def before_rule(self, schema_name, field_name, rule, value):
+        """Called before a rule validates a value."""
+
+    def after_rule(self, schema_name, field_name, rule, value, error, elapsed):
+        """Called after a rule validated a value, with its result (None or an error) and its time in seconds."""
+
+    def after_record(self, schema_name, validated, errors, elapsed):
+        """Called after a record is validated, with its errors (not rendered yet) and its time in seconds."""
+
+
+class Histogram:
+    """
+    A cumulative latency histogram.
+
+    Attributes:
+        buckets (tuple[float]): The upper bounds of the buckets, in seconds.
+        counts (list[int]): The number of observations of each bucket, the last one counts the
+            observations above every bound.
+        count (int): The number of observations.
+        sum (float): The sum of the observations, in seconds.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def snapshot(self) -> dict:
+        return {
+            "buckets": list(self.buckets),
+            "counts": list(self.counts),
+            "count": self.count,
+            "sum": self.sum,
+        }
+
+
+class _RuleMetrics:
+    __slots__ = ("rule", "name", "calls", "failures", "latency")
+
+    def __init__(self, rule, name, buckets):
+        # keep the rule alive so its id is not reused by another rule
+        self.rule = rule
+        self.name = name
+        self.calls = 0
+        self.failures = 0
+        self.latency = Histogram(buckets)
+
+
+class _SchemaMetrics:
+    __slots__ = ("records", "invalid", "errors", "latency", "rules", "names")
+
+    def __init__(self, buckets):
+        self.records = 0
+        self.invalid = 0
+        self.errors = 0
+        self.latency = Histogram(buckets)
+        # (field name, id of the rule) -> _RuleMetrics, in the order the rules are first seen
+        self.rules = {}
+        # (field name, rule name), to tell apart two rules of the same class in a field
+        self.names = set()
+
+
+class MetricsCollector(Hooks):
+    """
+    Hooks that collect per schema, per field and per rule metrics.
+
+    For every rule: the number of calls, of failures and a latency histogram. For every schema: the
+    number of records, of invalid records, of errors and a latency histogram of whole records. The
+    field metrics are the sums of the metrics of their rules. A schema compiled without a name is
+    reported as "default". The items of a list are counted together: the index of a nested path is
+    replaced by `*`, e.g. `lines.*.qty`.
+
+    Parameters:
+        buckets (tuple[float], optional): The upper bounds of the latency histograms in seconds (default: DEFAULT_BUCKETS).
+
+    Example:
+        metrics = MetricsCollector()
+        signup = compile_schema(schema, hooks=metrics, name="signup")
+        ...
+        metrics.snapshot()["signup"]["fields"]["email"]
+        metrics.write_prometheus("/var/lib/node_exporter/apn_validators.prom")
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        buckets = tuple(buckets)
+        if list(buckets) != sorted(buckets) or not all(map(math.isfinite, buckets)):
+            raise ValueError("buckets must be finite and sorted")
+        self.buckets = buckets
+        self._schemas = {}
+        self._lock = threading.Lock()
+        # compiled by the first collector, the hooks alone do not import `re`
+        from .regex_registry import registry
+
+        self._any_index = registry.compile(_INDEX).sub
+
+    def _schema(self, schema_name):
+        if schema_name is None:
+            schema_name = "default"
+        metrics = self._schemas.get(schema_name)
+        if metrics is None:
+            metrics = self._schemas[schema_name] = _SchemaMetrics(self.buckets)
+        return metrics
+
+    def after_rule(self, schema_name, field_name, rule, value, error, elapsed):
+        if type(field_name) is str and "." in field_name:
+            field_name = self._any_index("*", field_name)
+        with self._lock:
+            schema = self._schema(schema_name)
+            key = (field_name, id(rule))
+            metrics = schema.rules.get(key)
+            if metrics is None:
+                name = base = type(rule).__name__
+                number = 1
+                while (field_name, name) in schema.names:
+                    number += 1
+                    name = "{}_{}".format(base, number)
+                schema.names.add((field_name, name))
+                metrics = schema.rules[key] = _RuleMetrics(rule, name, self.buckets)
+            metrics.calls += 1
+            if error is not None:
+                metrics.failures += 1
+            metrics.latency.observe(elapsed)
+
+    def after_record(self, schema_name, validated, errors, elapsed):
+        with self._lock:
+            schema = self._schema(schema_name)
+            schema.records += 1
+            if errors:
+                schema.invalid += 1
+                schema.errors += sum(map(len, errors.values()))
+            schema.latency.observe(elapsed)
+
+    def reset(self):
+        """Forget every collected metric."""
+        with self._lock:
+            self._schemas.clear()
+
+    def snapshot(self) -> dict:
+        """
+        Return the collected metrics as plain data.
+
+        Returns:
+            dict: `{schema_name: {"records", "invalid", "errors", "latency", "fields": {field_name:
+            {"calls", "failures", "seconds", "rules": {rule_name: {"calls", "failures", "latency"}}}}}}`
+            where every `latency` is a dictionary with the keys `buckets`, `counts`, `count` and `sum`.
+        """
+        with self._lock:
+            report = {}
+            for schema_name, schema in self._schemas.items():
+                fields = {}
+                for (field_name, _), metrics in schema.rules.items():
+                    field = fields.setdefault(field_name, {"calls": 0, "failures": 0, "seconds": 0.0, "rules": {}})
+                    field["calls"] += metrics.calls
+                    field["failures"] += metrics.failures
+                    field["seconds"] += metrics.latency.sum
+                    field["rules"][metrics.name] = {
+                        "calls": metrics.calls,
+                        "failures": metrics.failures,
+                        "latency": metrics.latency.snapshot(),
+                    }
+                report[schema_name] = {
+                    "records": schema.records,
+                    "invalid": schema.invalid,
+                    "errors": schema.errors,
+                    "latency": schema.latency.snapshot(),
+                    "fields": fields,
+                }
+            return report
+
+    def prometheus(self, prefix="apn_validators") -> str:
+        """
+        Return the collected metrics in the Prometheus text exposition format.
+
+        Parameters:
+            prefix (str, optional): The prefix of the metric names (default: "apn_validators").
+
+        Returns:
+            str: The metrics `<prefix>_records_total`, `<prefix>_invalid_records_total`,
+            `<prefix>_errors_total`, `<prefix>_record_duration_seconds`, `<prefix>_rule_calls_total`,
+            `<prefix>_rule_failures_total` and `<prefix>_rule_duration_seconds`.
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append("# HELP {}_{} {}".format(prefix, name, help_text))
+            lines.append("# TYPE {}_{} {}".format(prefix, name, kind))
+            for labels, value in samples:
+                if kind == "histogram":
+                    lines.extend(_histogram_lines("{}_{}".format(prefix, name), labels, value))
+                else:
+                    lines.append("{}_{}{} {}".format(prefix, name, _labels(labels), _number(value)))
+
+        schemas = [({"schema": schema_name}, schema) for schema_name, schema in snapshot.items()]
+        rules = [
+            ({"schema": schema_name, "field": field_name, "rule": rule_name}, metrics)
+            for schema_name, schema in snapshot.items()
+            for field_name, field in schema["fields"].items()
+            for rule_name, metrics in field["rules"].items()
+        ]
+        family("records_total", "counter", "Records validated.", [(labels, s["records"]) for labels, s in schemas])
+        family(
+            "invalid_records_total", "counter", "Records with at least one error.",
+            [(labels, s["invalid"]) for labels, s in schemas],
+        )
+        family("errors_total", "counter", "Errors reported.", [(labels, s["errors"]) for labels, s in schemas])
+        family(
+            "record_duration_seconds", "histogram", "Time to validate a record.",
+            [(labels, s["latency"]) for labels, s in schemas],
+        )
+        family("rule_calls_total", "counter", "Rule calls.", [(labels, r["calls"]) for labels, r in rules])
+        family(
+            "rule_failures_total", "counter", "Rule calls that returned an error.",
+            [(labels, r["failures"]) for labels, r in rules],
+        )
+        family(
+            "rule_duration_seconds", "histogram", "Time of a rule call.",
+            [(labels, r["latency"]) for labels, r in rules],
+        )
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path, prefix="apn_validators"):
+        """
+        Write the metrics in the Prometheus text format to a file, e.g. for the textfile collector of
+        the node exporter. The file is replaced atomically, a scraper never reads a partial file.
+
+        Parameters:
+            path (str | os.PathLike): The path of the file.
+            prefix (str, optional): The prefix of the metric names (default: "apn_validators").
+        """
+        path = os.fspath(path)
+        text = self.prometheus(prefix)
+        temporary = "{}.{}.{}.tmp".format(path, os.getpid(), threading.get_ident())
+        try:
+            with open(temporary, "w", encoding="utf-8") as file:
+                file.write(text)
+            os.replace(temporary, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temporary)
+            raise
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels):
+    return "{" + ",".join('{}="{}"'.format(name, _escape(value)) for name, value in labels.items()) + "}"
+
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def _histogram_lines(name, labels, latency):
+    cumulative = 0
+    for bound, count in zip(latency["buckets"], latency["counts"]):
+        cumulative += count
+        yield "{}_bucket{} {}".format(name, _labels({**labels, "le": repr(float(bound))}), cumulative)
+    yield "{}_bucket{} {}".format(name, _labels({**labels, "le": "+Inf"}), latency["count"])
+    yield "{}_sum{} {}".format(name, _labels(labels), repr(latency["sum"]))
+    yield "{}_count{} {}".format(name, _labels(labels), latency["count"])
@@ -0,0 +1,121 @@
+"""
+Shared registry of compiled regular expressions used by the pattern rules.
+
+Patterns written in code (the `MatchRegex` pattern, the `Email` pattern) are compiled once and kept
+for the life of the process. Patterns built from rule parameters at runtime go through a bounded
+LRU so they cannot grow without limit.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+
+class RegexRegistry:
+    """
+    Compile each regular expression once and share it between rules.
+
+    Attributes:
+        maxsize (int): The maximum number of runtime built patterns kept in the LRU.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._patterns = {}
+        self._dynamic = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._dynamic_hits = 0
+        self._dynamic_misses = 0
+        self._evictions = 0
+
+    def compile(self, pattern, flags: int = 0) -> re.Pattern:
+        """
+        Return the compiled pattern, compiling it the first time it is seen.
+
+        Parameters:
+            pattern (str | bytes | re.Pattern): The regular expression.
+            flags (int, optional): The `re` flags (default: 0).
+
+        Returns:
+            re.Pattern: The compiled pattern.
+        """
+        if isinstance(pattern, re.Pattern):
+            return pattern
+
+        key = (type(pattern), pattern, flags)
+        compiled = self._patterns.get(key)
+        if compiled is not None:
+            self._hits += 1
+            return compiled
+
+        compiled = re.compile(pattern, flags)
+        with self._lock:
+            self._misses += 1
+            self._patterns[key] = compiled
+        return compiled
+
+    def compile_dynamic(self, pattern, flags: int = 0) -> re.Pattern:
+        """
+        Return the compiled pattern of a pattern built at runtime, keeping at most `maxsize` of them.
+
+        Parameters:
+            pattern (str | bytes): The regular expression.
+            flags (int, optional): The `re` flags (default: 0).
+
+        Returns:
+            re.Pattern: The compiled pattern.
+        """
+        key = (type(pattern), pattern, flags)
+        with self._lock:
+            compiled = self._dynamic.get(key)
+            if compiled is not None:
+                self._dynamic.move_to_end(key)
+                self._dynamic_hits += 1
+                return compiled
+
+        compiled = re.compile(pattern, flags)
+        with self._lock:
+            self._dynamic_misses += 1
+            self._dynamic[key] = compiled
+            while len(self._dynamic) > self.maxsize:
+                self._dynamic.popitem(last=False)
+                self._evictions += 1
+        return compiled
+
+    def info(self) -> dict:
+        """
+        Return the hit and miss statistics of the registry.
+
+        Returns:
+            dict: A dictionary with the keys `hits`, `misses`, `size`, `dynamic_hits`, `dynamic_misses`,
+            `dynamic_size`, `maxsize` and `evictions`.
+        """
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "size": len(self._patterns),
+            "dynamic_hits": self._dynamic_hits,
+            "dynamic_misses": self._dynamic_misses,
+            "dynamic_size": len(self._dynamic),
+            "maxsize": self.maxsize,
+            "evictions": self._evictions,
+        }
+
+    def clear(self):
+        """Forget every compiled pattern and reset the statistics."""
+        with self._lock:
+            self._patterns.clear()
+            self._dynamic.clear()
+            self._hits = self._misses = 0
+            self._dynamic_hits = self._dynamic_misses = self._evictions = 0
+
+
+registry = RegexRegistry()
+"""The registry shared by the built-in rules"""
+
+
+def regex_cache_info() -> dict:
+    """Return the hit and miss statistics of the shared regex registry."""
+    return registry.info()
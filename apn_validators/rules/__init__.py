@@ -1,5 +1,75 @@
-from .date_validators import *
-from .file_validators import *
-from .number_validators import *
-from .string_validators import *
-from .pattern_validators import *
\ No newline at end of file
+"""
+The validation rules.
+
+The modules of the rules are imported on first use: `from apn_validators.rules import Email`
+only imports `pattern_validators`, so the date parser, the index files or the nested schemas
+are not loaded by an application that does not use their rules. `from apn_validators.rules
+import *` imports every module, as before.
+"""
+
+import sys
+
+# the public names of the package and the module defining them
+_MODULES = {
+    "base": ("Rule", "RuleRegistry", "rule_registry", "intern_rule"),
+    "date_validators": ("system_today", "RelativeDate", "IsDate", "DateEquals", "DateAfter", "DateBefore"),
+    "file_validators": ("AllowedExtensions",),
+    "number_validators": (
+        "Numeric",
+        "GreaterThenOrEqual",
+        "GreaterThen",
+        "LessThenOrEqual",
+        "LessThen",
+        "Gte",
+        "Gt",
+        "Lte",
+        "Lt",
+        "NumberRange",
+        "DecimalRange",
+        "DigitsBetween",
+    ),
+    "string_validators": (
+        "Length",
+        "MinLength",
+        "MaxLength",
+        "NotBlank",
+        "InList",
+        "NotInList",
+        "DoesntStartsWith",
+        "StartsWith",
+        "DoesntEndsWith",
+        "EndsWith",
+        "Equals",
+        "NotEquals",
+    ),
+    "pattern_validators": ("MatchRegex", "NotMatchRegex", "Password", "Email"),
+    "membership_validators": ("InIndex", "NotInIndex"),
+    "memoize": ("Memoize",),
+    "nested_validators": ("Nested", "Each"),
+}
+
+_LAZY = {name: module for module, names in _MODULES.items() for name in names}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    # __import__ rather than importlib.import_module, `python -X importtime` only reports the former
+    __import__(module, globals(), None, (), 1)
+    value = getattr(sys.modules[__name__ + "." + module], name)
+    # later lookups find the name in the package without calling __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if sys.version_info < (3, 7):
+    # module level __getattr__ (PEP 562) is not available, import every rule
+    for _name in __all__:
+        globals()[_name] = __getattr__(_name)
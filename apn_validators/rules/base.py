@@ -0,0 +1,182 @@
+import copyreg
+import threading
+import weakref
+
+# the flags of a code object with *args and **kwargs, as in `inspect`, which is slow to import
+_CO_VARARGS = 0x04
+_CO_VARKEYWORDS = 0x08
+
+
+def _freeze(value):
+    """Return a hashable form of a rule parameter that tells apart values rendered differently."""
+    if type(value) is str:
+        return value
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(map(_freeze, value)))
+    if isinstance(value, (set, frozenset)):
+        return (type(value), frozenset(map(_freeze, value)))
+    if isinstance(value, dict):
+        return (dict, tuple((key, _freeze(item)) for key, item in value.items()))
+    try:
+        hash(value)
+    except TypeError:
+        # the rule keeps a reference to the value, so its id is stable
+        return (object, id(value))
+    # 1, 1.0 and True are equal but render differently in messages
+    return (type(value), value)
+
+
+def _slots(cls):
+    return [
+        name
+        for klass in reversed(cls.__mro__)
+        for name in klass.__dict__.get("__slots__", ())
+        if name != "__weakref__"
+    ]
+
+
+def _constructor_args(cls):
+    """Return the parameters of `cls.__init__` when they are all attributes of the rule, else None."""
+    code = getattr(cls.__init__, "__code__", None)
+    # *args, **kwargs or keyword-only parameters cannot be passed back positionally
+    if code is None or code.co_kwonlyargcount or code.co_flags & (_CO_VARARGS | _CO_VARKEYWORDS):
+        return None
+    names = code.co_varnames[1 : code.co_argcount]
+    if not set(names) <= set(_slots(cls)):
+        return None
+    return names
+
+
+class Rule:
+    """
+    Base of the built-in rules: compact, immutable and hashable.
+
+    A subclass lists its attributes in `__slots__`. Each attribute can only be set once, in
+    `__init__`, and two rules are equal when they have the same class and the same public
+    attributes (the parameters they were built with). The private attributes are derived from them.
+    A subclass can set `_params` to the attributes compared when they are not all public.
+
+    A rule is pickled as its constructor arguments, the attributes named like the parameters of
+    `__init__`, and the private attributes (indexes, compiled patterns) are built again when it is
+    unpickled. A subclass can set `_args` to the attributes passed to the constructor when they are
+    named otherwise.
+    """
+
+    __slots__ = ("__weakref__",)
+
+    _params = ()
+    _args = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "_params" not in cls.__dict__:
+            cls._params = tuple(
+                name
+                for klass in reversed(cls.__mro__)
+                for name in klass.__dict__.get("__slots__", ())
+                if not name.startswith("_")
+            )
+        if "_args" not in cls.__dict__ and "__init__" in cls.__dict__:
+            cls._args = _constructor_args(cls)
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError("{} is immutable".format(type(self).__name__))
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError("{} is immutable".format(type(self).__name__))
+
+    def _key(self):
+        return (type(self),) + tuple(_freeze(getattr(self, name, None)) for name in self._params)
+
+    def _arguments(self):
+        """Return the arguments of the constructor that builds the rule again."""
+        return tuple(getattr(self, name) for name in self._args)
+
+    def __reduce__(self):
+        if self._args is None:
+            # a constructor whose parameters are not attributes, the attributes are pickled instead
+            state = {name: getattr(self, name) for name in _slots(type(self)) if hasattr(self, name)}
+            return copyreg.__newobj__, (type(self),), (None, state)
+        return type(self), self._arguments()
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self is other or self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+
+class RuleRegistry:
+    """
+    Share one instance between structurally identical rules.
+
+    The registry only holds weak references: a rule is forgotten once no schema uses it anymore.
+    Rules that are not built-in rules (custom rules, `Memoize`) are returned as they are.
+    """
+
+    def __init__(self):
+        self._rules = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def intern(self, rule):
+        """
+        Return the shared instance of a rule.
+
+        Parameters:
+            rule: The rule object.
+
+        Returns:
+            The first registered rule equal to `rule`, or `rule` itself.
+        """
+        if not isinstance(rule, Rule):
+            return rule
+        try:
+            key = rule._key()
+            hash(key)
+        except TypeError:
+            return rule
+
+        with self._lock:
+            shared = self._rules.get(key)
+            if shared is not None:
+                self._hits += 1
+                return shared
+            self._misses += 1
+            self._rules[key] = rule
+        return rule
+
+    def info(self) -> dict:
+        """
+        Return the statistics of the registry.
+
+        Returns:
+            dict: A dictionary with the keys `hits`, `misses` and `size` (the number of live shared rules).
+        """
+        return {"hits": self._hits, "misses": self._misses, "size": len(self._rules)}
+
+    def clear(self):
+        """Forget every shared rule and reset the statistics."""
+        with self._lock:
+            self._rules.clear()
+            self._hits = self._misses = 0
+
+
+rule_registry = RuleRegistry()
+"""The registry used by `intern_rule` and `compile_schema(..., intern=True)`"""
+
+
+def intern_rule(rule):
+    """
+    Return the shared instance of a rule, see `RuleRegistry.intern`.
+
+    Example:
+        Length(min=3, max=20) is not Length(min=3, max=20)
+        intern_rule(Length(min=3, max=20)) is intern_rule(Length(min=3, max=20))
+    """
+    return rule_registry.intern(rule)
@@ -1,70 +1,203 @@
 import datetime
-from collections import defaultdict
+import time
 
+from ..date_parser import get_parser
+from ..errors import ValidationError, compile_template
+from ..regex_registry import registry
+from .base import Rule
 
-def _handler_to_date(target_date, date_format="%Y-%m-%d"):
+_invalid_format = compile_template("Invalid date format: {value}")
+
+_RELATIVE_DATE = registry.compile(r"(today|yesterday|tomorrow)(?:([+-])(\d+)([dw]))?")
+_RELATIVE_BASE = {"today": 0, "yesterday": -1, "tomorrow": 1}
+_RELATIVE_UNIT = {"d": 1, "w": 7}
+
+# the current date and the timestamps of its start and end, published together: a thread never
+# reads the date of one day with the bounds of another
+_today = (None, 0.0, 0.0)
+
+
+def system_today() -> datetime.date:
+    """
+    Return the current local date.
+
+    The date is only computed again when the wall clock crosses midnight, so calling this is a
+    `time.time()` call and two float comparisons.
+    """
+    global _today
+    today, starts_at, ends_at = _today
+    now = time.time()
+    if now >= ends_at or now < starts_at:
+        today = datetime.date.today()
+        midnight = datetime.datetime.combine(today, datetime.time())
+        _today = (today, midnight.timestamp(), (midnight + datetime.timedelta(days=1)).timestamp())
+    return today
+
+
+class RelativeDate:
+    """
+    A target date relative to the current day, e.g. "today", "yesterday", "tomorrow" or "today-30d".
+
+    The date is resolved when it is used, through the clock, and cached until the day changes, so a
+    long-lived rule never compares against a stale date.
+
+    Parameters:
+        expression: (str) "today", "yesterday" or "tomorrow", optionally followed by an offset in days or weeks, e.g. "today-30d", "tomorrow+2w"
+        clock: (callable,optional) a function returning the current datetime.date (default: system_today)
+    """
+
+    def __init__(self, expression: str, clock=None):
+        found = _RELATIVE_DATE.fullmatch(expression)
+        if found is None:
+            raise ValueError("{!r} is not a relative date".format(expression))
+        base, sign, amount, unit = found.groups()
+
+        days = _RELATIVE_BASE[base]
+        if sign is not None:
+            offset = int(amount) * _RELATIVE_UNIT[unit]
+            days += offset if sign == "+" else -offset
+
+        self.expression = expression
+        self.days = days
+        self.clock = clock or system_today
+        # the day of the clock and the target date of that day, published together
+        self._resolved = (None, None)
+
+    @staticmethod
+    def is_relative(expression) -> bool:
+        return isinstance(expression, str) and _RELATIVE_DATE.fullmatch(expression) is not None
+
+    def resolve(self) -> datetime.date:
+        """Return the target date for the current day of the clock."""
+        today = self.clock()
+        day, date = self._resolved
+        if today != day:
+            date = today + datetime.timedelta(days=self.days)
+            self._resolved = (today, date)
+        return date
+
+    def __repr__(self):
+        return "RelativeDate({!r})".format(self.expression)
+
+    def __eq__(self, other):
+        if type(other) is not RelativeDate:
+            return NotImplemented
+        return self.days == other.days and self.clock == other.clock
+
+    def __hash__(self):
+        return hash((self.days, self.clock))
+
+
+def _from_timestamp(value):
+    try:
+        return datetime.datetime.fromtimestamp(value, datetime.timezone.utc).date()
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+def _to_date(parser, value):
+    """
+    Convert a value to a datetime.date in its native form, without a round-trip through a string.
+
+    Strings are parsed with the parser of the rule format, `datetime.datetime` values use their date,
+    `datetime.date` values are used as is and int or float values are read as a UTC epoch timestamp.
+
+    Return:
+        datetime.date or None: the date object, None if the value is not a date
+    """
+    value_type = type(value)
+    if value_type is str:
+        return parser.parse(value)
+    if value_type is datetime.date:
+        return value
+    if value_type is datetime.datetime:
+        return value.date()
+    if value_type is int or value_type is float:
+        return _from_timestamp(value)
+
+    # subclasses, e.g. pandas.Timestamp or a str subclass
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    if isinstance(value, str):
+        return parser.parse(str(value))
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return _from_timestamp(value)
+    return None
+
+
+def _handler_to_date(target_date, date_format="%Y-%m-%d", clock=None):
     """
     Convert the target date to a datetime.date object
     if it is a string then try to convert it to a datetime.date object using the date_format
 
     Parameters:
-        target_date: (datetime.date, str) the date to convert, you can also use special strings like "today", "yesterday","tomorrow"
+        target_date: (datetime.date, datetime.datetime, int, float, str) the date to convert, you can also use special strings like "today", "yesterday","tomorrow" or "today-30d"
         date_format: (str,optional) the date format to validate the date against (default: %Y-%m-%d)
+        clock: (callable,optional) the clock of relative dates (default: system_today)
 
     Return:
-        datetime.date: the date object
-    """
-    if isinstance(target_date, datetime.datetime):
-        return target_date.date()
-    elif isinstance(target_date, str):
-        if target_date == "today":
-            return datetime.date.today()
-        elif target_date == "yesterday":
-            return datetime.date.today() - datetime.timedelta(days=1)
-        elif target_date == "tomorrow":
-            return datetime.date.today() + datetime.timedelta(days=1)
+        datetime.date | RelativeDate: the date object, or a RelativeDate for the relative strings
+    """
+    if isinstance(target_date, RelativeDate):
+        return target_date
+    if isinstance(target_date, str):
+        if RelativeDate.is_relative(target_date):
+            return RelativeDate(target_date, clock)
 
         return datetime.datetime.strptime(target_date, date_format).date()
-    return target_date
 
+    parsed_date = _to_date(get_parser(date_format), target_date)
+    if parsed_date is None:
+        raise TypeError("target_date must be a date, a datetime, an epoch timestamp or a string")
+    return parsed_date
 
-class IsDate:
+
+class IsDate(Rule):
     """
-    must be a valid date
+    must be a valid date: a string in the date format, a datetime.date, a datetime.datetime or an epoch timestamp (UTC)
 
     Parameters:
         date_format: (str,optional) the date format to validate the date against (default: %Y-%m-%d)
         message: (str,optional) the error message to return if the validation fails
     """
 
+    __slots__ = ("date_format", "message", "_template", "_parser")
+
+    cost = 3
+    commutative = False
+    deterministic = True
+
     def __init__(
         self, date_format="%Y-%m-%d", message="field {field_name} is not a valid date"
     ):
         self.message = message
+        self._template = compile_template(message)
         self.date_format = date_format
+        self._parser = get_parser(date_format)
 
     def validate(self, value, field_name):
-        try:
-            datetime.datetime.strptime(value, self.date_format)
-        except ValueError:
-            return self.message.format_map(
-                defaultdict(
-                    str,
-                    field_name=field_name,
-                    date_format=self.date_format,
-                    value=value,
-                )
+        if _to_date(self._parser, value) is None:
+            return ValidationError(
+                self,
+                field_name,
+                "is_date",
+                {"date_format": self.date_format, "value": value},
+                self._template,
             )
 
 
-class DateEquals:
+class DateEquals(Rule):
     """
     Validate that the provided date value is equal to the target date.
+    The value can be a string in the date format, a datetime.date, a datetime.datetime or an epoch timestamp (UTC).
 
     Parameters:
-        target_date: (datetime.date, str) the date to compare against, you can also use the strings "today", "yesterday", "tomorrow" or date in string with specific format
+        target_date: (datetime.date, datetime.datetime, int, float, str) the date to compare against, you can also use the strings "today", "yesterday", "tomorrow" with an optional offset like "today-30d" or "today+2w" (resolved each day), or date in string with specific format
         date_format: (str,optional) the date format to validate the date against (default: %Y-%m-%d)
         message: (str,optional) the error message to return if the validation fails
+        clock: (callable,optional) a function returning the current datetime.date, used by relative targets (default: system_today)
 
     Example:
         DateEquals("2024-12-24") -> the date must be equal to 2024-12-24
@@ -75,43 +208,66 @@ class DateEquals:
         DateEquals(datetime.datetime.strptime("2024/12/12", "%Y/%m/%d"), "%Y/%m/%d") /> the date must be equal to "2024/12/12"
     """
 
+    __slots__ = ("date_format", "message", "_template", "_target_date", "_parser")
+    _params = ("_target_date", "date_format", "message")
+    _args = ("_target_date", "date_format", "message")
+
+    cost = 4
+
     def __init__(
         self,
         target_date: datetime.date | str,
         date_format="%Y-%m-%d",
         message="field {field_name} must be equal to {target_date}",
+        clock=None,
     ) -> None:
         self.message = message
-        self.target_date = _handler_to_date(target_date, date_format)
+        self._template = compile_template(message)
+        self._target_date = _handler_to_date(target_date, date_format, clock)
         self.date_format = date_format
+        self._parser = get_parser(date_format)
+
+    @property
+    def target_date(self) -> datetime.date:
+        target_date = self._target_date
+        if type(target_date) is RelativeDate:
+            return target_date.resolve()
+        return target_date
+
+    @property
+    def deterministic(self) -> bool:
+        # a relative target moves with the clock
+        return type(self._target_date) is not RelativeDate
 
     def validate(self, value, field_name):
-        try:
-            if isinstance(value, datetime.date):
-                value = value.strftime(self.date_format)
-            parsed_date = datetime.datetime.strptime(value, self.date_format).date()
-        except ValueError:
-            return "Invalid date format: {}".format(value)
-        if parsed_date != self.target_date:
-            return self.message.format_map(
-                defaultdict(
-                    str,
-                    field_name=field_name,
-                    target_date=self.target_date,
-                    value=value,
-                    date_format=self.date_format,
-                )
+        parsed_date = _to_date(self._parser, value)
+        if parsed_date is None:
+            return ValidationError(
+                self, field_name, "invalid_date_format", {"value": value}, _invalid_format
+            )
+        target_date = self._target_date
+        if type(target_date) is RelativeDate:
+            target_date = target_date.resolve()
+        if parsed_date != target_date:
+            return ValidationError(
+                self,
+                field_name,
+                "date_equals",
+                {"target_date": target_date, "value": value, "date_format": self.date_format},
+                self._template,
             )
 
 
-class DateAfter:
+class DateAfter(Rule):
     """
     Validate that the provided date value is after the target date.
+    The value can be a string in the date format, a datetime.date, a datetime.datetime or an epoch timestamp (UTC).
 
     Parameters:
-        target_date: (datetime.date, str) the date to compare against, you can also use the strings "today", "yesterday", "tomorrow" or date in string with specific format
+        target_date: (datetime.date, datetime.datetime, int, float, str) the date to compare against, you can also use the strings "today", "yesterday", "tomorrow" with an optional offset like "today-30d" or "today+2w" (resolved each day), or date in string with specific format
         date_format: (str,optional) the date format to validate the date against (default: %Y-%m-%d)
         message: (str,optional) the error message to return if the validation
+        clock: (callable,optional) a function returning the current datetime.date, used by relative targets (default: system_today)
 
     Example:
         DateAfter("2024-12-24") -> the date must be after 2024-12-24
@@ -122,40 +278,66 @@ class DateAfter:
         DateAfter(datetime.datetime.strptime("2024/12/12", "%Y/%m/%d"), "%Y/%m/%d") /> the date must be after 2024/12/12
     """
 
+    __slots__ = ("date_format", "message", "_template", "_target_date", "_parser")
+    _params = ("_target_date", "date_format", "message")
+    _args = ("_target_date", "date_format", "message")
+
+    cost = 4
+
     def __init__(
         self,
         target_date: datetime.date | str,
         date_format="%Y-%m-%d",
         message="field {field_name} must be after {target_date}",
+        clock=None,
     ):
-        self.target_date = _handler_to_date(target_date, date_format)
+        self._target_date = _handler_to_date(target_date, date_format, clock)
         self.date_format = date_format
         self.message = message
+        self._template = compile_template(message)
+        self._parser = get_parser(date_format)
+
+    @property
+    def target_date(self) -> datetime.date:
+        target_date = self._target_date
+        if type(target_date) is RelativeDate:
+            return target_date.resolve()
+        return target_date
+
+    @property
+    def deterministic(self) -> bool:
+        # a relative target moves with the clock
+        return type(self._target_date) is not RelativeDate
 
     def validate(self, value, field_name):
-        try:
-            parsed_date = datetime.datetime.strptime(value, self.date_format).date()
-        except ValueError:
-            return "Invalid date format: {}".format(value)
-
-        if parsed_date <= self.target_date:
-            return self.message.format_map(
-                defaultdict(
-                    str,
-                    field_name=field_name,
-                    target_date=self.target_date,
-                    value=value,
-                )
+        parsed_date = _to_date(self._parser, value)
+        if parsed_date is None:
+            return ValidationError(
+                self, field_name, "invalid_date_format", {"value": value}, _invalid_format
+            )
+
+        target_date = self._target_date
+        if type(target_date) is RelativeDate:
+            target_date = target_date.resolve()
+        if parsed_date <= target_date:
+            return ValidationError(
+                self,
+                field_name,
+                "date_after",
+                {"target_date": target_date, "value": value},
+                self._template,
             )
 
 
-class DateBefore:
+class DateBefore(Rule):
     """
     Validate that the provided date value is before the target date.
+    The value can be a string in the date format, a datetime.date, a datetime.datetime or an epoch timestamp (UTC).
     Parameters:
-        target_date: (datetime.date, str) the date to compare against, you can also use the strings "today", "yesterday", "tomorrow" or date in string with specific format
+        target_date: (datetime.date, datetime.datetime, int, float, str) the date to compare against, you can also use the strings "today", "yesterday", "tomorrow" with an optional offset like "today-30d" or "today+2w" (resolved each day), or date in string with specific format
         date_format: (str,optional) the date format to validate the date against (default: %Y-%m-%d)
         message: (str,optional) the error message to return if the validation
+        clock: (callable,optional) a function returning the current datetime.date, used by relative targets (default: system_today)
 
     Example:
         DateBefore("2024-12-24") -> the date must be before 2024-12-24
@@ -166,28 +348,52 @@ class DateBefore:
         DateBefore(datetime.datetime.strptime("2024/12/12", "%Y/%m/%d"), "%Y/%m/%d") /> the date must be before 2024/12/12
     """
 
+    __slots__ = ("date_format", "message", "_template", "_target_date", "_parser")
+    _params = ("_target_date", "date_format", "message")
+    _args = ("_target_date", "date_format", "message")
+
+    cost = 4
+
     def __init__(
         self,
         target_date: datetime.date | str,
         date_format="%Y-%m-%d",
         message="field {field_name} must be before {target_date}",
+        clock=None,
     ):
-        self.target_date = _handler_to_date(target_date, date_format)
+        self._target_date = _handler_to_date(target_date, date_format, clock)
         self.date_format = date_format
         self.message = message
+        self._template = compile_template(message)
+        self._parser = get_parser(date_format)
+
+    @property
+    def target_date(self) -> datetime.date:
+        target_date = self._target_date
+        if type(target_date) is RelativeDate:
+            return target_date.resolve()
+        return target_date
+
+    @property
+    def deterministic(self) -> bool:
+        # a relative target moves with the clock
+        return type(self._target_date) is not RelativeDate
 
     def validate(self, value, field_name):
-        try:
-            parsed_date = datetime.datetime.strptime(value, self.date_format).date()
-        except ValueError:
-            return "Invalid date format: {}".format(value)
-
-        if parsed_date >= self.target_date:
-            return self.message.format_map(
-                defaultdict(
-                    str,
-                    field_name=field_name,
-                    target_date=self.target_date,
-                    value=value,
-                )
+        parsed_date = _to_date(self._parser, value)
+        if parsed_date is None:
+            return ValidationError(
+                self, field_name, "invalid_date_format", {"value": value}, _invalid_format
+            )
+
+        target_date = self._target_date
+        if type(target_date) is RelativeDate:
+            target_date = target_date.resolve()
+        if parsed_date >= target_date:
+            return ValidationError(
+                self,
+                field_name,
+                "date_before",
+                {"target_date": target_date, "value": value},
+                self._template,
             )
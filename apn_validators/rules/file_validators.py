@@ -1,7 +1,8 @@
-from collections import defaultdict
+from ..errors import ValidationError, compile_template
+from .base import Rule
 
 
-class AllowedExtensions:
+class AllowedExtensions(Rule):
     """
     Validate that a file has a valid extension.
 
@@ -9,6 +10,11 @@ class AllowedExtensions:
         allowed_extensions (list, optional): A set of allowed file extensions in lowercase (default: {"png", "jpg", "jpeg"}).
     """
 
+    __slots__ = ("allowed_extensions", "message", "_template")
+
+    cost = 2
+    deterministic = True
+
     def __init__(
         self,
         allowed_extensions=None,
@@ -16,6 +22,7 @@ class AllowedExtensions:
     ):
         self.allowed_extensions = allowed_extensions or ("png", "jpg", "jpeg")
         self.message = message
+        self._template = compile_template(message)
 
     def validate(self, file_name, field_name):
         """
@@ -41,11 +48,13 @@ class AllowedExtensions:
         ):
             return None
 
-        return self.message.format_map(
-            defaultdict(
-                str, field_name=field_name, allowed_extensions=self.allowed_extensions
+        return ValidationError(
+                self,
+                field_name,
+                "allowed_extensions",
+                {"allowed_extensions": self.allowed_extensions},
+                self._template,
             )
-        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,100 @@
+from ..errors import ValidationError, compile_template
+from ..index import SortedIndex, get_index
+from .base import Rule
+
+
+def _open(index):
+    if isinstance(index, SortedIndex):
+        return index
+    return get_index(index)
+
+
+class InIndex(Rule):
+    """
+    Validator to check if a value is present in an index file, for allow-lists too large for `InList`.
+
+    The index file is built offline with `apn_validators.index.build_index` or
+    `python -m apn_validators.index`, and memory-mapped when the rule is created. The value is
+    compared as a string, with the case and whitespace options the index was built with.
+
+    Attributes:
+        index (SortedIndex): The index, from a path or a `SortedIndex`.
+        message (str): The error message to be used if the validation fails.
+    """
+
+    __slots__ = ("index", "message", "_template")
+
+    cost = 3
+    deterministic = True
+
+    def __init__(self, index, message="field {field_name} is not an allowed value"):
+        self.index = _open(index)
+        self.message = message
+        self._template = compile_template(message)
+
+    def validate(self, value, field_name: str):
+        """
+        Validate that the given value is present in the index.
+
+        Parameters:
+            value (str): The value to validate.
+            field_name (str): The name of the field being validated.
+
+        Returns:
+            ValidationError or None: The error if validation fails, None otherwise.
+        """
+        if value not in self.index:
+            return ValidationError(
+                self,
+                field_name,
+                "in_index",
+                {"value": value, "index": self.index.path},
+                self._template,
+            )
+        return None
+
+
+class NotInIndex(Rule):
+    """
+    Validator to check if a value is not present in an index file, for deny-lists too large for `NotInList`.
+
+    The index file is built offline with `apn_validators.index.build_index` or
+    `python -m apn_validators.index`, and memory-mapped when the rule is created. The value is
+    compared as a string, with the case and whitespace options the index was built with. Most
+    values are not in a deny-list, the Bloom filter of the index answers them without a search.
+
+    Attributes:
+        index (SortedIndex): The index, from a path or a `SortedIndex`.
+        message (str): The error message to be used if the validation fails.
+    """
+
+    __slots__ = ("index", "message", "_template")
+
+    cost = 3
+    deterministic = True
+
+    def __init__(self, index, message="field {field_name} is not allowed"):
+        self.index = _open(index)
+        self.message = message
+        self._template = compile_template(message)
+
+    def validate(self, value, field_name: str):
+        """
+        Validate that the given value is not in the index.
+
+        Parameters:
+            value (str): The value to validate.
+            field_name (str): The name of the field being validated.
+
+        Returns:
+            ValidationError or None: The error if validation fails, None otherwise.
+        """
+        if value in self.index:
+            return ValidationError(
+                self,
+                field_name,
+                "not_in_index",
+                {"value": value, "index": self.index.path},
+                self._template,
+            )
+        return None
@@ -0,0 +1,164 @@
+import datetime
+import threading
+import time
+from collections import OrderedDict
+
+# equal values of these types always give the same outcome and the same message, unlike e.g.
+# -0.0 and 0.0, Decimal("1.0") and Decimal("1.00") or aware datetimes in two time zones
+_MEMO_TYPES = frozenset({str, bytes, int, bool, type(None), datetime.date})
+
+_MISSING = object()
+
+
+class Memoize:
+    """
+    Remember the outcome of a rule for the values it has already validated.
+
+    Useful for low-cardinality fields (country codes, statuses, email domains, date strings) checked
+    by an expensive rule. The outcome is kept in a bounded LRU, optionally for a limited time, keyed
+    by the value and the field name. A cached outcome is the very object the rule returned.
+
+    Only values of type str, bytes, int, bool, None or datetime.date are remembered, other values
+    (unhashable ones included) are passed to the rule every time.
+
+    The rule must declare `deterministic = True`: the same value always gives the same outcome.
+    The built-in rules do, except the date rules with a relative target such as "today".
+
+    Parameters:
+        rule: The rule to memoize.
+        maxsize (int, optional): The maximum number of remembered values (default: 4096).
+        ttl (float, optional): Forget an outcome after this many seconds (default: never).
+        timer (callable, optional): The clock of `ttl`, in seconds (default: time.monotonic).
+
+    Raises:
+        ValueError: If the rule is not deterministic.
+
+    Example:
+        {"email": [NotBlank(), Memoize(Email(), maxsize=10000)]}
+    """
+
+    __slots__ = (
+        "rule",
+        "maxsize",
+        "ttl",
+        "timer",
+        "cost",
+        "commutative",
+        "validate",
+        "_check",
+        "_cache",
+        "_lock",
+        "_hits",
+        "_misses",
+        "_evictions",
+        "_expirations",
+    )
+
+    deterministic = True
+
+    def __init__(self, rule, maxsize: int = 4096, ttl: float = None, timer=time.monotonic):
+        if not getattr(rule, "deterministic", False):
+            raise ValueError(
+                "{} is not deterministic and cannot be memoized, set deterministic = True on the rule "
+                "if the same value always gives the same outcome".format(type(rule).__name__)
+            )
+        if maxsize < 1:
+            raise ValueError("maxsize must be greater than 0")
+
+        self.rule = rule
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.cost = getattr(rule, "cost", None)
+        self.commutative = getattr(rule, "commutative", True)
+
+        self._check = rule.validate
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self.validate = self._validate if ttl is None else self._validate_ttl
+
+    def __reduce__(self):
+        return Memoize, (self.rule, self.maxsize, self.ttl, self.timer)
+
+    def __repr__(self):
+        return "Memoize({!r}, maxsize={!r}, ttl={!r})".format(self.rule, self.maxsize, self.ttl)
+
+    def _store(self, key, outcome):
+        cache = self._cache
+        with self._lock:
+            self._misses += 1
+            cache[key] = outcome
+            # an expired entry (or one another thread stored) is refreshed as the most recent one
+            cache.move_to_end(key)
+            while len(cache) > self.maxsize:
+                cache.popitem(last=False)
+                self._evictions += 1
+
+    def _validate(self, value, field_name):
+        value_type = type(value)
+        if value_type not in _MEMO_TYPES:
+            return self._check(value, field_name)
+
+        key = (value_type, value, field_name)
+        outcome = self._cache.get(key, _MISSING)
+        if outcome is not _MISSING:
+            self._hits += 1
+            try:
+                self._cache.move_to_end(key)
+            except KeyError:
+                # evicted by another thread in the meantime
+                pass
+            return outcome
+
+        outcome = self._check(value, field_name)
+        self._store(key, outcome)
+        return outcome
+
+    def _validate_ttl(self, value, field_name):
+        value_type = type(value)
+        if value_type not in _MEMO_TYPES:
+            return self._check(value, field_name)
+
+        key = (value_type, value, field_name)
+        now = self.timer()
+        entry = self._cache.get(key)
+        if entry is not None:
+            outcome, expires_at = entry
+            if now < expires_at:
+                self._hits += 1
+                try:
+                    self._cache.move_to_end(key)
+                except KeyError:
+                    pass
+                return outcome
+            self._expirations += 1
+
+        outcome = self._check(value, field_name)
+        self._store(key, (outcome, now + self.ttl))
+        return outcome
+
+    def cache_info(self) -> dict:
+        """
+        Return the statistics of the memo.
+
+        Returns:
+            dict: A dictionary with the keys `hits`, `misses`, `evictions`, `expirations`, `size` and `maxsize`.
+        """
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "size": len(self._cache),
+            "maxsize": self.maxsize,
+        }
+
+    def cache_clear(self):
+        """Forget every remembered outcome and reset the statistics."""
+        with self._lock:
+            self._cache.clear()
+            self._hits = self._misses = self._evictions = self._expirations = 0
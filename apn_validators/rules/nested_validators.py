@@ -0,0 +1,111 @@
+from collections.abc import Mapping
+
+from ..errors import ValidationError, compile_template
+from ..schema import _EACH, _NESTED, _RULES
+from ..schema import compile_schema as _compile_schema
+from .base import Rule
+
+
+def _node(spec):
+    """Return the `(kind, payload)` the engine walks for a field or an item of a schema."""
+    if isinstance(spec, (list, tuple)):
+        return _RULES, tuple(spec)
+    if isinstance(spec, Each):
+        return _EACH, spec
+    if isinstance(spec, Nested):
+        return _NESTED, spec
+    return _NESTED, Nested(spec)
+
+
+class Nested(Rule):
+    """
+    Validate an object (a dictionary) against a schema of its own.
+
+    A dictionary in a schema is the same as `Nested(dictionary)`, use `Nested` for another message.
+    The errors of the fields of the object are reported with their path, e.g. `customer.email`.
+    A missing object (None) is validated as an empty one, so its required fields are reported.
+
+    Attributes:
+        schema (dict | CompiledSchema): The schema of the object.
+        message (str): The error message if the value is not an object.
+
+    Example:
+        {
+            "customer": {"name": [NotBlank()], "email": [NotBlank(), Email()]},
+            "billing": Nested({"country": [InList(["ID", "SG"])]}, message="{field_name} is required"),
+        }
+    """
+
+    __slots__ = ("schema", "message", "_template", "_schema")
+
+    cost = 1
+    commutative = False
+    deterministic = True
+
+    def __init__(self, schema, message="field {field_name} must be an object"):
+        self.schema = schema
+        self.message = message
+        self._template = compile_template(message)
+        self._schema = _compile_schema(schema)
+
+    def validate(self, value, field_name: str):
+        """
+        Validate that the value is an object, its fields are validated by the engine.
+
+        Parameters:
+            value (dict): The value to validate.
+            field_name (str): The path of the field being validated.
+
+        Returns:
+            ValidationError or None: The error if the value is neither a mapping nor None, None otherwise.
+        """
+        if value is None or isinstance(value, Mapping):
+            return None
+        return ValidationError(self, field_name, "nested", {"value": value}, self._template)
+
+
+class Each(Rule):
+    """
+    Validate every item of a list, with a list of rules or with a schema for lists of objects.
+
+    The errors of the items are reported with their index, e.g. `lines.42.qty` or `tags.3`. A
+    missing list (None) has no items. With `max_errors` the engine stops at the item that uses up
+    the budget, the following items are not validated.
+
+    Attributes:
+        items (list | dict | CompiledSchema | Nested | Each): The rules of an item, or the schema of an object item.
+        message (str): The error message if the value is not a list.
+
+    Example:
+        {
+            "tags": Each([NotBlank(), MaxLength(20)]),
+            "lines": Each({"sku": [NotBlank()], "qty": [Numeric(), Gte(1)]}),
+        }
+    """
+
+    __slots__ = ("items", "message", "_template", "_kind", "_payload")
+
+    cost = 1
+    commutative = False
+    deterministic = True
+
+    def __init__(self, items, message="field {field_name} must be a list"):
+        self.items = items
+        self.message = message
+        self._template = compile_template(message)
+        self._kind, self._payload = _node(items)
+
+    def validate(self, value, field_name: str):
+        """
+        Validate that the value is a list, its items are validated by the engine.
+
+        Parameters:
+            value (list): The value to validate.
+            field_name (str): The path of the field being validated.
+
+        Returns:
+            ValidationError or None: The error if the value is neither a list, a tuple nor None, None otherwise.
+        """
+        if value is None or isinstance(value, (list, tuple)):
+            return None
+        return ValidationError(self, field_name, "each", {"value": value}, self._template)
@@ -1,24 +1,32 @@
-import re
-from collections import defaultdict
+from ..errors import ValidationError, compile_template
+from ..regex_registry import registry
+from .base import Rule
 
 
-class Numeric:
+class Numeric(Rule):
     """check if the value is a number"""
 
+    __slots__ = ("message", "_template")
+
+    cost = 2
+    commutative = False
+    deterministic = True
+
     def __init__(self, message="{field_name} only accept numbers") -> None:
         self.message = message
+        self._template = compile_template(message)
 
     def validate(self, value, field_name):
         try:
             float(value)
             return None
         except ValueError:
-            return self.message.format_map(
-                defaultdict(str, field_name=field_name, value=value)
+            return ValidationError(
+                self, field_name, "numeric", {"value": value}, self._template
             )
 
 
-class GreaterThenOrEqual:
+class GreaterThenOrEqual(Rule):
     """
     Validator to check if a value is greater than or equal a specified threshold.
 
@@ -27,6 +35,11 @@ class GreaterThenOrEqual:
         message (str): The error message to be used if the validation fails.
     """
 
+    __slots__ = ("threshold", "message", "_template")
+
+    cost = 2
+    deterministic = True
+
     def __init__(
         self,
         threshold: float,
@@ -34,6 +47,7 @@ class GreaterThenOrEqual:
     ):
         self.threshold = threshold
         self.message = message
+        self._template = compile_template(message)
 
     def validate(self, value: float, field_name: str):
         """
@@ -44,26 +58,27 @@ class GreaterThenOrEqual:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
-
-        error_message = self.message.format_map(
-            defaultdict(
-                str,
-                field_name=field_name,
-                value=value,
-                threshold=self.threshold,
-            )
-        )
         try:
-            value = float(value)
-            if value < self.threshold:
-                return error_message
+            number = float(value)
+            if number < self.threshold:
+                return self._error(value, field_name)
         except ValueError:
-            return error_message
+            return self._error(value, field_name)
+        return None
 
+    def _error(self, value, field_name):
+        return ValidationError(
+            self,
+            field_name,
+            "greater_then_or_equal",
+            {"value": value, "threshold": self.threshold},
+            self._template,
+        )
 
-class GreaterThen:
+
+class GreaterThen(Rule):
     """
     Validator to check if a value is greater than a specified threshold.
 
@@ -72,6 +87,11 @@ class GreaterThen:
         message (str): The error message to be used if the validation fails.
     """
 
+    __slots__ = ("threshold", "message", "_template")
+
+    cost = 2
+    deterministic = True
+
     def __init__(
         self,
         threshold: float,
@@ -79,6 +99,7 @@ class GreaterThen:
     ):
         self.threshold = threshold
         self.message = message
+        self._template = compile_template(message)
 
     def validate(self, value: float, field_name: str):
         """
@@ -89,25 +110,27 @@ class GreaterThen:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
-        error_message = self.message.format_map(
-            defaultdict(
-                str,
-                field_name=field_name,
-                value=value,
-                threshold=self.threshold,
-            )
-        )
         try:
-            value = float(value)
-            if value <= self.threshold:
-                return error_message
+            number = float(value)
+            if number <= self.threshold:
+                return self._error(value, field_name)
         except ValueError:
-            return error_message
+            return self._error(value, field_name)
+        return None
+
+    def _error(self, value, field_name):
+        return ValidationError(
+            self,
+            field_name,
+            "greater_then",
+            {"value": value, "threshold": self.threshold},
+            self._template,
+        )
 
 
-class LessThenOrEqual:
+class LessThenOrEqual(Rule):
     """
     Validator to check if a value is less than or equal a specified threshold.
 
@@ -116,6 +139,11 @@ class LessThenOrEqual:
         message (str): The error message to be used if the validation fails.
     """
 
+    __slots__ = ("threshold", "message", "_template")
+
+    cost = 2
+    deterministic = True
+
     def __init__(
         self,
         threshold: float,
@@ -123,6 +151,7 @@ class LessThenOrEqual:
     ):
         self.threshold = threshold
         self.message = message
+        self._template = compile_template(message)
 
     def validate(self, value: float, field_name: str):
         """
@@ -133,25 +162,27 @@ class LessThenOrEqual:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
-        error_message = self.message.format_map(
-            defaultdict(
-                str,
-                field_name=field_name,
-                value=value,
-                threshold=self.threshold,
-            )
-        )
         try:
-            value = float(value)
-            if value > self.threshold:
-                return error_message
+            number = float(value)
+            if number > self.threshold:
+                return self._error(value, field_name)
         except ValueError:
-            return error_message
+            return self._error(value, field_name)
+        return None
+
+    def _error(self, value, field_name):
+        return ValidationError(
+            self,
+            field_name,
+            "less_then_or_equal",
+            {"value": value, "threshold": self.threshold},
+            self._template,
+        )
 
 
-class LessThen:
+class LessThen(Rule):
     """
     Validator to check if a value is less than a specified threshold.
 
@@ -160,6 +191,11 @@ class LessThen:
         message (str): The error message to be used if the validation fails.
     """
 
+    __slots__ = ("threshold", "message", "_template")
+
+    cost = 2
+    deterministic = True
+
     def __init__(
         self,
         threshold: float,
@@ -167,6 +203,7 @@ class LessThen:
     ):
         self.threshold = threshold
         self.message = message
+        self._template = compile_template(message)
 
     def validate(self, value: float, field_name: str):
         """
@@ -177,22 +214,24 @@ class LessThen:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
-        error_message = self.message.format_map(
-            defaultdict(
-                str,
-                field_name=field_name,
-                value=value,
-                threshold=self.threshold,
-            )
-        )
         try:
-            value = float(value)
-            if value >= self.threshold:
-                return error_message
+            number = float(value)
+            if number >= self.threshold:
+                return self._error(value, field_name)
         except ValueError:
-            return error_message
+            return self._error(value, field_name)
+        return None
+
+    def _error(self, value, field_name):
+        return ValidationError(
+            self,
+            field_name,
+            "less_then",
+            {"value": value, "threshold": self.threshold},
+            self._template,
+        )
 
 
 Gte = GreaterThenOrEqual
@@ -208,7 +247,7 @@ Lt = LessThen
 """Alias for less than class"""
 
 
-class NumberRange:
+class NumberRange(Rule):
     """
     Validate to check if a value is has number between min and max
 
@@ -218,6 +257,11 @@ class NumberRange:
         message (str): The error message to be used if the validation fails.
     """
 
+    __slots__ = ("min", "max", "message", "_template")
+
+    cost = 2
+    deterministic = True
+
     def __init__(
         self,
         min,
@@ -227,25 +271,31 @@ class NumberRange:
         self.min = min
         self.max = max
         self.message = message
+        self._template = compile_template(message)
 
     def validate(self, value, field_name):
         """
         Validate if the given value is numeric and contains the specified number of decimal places.
         """
-        error_message = self.message.format_map(
-            defaultdict(
-                str, field_name=field_name, min=self.min, max=self.max, value=value
-            )
-        )
         try:
-            value = float(value)
-            if value < self.min or value > self.max:
-                return error_message
+            number = float(value)
+            if number < self.min or number > self.max:
+                return self._error(value, field_name)
         except ValueError:
-            return error_message
+            return self._error(value, field_name)
+        return None
+
+    def _error(self, value, field_name):
+        return ValidationError(
+            self,
+            field_name,
+            "number_range",
+            {"min": self.min, "max": self.max, "value": value},
+            self._template,
+        )
 
 
-class DecimalRange:
+class DecimalRange(Rule):
     """
     Validate to check if a value is has decimal between min and max
 
@@ -255,6 +305,11 @@ class DecimalRange:
         message (str): The error message to be used if the validation fails.
     """
 
+    __slots__ = ("min", "max", "message", "_template", "_regex")
+
+    cost = 3
+    deterministic = True
+
     def __init__(
         self,
         min,
@@ -264,6 +319,10 @@ class DecimalRange:
         self.min = min
         self.max = max
         self.message = message
+        self._template = compile_template(message)
+        self._regex = registry.compile_dynamic(
+            r"^-?\d+(\.\d{{{min},{max}}})?$".format(min=min, max=max)
+        )
 
     def validate(self, value, field_name):
         """
@@ -274,19 +333,22 @@ class DecimalRange:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
 
         value = str(value)
-        pattern = r"^-?\d+(\.\d{{{min},{max}}})?$".format(min=self.min, max=self.max)
-        if not re.match(pattern, value):
-            return self.message.format_map(
-                defaultdict(str, field_name=field_name, min=self.min, max=self.max)
+        if not self._regex.match(value):
+            return ValidationError(
+                self,
+                field_name,
+                "decimal_range",
+                {"min": self.min, "max": self.max},
+                self._template,
             )
         return None
 
 
-class DigitsBetween:
+class DigitsBetween(Rule):
     """
     Validator to check if a value has a length between a specified minimum and maximum.
     Check by: if length < min or length > max will return error
@@ -299,6 +361,11 @@ class DigitsBetween:
         message (str): The error message to be used if the validation fails.
     """
 
+    __slots__ = ("min", "max", "dot_include", "decimal_include", "message", "_template")
+
+    cost = 1
+    deterministic = True
+
     def __init__(
         self,
         min: int,
@@ -312,6 +379,7 @@ class DigitsBetween:
         self.dot_include = dot_include
         self.decimal_include = decimal_include
         self.message = message
+        self._template = compile_template(message)
 
     def validate(self, value, field_name):
         """
@@ -322,7 +390,7 @@ class DigitsBetween:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
         value = str(value)
         if not self.decimal_include:
@@ -332,7 +400,11 @@ class DigitsBetween:
 
         length = len(value)
         if length < self.min or length > self.max:
-            return self.message.format_map(
-                defaultdict(str, field_name=field_name, min=self.min, max=self.max)
+            return ValidationError(
+                self,
+                field_name,
+                "digits_between",
+                {"min": self.min, "max": self.max},
+                self._template,
             )
         return None
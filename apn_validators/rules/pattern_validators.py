@@ -1,23 +1,117 @@
 import re
 from collections import defaultdict
+from functools import lru_cache
 
+from ..errors import ValidationError, compile_template
+from ..regex_registry import registry
+from .base import Rule
+from .string_validators import _BYTES_LIKE, _text
 
-class MatchRegex:
+_EMAIL_PATTERN = (
+    r"(?:[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*|\""
+    r"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21\x23-\x5b\x5d-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])*\")"
+    r"@(?:(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])"
+    r"?|\[(?:(?:(2(5[0-5]|[0-4][0-9])|1[0-9][0-9]|[1-9]?[0-9]))\.){3}"
+    r"(?:(2(5[0-5]|[0-4][0-9])|1[0-9][0-9]|[1-9]?[0-9])|[a-z0-9-]*[a-z0-9]:"
+    r"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21-\x5a\x53-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])+)\])"
+)
+
+
+# a view has no isascii(), it is scanned by a regex, only the bytes of the view
+_NON_ASCII = registry.compile(rb"[\x80-\xff]").search
+# \x1c-\x1f are matched by `\s` in a str, not in bytes
+_NON_ASCII_OR_SEPARATOR = registry.compile(rb"[\x1c-\x1f\x80-\xff]").search
+_SEPARATORS = (b"\x1c", b"\x1d", b"\x1e", b"\x1f")
+
+
+def _ascii(value):
+    """Return True when a bytes-like value is ASCII, without copying it."""
+    if type(value) is memoryview:
+        return _NON_ASCII(value) is None
+    return value.isascii()
+
+
+def _ascii_without_separators(value):
+    """Return True when a bytes-like value is ASCII without \\x1c-\\x1f, without copying it."""
+    if type(value) is memoryview:
+        return _NON_ASCII_OR_SEPARATOR(value) is None
+    return value.isascii() and not any(separator in value for separator in _SEPARATORS)
+
+
+if not hasattr(bytes, "isascii"):  # pragma: no cover - Python 3.6
+
+    def _ascii(value):
+        return _NON_ASCII(value) is None
+
+    def _ascii_without_separators(value):
+        return _NON_ASCII_OR_SEPARATOR(value) is None
+
+
+def _bytes_matcher(regex, fullmatch):
+    """
+    Return the match function of a regex for the bytes-like values and the check of the values it
+    applies to (None for all). A str pattern written in ASCII is compiled again as bytes, it matches
+    an ASCII value the same way as the text; the match function is None for other patterns.
+    """
+    if isinstance(regex.pattern, bytes):
+        return (regex.fullmatch if fullmatch else regex.match), None
+    try:
+        encoded = registry.compile(regex.pattern.encode("ascii"), regex.flags & ~re.UNICODE)
+    except (UnicodeEncodeError, re.error):
+        # e.g. `\u00e9` is not an escape of a bytes pattern
+        return None, None
+    if "\\s" in regex.pattern or "\\S" in regex.pattern:
+        return (encoded.fullmatch if fullmatch else encoded.match), _ascii_without_separators
+    return (encoded.fullmatch if fullmatch else encoded.match), _ascii
+
+
+@lru_cache(maxsize=256)
+def _matchers(pattern, fullmatch):
+    """
+    Return the match function of a pattern, and the match function and the check of the bytes-like
+    values (see `_bytes_matcher`), shared by the rules with the same pattern.
+    """
+    regex = registry.compile(pattern)
+    return (regex.fullmatch if fullmatch else regex.match,) + _bytes_matcher(regex, fullmatch)
+
+
+def _match_bytes(rule, value):
+    """Match a bytes-like value with the regex of a rule, without decoding it when possible."""
+    match = rule._match_bytes
+    if match is None or (rule._plain is not None and not rule._plain(value)):
+        return rule._match(_text(value))
+    return match(value)
+
+
+class MatchRegex(Rule):
     """
     Validator to check if a value matches a specified regular expression pattern.
 
+    A bytes-like value (bytes, bytearray, memoryview) is matched without decoding it when it is
+    ASCII and the pattern is written in ASCII, it is decoded as UTF-8 otherwise.
+
     Attributes:
-        pattern (str): The regular expression pattern to match against.
+        pattern (str | re.Pattern): The regular expression pattern to match against.
         message (str,optional): The error message to be used if the validation fails.
+        fullmatch (bool,optional): The whole value must match the pattern instead of only its beginning (default: False).
     """
 
+    __slots__ = ("pattern", "message", "fullmatch", "_template", "_match", "_match_bytes", "_plain")
+
+    cost = 5
+    deterministic = True
+
     def __init__(
         self,
         pattern: str,
         message="{field_name} field must match with this pattern {pattern}",
+        fullmatch: bool = False,
     ):
         self.pattern = pattern
         self.message = message
+        self.fullmatch = fullmatch
+        self._template = compile_template(message)
+        self._match, self._match_bytes, self._plain = _matchers(pattern, fullmatch)
 
     def validate(self, value: str, field_name: str):
         """
@@ -28,31 +122,52 @@ class MatchRegex:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
-        if not re.match(self.pattern, value):
-            return self.message.format_map(
-                defaultdict(str, field_name=field_name, pattern=self.pattern)
+        if type(value) in _BYTES_LIKE:
+            matched = _match_bytes(self, value)
+        else:
+            matched = self._match(value)
+        if not matched:
+            return ValidationError(
+                self,
+                field_name,
+                "match_regex",
+                {"pattern": self.pattern},
+                self._template,
             )
         return None
 
 
-class NotMatchRegex:
+class NotMatchRegex(Rule):
     """
     Validator to check if a value does not match a specified regular expression pattern.
 
+    A bytes-like value (bytes, bytearray, memoryview) is matched without decoding it when it is
+    ASCII and the pattern is written in ASCII, it is decoded as UTF-8 otherwise.
+
     Attributes:
-        pattern (str): The regular expression pattern to check against.
+        pattern (str | re.Pattern): The regular expression pattern to check against.
         message (str,optional): The error message to be used if the validation fails.
+        fullmatch (bool,optional): Only fail when the whole value matches the pattern instead of only its beginning (default: False).
     """
 
+    __slots__ = ("pattern", "message", "fullmatch", "_template", "_match", "_match_bytes", "_plain")
+
+    cost = 5
+    deterministic = True
+
     def __init__(
         self,
         pattern: str,
         message="{field_name} field must not match with this pattern {pattern}",
+        fullmatch: bool = False,
     ):
         self.pattern = pattern
         self.message = message
+        self.fullmatch = fullmatch
+        self._template = compile_template(message)
+        self._match, self._match_bytes, self._plain = _matchers(pattern, fullmatch)
 
     def validate(self, value: str, field_name: str):
         """
@@ -63,43 +178,114 @@ class NotMatchRegex:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
-        if re.match(self.pattern, value):
-            return self.message.format_map(
-                defaultdict(str, field_name=field_name, pattern=self.pattern)
+        if type(value) in _BYTES_LIKE:
+            matched = _match_bytes(self, value)
+        else:
+            matched = self._match(value)
+        if matched:
+            return ValidationError(
+                self,
+                field_name,
+                "not_match_regex",
+                {"pattern": self.pattern},
+                self._template,
             )
         return None
 
 
-class Password:
+_PASSWORD_MESSAGES = {
+    "base_message": "{field_name} field must include at least {messages}",
+    "uppercase": "one uppercase letter",
+    "lowercase": "one lowercase letter",
+    "numbers": "one digit",
+    "symbols": "one symbol",
+    "length": "be at least {length} characters",
+}
+
+# used when a class requires more than one character and no custom message is given
+_PASSWORD_PLURAL_MESSAGES = {
+    "uppercase": "{count} uppercase letters",
+    "lowercase": "{count} lowercase letters",
+    "numbers": "{count} digits",
+    "symbols": "{count} symbols",
+}
+
+
+@lru_cache(maxsize=256)
+def _password_requirements(uppercase, lowercase, numbers, symbols, length, messages, symbol_set):
+    """
+    Return the (criterion, minimum count) of every enabled character class, in message order, the
+    message text of every criterion and the set of the symbols. Shared by the `Password` rules built
+    with the same parameters.
+    """
+    messages = dict(messages)
+    requirements = []
+    texts = {}
+    for criterion, required in (
+        ("uppercase", uppercase),
+        ("lowercase", lowercase),
+        ("numbers", numbers),
+        ("symbols", symbols),
+    ):
+        count = int(required)
+        if count < 1:
+            continue
+        text = messages.get(criterion, _PASSWORD_MESSAGES[criterion])
+        if count > 1 and text == _PASSWORD_MESSAGES[criterion]:
+            text = _PASSWORD_PLURAL_MESSAGES[criterion]
+        texts[criterion] = text.format_map(defaultdict(str, count=count))
+        requirements.append((criterion, count))
+    if length is not None:
+        texts["length"] = messages.get("length", _PASSWORD_MESSAGES["length"]).format_map(
+            defaultdict(str, length=length)
+        )
+    return tuple(requirements), texts, frozenset(symbol_set)
+
+
+class Password(Rule):
     """
     Validate the strength of a password based on various criteria.
 
+    The password is scanned once and the error message only lists the criteria that are not met.
+
     Parameters:
-        uppercase (bool, optional): Whether the password must contain uppercase letters (default: True).
-        lowercase (bool, optional): Whether the password must contain lowercase letters (default: True).
-        numbers (bool, optional): Whether the password must contain numeric digits (default: True).
-        symbols (bool, optional): Whether the password must contain symbols (default: True).
+        uppercase (bool | int, optional): Whether the password must contain uppercase letters, or the minimum number of them (default: True).
+        lowercase (bool | int, optional): Whether the password must contain lowercase letters, or the minimum number of them (default: True).
+        numbers (bool | int, optional): Whether the password must contain numeric digits, or the minimum number of them (default: True).
+        symbols (bool | int, optional): Whether the password must contain symbols, or the minimum number of them (default: True).
         length (int, optional): The minimum length of the password (default: 8).
-        messages (dict[str,str],optional): custom error message
+        messages (dict[str,str],optional): custom error message, the class messages can use `{count}`
+        symbol_set (str, optional): The characters counted as symbols (default: "#?!@_$%^&*-").
     """
 
+    __slots__ = (
+        "uppercase",
+        "lowercase",
+        "numbers",
+        "symbols",
+        "length",
+        "messages",
+        "symbol_set",
+        "_symbols",
+        "_template",
+        "_requirements",
+        "_texts",
+    )
+
+    cost = 15
+    deterministic = True
+
     def __init__(
         self,
-        uppercase: bool = True,
-        lowercase: bool = True,
-        numbers: bool = True,
-        symbols: bool = True,
+        uppercase: bool | int = True,
+        lowercase: bool | int = True,
+        numbers: bool | int = True,
+        symbols: bool | int = True,
         length: int = 8,
-        messages: dict[str, str] = {
-            "base_message": "{field_name} field must include at least {messages}",
-            "uppercase": "one uppercase letter",
-            "lowercase": "one lowercase letter",
-            "numbers": "one digit",
-            "symbols": "one symbol",
-            "length": "be at least {length} characters",
-        },
+        messages: dict[str, str] = _PASSWORD_MESSAGES,
+        symbol_set: str = "#?!@_$%^&*-",
     ) -> None:
         self.uppercase = uppercase
         self.lowercase = lowercase
@@ -107,60 +293,94 @@ class Password:
         self.symbols = symbols
         self.length = length
         self.messages = messages
+        self.symbol_set = symbol_set
+        self._template = compile_template(
+            messages.get("base_message", _PASSWORD_MESSAGES["base_message"])
+        )
 
-    def __build_patter_password(self):
-        pattern = "^"
-        problem_message = []
-        if self.uppercase:
-            pattern += "(?=.*?[A-Z])"
-            problem_message.append(
-                self.messages.get("uppercase", "one uppercase letter")
-            )
-        if self.lowercase:
-            pattern += "(?=.*?[a-z])"
-            problem_message.append(
-                self.messages.get("lowercase", "one lowercase letter")
-            )
-        if self.numbers:
-            pattern += "(?=.*?[0-9])"
-            problem_message.append(self.messages.get("numbers", "one digit"))
-        if self.symbols:
-            pattern += "(?=.*?[#?!@_$%^&*-])"
-            problem_message.append(self.messages.get("symbols", "one symbol"))
-        if self.length is not None:
-            pattern = pattern + ".{" + str(self.length) + ",}"
-            problem_message.append(
-                self.messages.get(
-                    "length", "be at lease {length} characters"
-                ).format_map(defaultdict(str, length=self.length))
-            )
+        self._requirements, self._texts, self._symbols = _password_requirements(
+            uppercase, lowercase, numbers, symbols, length, tuple(messages.items()), symbol_set
+        )
 
-        pattern += "$"
-        return pattern, problem_message
+    def analyze(self, value: str) -> dict:
+        """
+        Count the characters of each class in a single pass over the password.
 
-    def validate(self, value, field_name):
+        Parameters:
+            value (str): The password.
+
+        Returns:
+            dict: The number of `uppercase`, `lowercase`, `numbers` and `symbols` characters and the `length`.
+        """
+        uppercase = lowercase = numbers = symbols = 0
+        symbol_set = self._symbols
+        for char in value:
+            if "a" <= char <= "z":
+                lowercase += 1
+            elif "A" <= char <= "Z":
+                uppercase += 1
+            elif "0" <= char <= "9":
+                numbers += 1
+            elif char in symbol_set:
+                symbols += 1
+        return {
+            "uppercase": uppercase,
+            "lowercase": lowercase,
+            "numbers": numbers,
+            "symbols": symbols,
+            "length": len(value),
+        }
+
+    def missing(self, value: str) -> list:
+        """
+        Return the criteria the password does not meet, in message order.
+
+        Parameters:
+            value (str): The password.
 
-        pattern, problem_message = self.__build_patter_password()
+        Returns:
+            list[str]: The names of the failing criteria, e.g. ["numbers", "length"].
+        """
+        counts = self.analyze(value)
+        missing = [
+            criterion
+            for criterion, required in self._requirements
+            if counts[criterion] < required
+        ]
+        if self.length is not None and counts["length"] < self.length:
+            missing.append("length")
+        return missing
 
-        if not re.match(r"{}".format(pattern), value):
-            problem_message = ", ".join(problem_message)
-            return self.messages.get(
-                "base_message", "{field_name} field must include at least {messages}"
-            ).format_map(
-                defaultdict(str, field_name=field_name, messages=problem_message)
+    def validate(self, value, field_name):
+        missing = self.missing(value)
+        if missing:
+            texts = self._texts
+            return ValidationError(
+                self,
+                field_name,
+                "password",
+                {"messages": ", ".join([texts[criterion] for criterion in missing]), "missing": missing},
+                self._template,
             )
         return None
 
 
-class Email:
+class Email(Rule):
     """
     Validate that a string value is a valid email address.
     """
 
+    __slots__ = ("message", "_template", "_regex")
+
+    cost = 10
+    deterministic = True
+
     def __init__(
         self, message="field {field_name} is not a valid email address"
     ) -> None:
         self.message = message
+        self._template = compile_template(message)
+        self._regex = registry.compile(_EMAIL_PATTERN)
 
     def validate(self, value, field_name):
         """
@@ -173,21 +393,17 @@ class Email:
         """
 
         if not isinstance(value, str):
-            return self.message.format(field_name=field_name)
-
-            # Define a regex pattern that matches valid email addresses
-        email_regex = re.compile(
-            r"(?:[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*|\""
-            r"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21\x23-\x5b\x5d-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])*\")"
-            r"@(?:(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])"
-            r"?|\[(?:(?:(2(5[0-5]|[0-4][0-9])|1[0-9][0-9]|[1-9]?[0-9]))\.){3}"
-            r"(?:(2(5[0-5]|[0-4][0-9])|1[0-9][0-9]|[1-9]?[0-9])|[a-z0-9-]*[a-z0-9]:"
-            r"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21-\x5a\x53-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])+)\])"
-        )
+            return ValidationError(
+                self, field_name, "email", {"value": value}, self._template
+            )
 
-        if not email_regex.match(value):
-            return self.message.format_map(
-                defaultdict(str, field_name=field_name, value=value)
+        if not self._regex.match(value):
+            return ValidationError(
+                self,
+                field_name,
+                "email",
+                {"value": value},
+                self._template,
             )
 
         return None
@@ -1,16 +1,240 @@
-from collections import defaultdict
+from functools import lru_cache
+from itertools import islice
 
+from ..errors import ValidationError, compile_template
+from .base import Rule
 
-class Length:
+_PREVIEW_SIZE = 10
+
+
+class _Preview(list):
+    """The first values of a long list, rendered with the number of values left out."""
+
+    __slots__ = ("total",)
+
+    def __init__(self, values, total):
+        super().__init__(values)
+        self.total = total
+
+    def __repr__(self):
+        return "{}, ... {} more]".format(list.__repr__(self)[:-1], self.total - len(self))
+
+    __str__ = __repr__
+
+
+def _kind(values):
+    """Return `list` or `set` for the values given as one, they are kept frozen and rendered as given."""
+    if isinstance(values, list):
+        return list
+    if isinstance(values, set):
+        return set
+    return None
+
+
+def _preview(values, kind=None):
+    """Return the frozen values of a rule rendered in the messages, as a list when given as a list."""
+    if not isinstance(values, (tuple, frozenset)):
+        return values
+    if len(values) > _PREVIEW_SIZE:
+        return _Preview(islice(values, _PREVIEW_SIZE), len(values))
+    return values if kind is None else kind(values)
+
+
+def _frozen(values):
+    """Return the values of a rule as a tuple, or a frozenset for a set, other values as they are."""
+    if isinstance(values, (list, tuple)):
+        return tuple(values)
+    if isinstance(values, (set, frozenset)):
+        return frozenset(values)
+    return values
+
+
+def _given(values, kind):
+    """Return the frozen values of a rule in the container it was given."""
+    return values if kind is None else kind(values)
+
+
+_SHARED_SIZE = 64
+"""Up to this many values, the rules built with the same values share them and their set"""
+
+
+def _member_set(values, normalize):
+    return frozenset(values if normalize is None else map(normalize, values))
+
+
+@lru_cache(maxsize=256)
+def _shared_members(values, normalize):
+    """Return the values of an `InList` and their set, shared by the rules with the same short list."""
+    return values, _member_set(values, normalize)
+
+
+@lru_cache(maxsize=256)
+def _encoded_members(index):
+    """Return the values of a set encoded as UTF-8, shared by the rules with the same values."""
+    return frozenset(value.encode("utf-8") for value in index)
+
+
+def _strip_casefold(value):
+    return value.strip().casefold()
+
+
+def _normalizer(ignore_case, strip):
+    if ignore_case and strip:
+        return _strip_casefold
+    if ignore_case:
+        return str.casefold
+    if strip:
+        return str.strip
+    return None
+
+
+_BYTES_LIKE = frozenset({bytes, bytearray, memoryview})
+"""The types of the values the string rules check as a buffer, without decoding them"""
+
+
+def _length(value):
+    """Return the length of `str(value)`, or the size in bytes of a bytes-like value."""
+    kind = type(value)
+    if kind is str:
+        return len(value)
+    if kind in _BYTES_LIKE:
+        return value.nbytes if kind is memoryview else len(value)
+    return len(str(value))
+
+
+def _text(value):
+    """Return a bytes-like value decoded as UTF-8, for the error messages, other values as `str`."""
+    if type(value) in _BYTES_LIKE:
+        return str(value, "utf-8", "replace")
+    return str(value)
+
+
+_AFFIX_SCAN_SIZE = 32
+"""Up to this many prefixes, `str.startswith` over a tuple is faster than the length buckets"""
+
+
+class _AffixIndex:
+    """
+    The prefixes (or suffixes) of a rule, grouped by length in sets.
+
+    A lookup slices the value once per distinct length, so it depends on the number of lengths
+    rather than on the number of prefixes. Short lists are checked with `str.startswith` instead.
+    The bytes-like values are checked with the affixes encoded as UTF-8, built on the first such
+    value: a value starts with an affix exactly when its UTF-8 bytes start with the bytes of the affix.
+    """
+
+    __slots__ = ("buckets", "suffix", "affixes", "longest", "encoded", "_scan")
+
+    def __init__(self, affixes, suffix=False):
+        self._build(_affix_strings(affixes), suffix)
+        self.encoded = None
+
+    def _build(self, affixes, suffix):
+        buckets = {}
+        for affix in affixes:
+            buckets.setdefault(len(affix), set()).add(affix)
+        # longest first, so the most specific affix is reported
+        self.buckets = tuple((length, frozenset(buckets[length])) for length in sorted(buckets, reverse=True))
+        self.suffix = suffix
+        self.affixes = affixes
+        self.longest = self.buckets[0][0] if self.buckets else 0
+        self._scan = affixes if len(affixes) <= _AFFIX_SCAN_SIZE else None
+
+    def found(self, value: str) -> bool:
+        """Return True when the value has one of the affixes."""
+        scan = self._scan
+        if scan is not None:
+            return value.endswith(scan) if self.suffix else value.startswith(scan)
+        return self.match(value) is not None
+
+    def match(self, value: str):
+        """Return the longest affix of the value, None when there is none."""
+        size = len(value)
+        if self.suffix:
+            for length, bucket in self.buckets:
+                if length <= size and value[size - length :] in bucket:
+                    return value[size - length :]
+        else:
+            for length, bucket in self.buckets:
+                if length <= size and value[:length] in bucket:
+                    return value[:length]
+        return None
+
+    def _encoded(self):
+        """Return the index of the affixes encoded as UTF-8, building it the first time."""
+        encoded = self.encoded
+        if encoded is None:
+            # two threads may both build it, they build the same index
+            encoded = _AffixIndex.__new__(_AffixIndex)
+            encoded._build(tuple(affix.encode("utf-8") for affix in self.affixes), self.suffix)
+            encoded.encoded = None
+            self.encoded = encoded
+        return encoded
+
+    def _edge(self, value, size):
+        """Return the bytes of a bytes-like value an affix can match, copying at most `size` bytes."""
+        if type(value) is bytes:
+            return value
+        view = memoryview(value)
+        if view.ndim != 1 or view.itemsize != 1:
+            view = view.cast("B")
+        if self.suffix:
+            return bytes(view[max(len(view) - size, 0) :])
+        return bytes(view[:size])
+
+    def found_bytes(self, value) -> bool:
+        """Return True when a bytes-like value has one of the affixes."""
+        encoded = self._encoded()
+        return encoded.found(self._edge(value, encoded.longest))
+
+    def match_bytes(self, value):
+        """Return the longest affix of a bytes-like value, as `str`, None when there is none."""
+        encoded = self._encoded()
+        matched = encoded.match(self._edge(value, encoded.longest))
+        return None if matched is None else matched.decode("utf-8")
+
+
+def _affix_strings(affixes):
+    if isinstance(affixes, (tuple, list, set, frozenset)):
+        return tuple(map(str, affixes))
+    return (str(affixes),)
+
+
+@lru_cache(maxsize=128)
+def _shared_affix_index(affixes, suffix):
+    return _AffixIndex(affixes, suffix)
+
+
+def _affix_index(rule, affixes, suffix):
+    """
+    Return the index of the affixes of a rule, built on its first use: a rule that is never used does
+    not hold one, and the rules with the same affixes share it.
+    """
+    index = _shared_affix_index(_affix_strings(affixes), suffix)
+    # a derived cache, set past the immutability check; two threads find the same index
+    object.__setattr__(rule, "_index", index)
+    return index
+
+
+class Length(Rule):
     """
     Validator to check if the length of a string value falls within a specified range.
 
+    The length of a bytes-like value (bytes, bytearray, memoryview) is its size in bytes, the value
+    is not decoded.
+
     Attributes:
         min_length (int): The minimum allowed length of the string.
         max_length (int): The maximum allowed length of the string.
         message (str): The error message to be used if the validation fails.
     """
 
+    __slots__ = ("min_length", "max_length", "message", "_template")
+    _args = ("min_length", "max_length", "message")
+
+    cost = 1
+    deterministic = True
+
     def __init__(
         self,
         min: int,
@@ -20,6 +244,7 @@ class Length:
         self.min_length = min
         self.max_length = max
         self.message = message
+        self._template = compile_template(message)
 
     def validate(self, value: str, field_name: str):
         """
@@ -30,32 +255,40 @@ class Length:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
-        len_value = len(str(value))
+        len_value = len(value) if type(value) is str else _length(value)
         if len_value < self.min_length or len_value > self.max_length:
-            return self.message.format_map(
-                defaultdict(
-                    str, field_name=field_name, min=self.min_length, max=self.max_length
-                )
+            return ValidationError(
+                self,
+                field_name,
+                "length",
+                {"min": self.min_length, "max": self.max_length},
+                self._template,
             )
         return None
 
 
-class MinLength:
+class MinLength(Rule):
     """
-    Validator to check if a value has a minimum length.
+    Validator to check if a value has a minimum length, the size in bytes of a bytes-like value.
 
     Attributes:
         min (int): The minimum length that the value must have.
         message (str): The error message to be used if the validation fails.
     """
 
+    __slots__ = ("min", "message", "_template")
+
+    cost = 1
+    deterministic = True
+
     def __init__(
         self, min: int, message="field {field_name} must have a minimum length of {min}"
     ):
         self.min = min
         self.message = message
+        self._template = compile_template(message)
 
     def validate(self, value, field_name):
         """
@@ -66,33 +299,43 @@ class MinLength:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
         if value is None:
             return None
 
-        length = len(str(value))
+        length = len(value) if type(value) is str else _length(value)
         if length < self.min:
-            return self.message.format_map(
-                defaultdict(str, field_name=field_name, min=self.min)
+            return ValidationError(
+                self,
+                field_name,
+                "min_length",
+                {"min": self.min},
+                self._template,
             )
         return None
 
 
-class MaxLength:
+class MaxLength(Rule):
     """
-    Validator to check if a value has a maximum length.
+    Validator to check if a value has a maximum length, the size in bytes of a bytes-like value.
 
     Attributes:
         max (int): The maximum length that the value must have.
         message (str): The error message to be used if the validation fails.
     """
 
+    __slots__ = ("max", "message", "_template")
+
+    cost = 1
+    deterministic = True
+
     def __init__(
         self, max: int, message="field {field_name} must have a maximum length of {max}"
     ):
         self.max = max
         self.message = message
+        self._template = compile_template(message)
 
     def validate(self, value, field_name):
         """
@@ -103,20 +346,24 @@ class MaxLength:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
         if value is None:
             return None
 
-        length = len(str(value))
+        length = len(value) if type(value) is str else _length(value)
         if length > self.max:
-            return self.message.format_map(
-                defaultdict(str, field_name=field_name, max=self.max)
+            return ValidationError(
+                self,
+                field_name,
+                "max_length",
+                {"max": self.max},
+                self._template,
             )
         return None
 
 
-class NotBlank:
+class NotBlank(Rule):
     """
     Validator to check if a string value is not blank (empty or contains only whitespace).
 
@@ -124,8 +371,15 @@ class NotBlank:
         message (str): The error message to be used if the validation fails.
     """
 
+    __slots__ = ("message", "_template")
+
+    cost = 1
+    commutative = False
+    deterministic = True
+
     def __init__(self, message="field {field_name} must not be blank"):
         self.message = message
+        self._template = compile_template(message)
 
     def validate(self, value: str, field_name: str):
         """
@@ -136,29 +390,69 @@ class NotBlank:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
         if value is None or not str(value).strip():
-            return self.message.format_map(defaultdict(str, field_name=field_name))
+            return ValidationError(
+                self,
+                field_name,
+                "not_blank",
+                {},
+                self._template,
+            )
         return None
 
 
-class InList:
+class InList(Rule):
     """
     Validator to check if a string value is present in a specified list.
 
+    The values are compared as strings through a set built once, so a check does not depend on the
+    size of the list. Without `ignore_case` and `strip`, a bytes-like value (bytes, bytearray,
+    memoryview) is compared with the values encoded as UTF-8, without decoding it.
+
     Attributes:
-        valid_values (list): The list of valid values.
-        message (str): The error message to be used if the validation fails.
+        valid_values (tuple): The valid values, as strings.
+        message (str): The error message to be used if the validation fails. Lists of more than 10
+            values are shown as the first 10 values and the number of values left out.
+        ignore_case (bool, optional): Compare the values without case (default: False).
+        strip (bool, optional): Ignore the leading and trailing whitespace of the values (default: False).
     """
 
+    __slots__ = (
+        "valid_values",
+        "message",
+        "ignore_case",
+        "strip",
+        "_template",
+        "_normalize",
+        "_index",
+        "_encoded",
+    )
+
+    cost = 1
+    deterministic = True
+
     def __init__(
         self,
         valid_values: list,
         message="field {field_name} must be in {valid_values}",
+        ignore_case=False,
+        strip=False,
     ):
-        self.valid_values = list(map(str, valid_values))
+        values = tuple(map(str, valid_values))
         self.message = message
+        self.ignore_case = ignore_case
+        self.strip = strip
+        self._template = compile_template(message)
+        self._normalize = _normalizer(ignore_case, strip)
+        if len(values) <= _SHARED_SIZE:
+            values, self._index = _shared_members(values, self._normalize)
+        else:
+            self._index = _member_set(values, self._normalize)
+        self.valid_values = values
+        # the encoded values, built by the first bytes-like value (see `_encoded_index`)
+        self._encoded = None
 
     def validate(self, value: str, field_name: str):
         """
@@ -169,28 +463,109 @@ class InList:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
-        value = str(value)
-        if value not in self.valid_values:
-            return self.message.format_map(
-                defaultdict(str, field_name=field_name, valid_values=self.valid_values)
+        if type(value) in _BYTES_LIKE:
+            if self._normalize is not None:
+                found = self._normalize(_text(value)) in self._index
+            else:
+                encoded = self._encoded
+                if encoded is None:
+                    encoded = self._encoded_index()
+                try:
+                    found = value in encoded
+                except (TypeError, ValueError):
+                    # a bytearray (or a view of one) is not hashable
+                    found = bytes(value) in encoded
+        else:
+            value = str(value)
+            if self._normalize is not None:
+                value = self._normalize(value)
+            found = value in self._index
+        if not found:
+            return ValidationError(
+                self,
+                field_name,
+                "in_list",
+                {"valid_values": _preview(self.valid_values, list)},
+                self._template,
             )
         return None
 
+    def _encoded_index(self):
+        """Return the values encoded as UTF-8, building them on the first bytes-like value."""
+        encoded = _encoded_members(self._index)
+        # a derived cache, set past the immutability check; two threads build the same set
+        object.__setattr__(self, "_encoded", encoded)
+        return encoded
+
 
-class NotInList:
+class NotInList(Rule):
     """
     Validate that a string value is not present in a specified list.
 
+    The values are compared as they are (without a conversion to string) through a set built once.
+    Unhashable values of the list are still compared one by one.
+
     Attributes:
-        invalid_values (list): The list of invalid values.
-        message (str): The error message template if validation fails.
+        invalid_values (tuple | frozenset): The invalid values, a frozenset when given as a set.
+        message (str): The error message template if validation fails. Lists of more than 10
+            values are shown as the first 10 values and the number of values left out.
+        ignore_case (bool, optional): Compare the string values without case (default: False).
+        strip (bool, optional): Ignore the leading and trailing whitespace of the string values (default: False).
     """
 
-    def __init__(self, invalid_values: list, message="field {field_name} must not be in {invalid_values}"):
-        self.invalid_values = invalid_values
+    __slots__ = (
+        "invalid_values",
+        "message",
+        "ignore_case",
+        "strip",
+        "_template",
+        "_normalize",
+        "_index",
+        "_unhashable",
+        "_kind",
+    )
+
+    # the values are kept as a tuple, the kind tells apart a list from a tuple in the messages
+    _params = ("invalid_values", "message", "ignore_case", "strip", "_kind")
+
+    cost = 1
+    deterministic = True
+
+    def __init__(
+        self,
+        invalid_values: list,
+        message="field {field_name} must not be in {invalid_values}",
+        ignore_case=False,
+        strip=False,
+    ):
+        self.invalid_values = _frozen(invalid_values)
         self.message = message
+        self.ignore_case = ignore_case
+        self.strip = strip
+        self._template = compile_template(message)
+        self._normalize = _normalizer(ignore_case, strip)
+
+        index = set()
+        unhashable = []
+        for invalid_value in invalid_values:
+            if self._normalize is not None and isinstance(invalid_value, str):
+                invalid_value = self._normalize(invalid_value)
+            try:
+                index.add(invalid_value)
+            except TypeError:
+                unhashable.append(invalid_value)
+        if index == self.invalid_values:
+            # given as a set of plain values, the set is its own index
+            self._index = self.invalid_values
+        else:
+            self._index = frozenset(index)
+        self._unhashable = tuple(unhashable)
+        self._kind = _kind(invalid_values)
+
+    def _arguments(self):
+        return _given(self.invalid_values, self._kind), self.message, self.ignore_case, self.strip
 
     def validate(self, value: str, field_name: str):
         """
@@ -201,30 +576,78 @@ class NotInList:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
-        if value in self.invalid_values:
-            return self.message.format_map(
-                defaultdict(str, field_name=field_name, invalid_values=self.invalid_values)
+        if self._normalize is not None and isinstance(value, str):
+            value = self._normalize(value)
+        try:
+            found = value in self._index
+        except TypeError:
+            found = False
+        if not found and self._unhashable:
+            found = value in self._unhashable
+        if found:
+            return ValidationError(
+                self,
+                field_name,
+                "not_in_list",
+                {"invalid_values": _preview(self.invalid_values, self._kind)},
+                self._template,
             )
         return None
 
-class DoesntStartsWith:
+
+class DoesntStartsWith(Rule):
     """
     Validate that a string value does not start with any of the specified prefixes.
+    A bytes-like value is compared with the UTF-8 bytes of the prefixes, without decoding it.
 
     Attributes:
-        list_prefix (list of str): The list of prefixes that the string should not start with.
-        message (str): The error message template if validation fails.
+        list_prefix (tuple of str): The prefixes that the string should not start with, given as a tuple, list or set.
+            A single value is used as one prefix.
+        message (str): The error message template if validation fails, `{matched}` is the prefix found.
     """
 
+    __slots__ = ("list_prefix", "message", "_template", "_index", "_kind")
+    _params = ("list_prefix", "message", "_kind")
+
+    cost = 2
+    deterministic = True
+
     def __init__(
         self,
         list_prefix: list[str],
         message="field {field_name} must not be start with {list_prefix}",
     ):
-        self.list_prefix = list_prefix
+        self.list_prefix = _frozen(list_prefix)
         self.message = message
+        self._template = compile_template(message)
+        # built on the first use (see `_affix_index`)
+        self._index = None
+        self._kind = _kind(list_prefix)
+
+    def _arguments(self):
+        return _given(self.list_prefix, self._kind), self.message
+
+    def _affixes(self):
+        index = self._index
+        if index is None:
+            index = _affix_index(self, self.list_prefix, False)
+        return index
+
+    def match(self, value):
+        """
+        Return the longest prefix of the value in the list.
+
+        Parameters:
+            value (str): The value, converted with `str`, or a bytes-like value.
+
+        Returns:
+            str or None: The matched prefix, None when the value has none of them.
+        """
+        if type(value) in _BYTES_LIKE:
+            return self._affixes().match_bytes(value)
+        return self._affixes().match(str(value))
 
     def validate(self, value: str, field_name: str):
         """
@@ -235,36 +658,78 @@ class DoesntStartsWith:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
-        value = str(value)
-        if isinstance(self.list_prefix, tuple):
-            list_prefix = tuple(map(str, self.list_prefix))
+        index = self._index
+        if index is None:
+            index = self._affixes()
+        if type(value) in _BYTES_LIKE:
+            found = index.found_bytes(value)
         else:
-            list_prefix = str(self.list_prefix)
-        if value.startswith(list_prefix):
-            return self.message.format_map(
-                defaultdict(str, field_name=field_name, list_prefix=self.list_prefix)
+            value = str(value)
+            found = index.found(value)
+        if found:
+            return ValidationError(
+                self,
+                field_name,
+                "doesnt_starts_with",
+                {"list_prefix": _preview(self.list_prefix, self._kind), "matched": self.match(value)},
+                self._template,
             )
         return None
 
 
-class StartsWith:
+class StartsWith(Rule):
     """
     Validate that a string value starts with one of the specified prefixes.
+    A bytes-like value is compared with the UTF-8 bytes of the prefixes, without decoding it.
 
     Attributes:
-        list_prefix (tuple of str): The tuple of prefixes that the string should start with.
+        list_prefix (tuple of str): The prefixes that the string should start with, given as a tuple, list or set.
+            A single value is used as one prefix.
         message (str): The error message template if validation fails.
     """
 
+    __slots__ = ("list_prefix", "message", "_template", "_index", "_kind")
+    _params = ("list_prefix", "message", "_kind")
+
+    cost = 2
+    deterministic = True
+
     def __init__(
         self,
         list_prefix: tuple[str],
         message="field {field_name} must be start with {list_prefix}",
     ):
-        self.list_prefix = list_prefix
+        self.list_prefix = _frozen(list_prefix)
         self.message = message
+        self._template = compile_template(message)
+        # built on the first use (see `_affix_index`)
+        self._index = None
+        self._kind = _kind(list_prefix)
+
+    def _arguments(self):
+        return _given(self.list_prefix, self._kind), self.message
+
+    def _affixes(self):
+        index = self._index
+        if index is None:
+            index = _affix_index(self, self.list_prefix, False)
+        return index
+
+    def match(self, value):
+        """
+        Return the longest prefix of the value in the list.
+
+        Parameters:
+            value (str): The value, converted with `str`, or a bytes-like value.
+
+        Returns:
+            str or None: The matched prefix, None when the value has none of them.
+        """
+        if type(value) in _BYTES_LIKE:
+            return self._affixes().match_bytes(value)
+        return self._affixes().match(str(value))
 
     def validate(self, value: str, field_name: str):
         """
@@ -275,36 +740,78 @@ class StartsWith:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
-        value = str(value)
-        if isinstance(self.list_prefix, tuple):
-            list_prefix = tuple(map(str, self.list_prefix))
+        index = self._index
+        if index is None:
+            index = self._affixes()
+        if type(value) in _BYTES_LIKE:
+            found = index.found_bytes(value)
         else:
-            list_prefix = str(self.list_prefix)
-        if not value.startswith(list_prefix):
-            return self.message.format_map(
-                defaultdict(str, field_name=field_name, list_prefix=self.list_prefix)
+            value = str(value)
+            found = index.found(value)
+        if not found:
+            return ValidationError(
+                self,
+                field_name,
+                "starts_with",
+                {"list_prefix": _preview(self.list_prefix, self._kind)},
+                self._template,
             )
         return None
 
 
-class DoesntEndsWith:
+class DoesntEndsWith(Rule):
     """
     Validate that a string value does not end with any of the specified suffixes.
+    A bytes-like value is compared with the UTF-8 bytes of the suffixes, without decoding it.
 
     Attributes:
-        list_tail (tuple of str): The tuple of suffixes that the string should not end with.
-        message (str): The error message template if validation fails.
+        list_tail (tuple of str): The suffixes that the string should not end with, given as a tuple, list or set.
+            A single value is used as one suffix.
+        message (str): The error message template if validation fails, `{matched}` is the suffix found.
     """
 
+    __slots__ = ("list_tail", "message", "_template", "_index", "_kind")
+    _params = ("list_tail", "message", "_kind")
+
+    cost = 2
+    deterministic = True
+
     def __init__(
         self,
         list_tail: tuple[str],
         message="field {field_name} must not be end with {list_tail}",
     ):
-        self.list_tail = list_tail
+        self.list_tail = _frozen(list_tail)
         self.message = message
+        self._template = compile_template(message)
+        # built on the first use (see `_affix_index`)
+        self._index = None
+        self._kind = _kind(list_tail)
+
+    def _arguments(self):
+        return _given(self.list_tail, self._kind), self.message
+
+    def _affixes(self):
+        index = self._index
+        if index is None:
+            index = _affix_index(self, self.list_tail, True)
+        return index
+
+    def match(self, value):
+        """
+        Return the longest suffix of the value in the list.
+
+        Parameters:
+            value (str): The value, converted with `str`, or a bytes-like value.
+
+        Returns:
+            str or None: The matched suffix, None when the value has none of them.
+        """
+        if type(value) in _BYTES_LIKE:
+            return self._affixes().match_bytes(value)
+        return self._affixes().match(str(value))
 
     def validate(self, value: str, field_name: str):
         """
@@ -315,39 +822,82 @@ class DoesntEndsWith:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
-        value = str(value)
-        if isinstance(self.list_tail, tuple):
-            list_tail = tuple(map(str, self.list_tail))
+        index = self._index
+        if index is None:
+            index = self._affixes()
+        if type(value) in _BYTES_LIKE:
+            found = index.found_bytes(value)
         else:
-            list_tail = str(self.list_tail)
-
-        if value.endswith(list_tail):
-            return self.message.format_map(
-                defaultdict(
-                    str, field_name=field_name, value=value, list_tail=self.list_tail
-                )
+            value = str(value)
+            found = index.found(value)
+        if found:
+            return ValidationError(
+                self,
+                field_name,
+                "doesnt_ends_with",
+                {
+                    "value": _text(value),
+                    "list_tail": _preview(self.list_tail, self._kind),
+                    "matched": self.match(value),
+                },
+                self._template,
             )
         return None
 
 
-class EndsWith:
+class EndsWith(Rule):
     """
     Validate that a string value ends with one of the specified suffixes.
+    A bytes-like value is compared with the UTF-8 bytes of the suffixes, without decoding it.
 
     Attributes:
-        list_tail (list of str): The list of suffixes that the string should end with.
+        list_tail (tuple of str): The suffixes that the string should end with, given as a tuple, list or set.
+            A single value is used as one suffix.
         message (str): The error message template if validation fails.
     """
 
+    __slots__ = ("list_tail", "message", "_template", "_index", "_kind")
+    _params = ("list_tail", "message", "_kind")
+
+    cost = 2
+    deterministic = True
+
     def __init__(
         self,
         list_tail: tuple[str],
         message="field {field_name} must be end with {list_tail}",
     ):
-        self.list_tail = list_tail
+        self.list_tail = _frozen(list_tail)
         self.message = message
+        self._template = compile_template(message)
+        # built on the first use (see `_affix_index`)
+        self._index = None
+        self._kind = _kind(list_tail)
+
+    def _arguments(self):
+        return _given(self.list_tail, self._kind), self.message
+
+    def _affixes(self):
+        index = self._index
+        if index is None:
+            index = _affix_index(self, self.list_tail, True)
+        return index
+
+    def match(self, value):
+        """
+        Return the longest suffix of the value in the list.
+
+        Parameters:
+            value (str): The value, converted with `str`, or a bytes-like value.
+
+        Returns:
+            str or None: The matched suffix, None when the value has none of them.
+        """
+        if type(value) in _BYTES_LIKE:
+            return self._affixes().match_bytes(value)
+        return self._affixes().match(str(value))
 
     def validate(self, value: str, field_name: str):
         """
@@ -358,24 +908,28 @@ class EndsWith:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
-        value = str(value)
-        if isinstance(self.list_tail, tuple):
-            list_tail = tuple(map(str, self.list_tail))
+        index = self._index
+        if index is None:
+            index = self._affixes()
+        if type(value) in _BYTES_LIKE:
+            found = index.found_bytes(value)
         else:
-            list_tail = str(self.list_tail)
-
-        if not value.endswith(list_tail):
-            return self.message.format_map(
-                defaultdict(
-                    str, field_name=field_name, value=value, list_tail=self.list_tail
-                )
+            value = str(value)
+            found = index.found(value)
+        if not found:
+            return ValidationError(
+                self,
+                field_name,
+                "ends_with",
+                {"value": _text(value), "list_tail": _preview(self.list_tail, self._kind)},
+                self._template,
             )
         return None
 
 
-class Equals:
+class Equals(Rule):
     """
     Validate that a string value is equal to another specified value.
 
@@ -384,6 +938,11 @@ class Equals:
         message (str): The error message template if validation fails.
     """
 
+    __slots__ = ("another_value", "message", "_template")
+
+    cost = 1
+    deterministic = True
+
     def __init__(
         self,
         another_value: str,
@@ -391,6 +950,7 @@ class Equals:
     ):
         self.another_value = another_value
         self.message = message
+        self._template = compile_template(message)
 
     def validate(self, value: str, field_name: str):
         """
@@ -401,21 +961,20 @@ class Equals:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
         if str(value) != str(self.another_value):
-            return self.message.format_map(
-                defaultdict(
-                    str,
-                    field_name=field_name,
-                    value=value,
-                    another_value=self.another_value,
-                )
+            return ValidationError(
+                self,
+                field_name,
+                "equals",
+                {"value": value, "another_value": self.another_value},
+                self._template,
             )
         return None
 
 
-class NotEquals:
+class NotEquals(Rule):
     """
     Validate that a string value is not equal to another specified value.
 
@@ -424,6 +983,11 @@ class NotEquals:
         message (str): The error message template if validation fails.
     """
 
+    __slots__ = ("another_value", "message", "_template")
+
+    cost = 1
+    deterministic = True
+
     def __init__(
         self,
         another_value,
@@ -431,6 +995,7 @@ class NotEquals:
     ):
         self.another_value = another_value
         self.message = message
+        self._template = compile_template(message)
 
     def validate(self, value: str, field_name: str):
         """
@@ -441,15 +1006,15 @@ class NotEquals:
             field_name (str): The name of the field being validated.
 
         Returns:
-            str or None: The error message if validation fails, None otherwise.
+            ValidationError or None: The error if validation fails, None otherwise.
         """
         if str(value) == str(self.another_value):
-            return self.message.format_map(
-                defaultdict(
-                    str,
-                    field_name=field_name,
-                    value=value, another_value=self.another_value,
-                )
+            return ValidationError(
+                self,
+                field_name,
+                "not_equals",
+                {"value": value, "another_value": self.another_value},
+                self._template,
             )
         return None
 
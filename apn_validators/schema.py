@@ -0,0 +1,814 @@
+import os
+from collections import deque
+from itertools import islice, repeat
+from time import perf_counter
+
+from .adaptive import AdaptivePlan
+from .errors import err_to_list, render_errors
+
+_worker_schema = None
+
+# the kinds of the nodes of a schema: a list of rules, an object (`Nested`) or a list of items (`Each`)
+_RULES, _NESTED, _EACH = range(3)
+
+
+class CompiledSchema:
+    """
+    A validation schema that has been prepared once and can be reused for many `validate` calls.
+
+    The field order, the bound `rule.validate` methods and an empty result template are computed
+    when the schema is compiled, so a call to `validate` only has to run the rules.
+
+    With `adaptive=True` the schema measures the cost and the failure rate of its rules, and calls
+    made with `bail=True` run the rules of each field cheapest and most often failing first (see
+    `apn_validators.adaptive`). The errors reported with `bail=True` can then come from another
+    rule of the field than with the written order.
+
+    With `hooks` (see `apn_validators.instrumentation`) every rule call and every record validated
+    by `validate`, `validate_many` and `validate_stream` is reported to the hooks. The hooks are not
+    called by `avalidate` and by the worker processes of `validate_many_parallel`.
+
+    With `codegen=True` the checks of the built-in rules are generated as one Python function
+    for the schema (see `apn_validators.codegen`), used by `validate` and `validate_many`
+    without `bail`, `max_errors` or hooks. The results are the same.
+
+    A field can also be a nested schema (a dictionary or `Nested`) or a list of items (`Each`),
+    see `apn_validators.rules.nested_validators`. The nested data is walked iteratively with the
+    compiled sub-schemas and the errors are keyed by path, e.g. `lines.42.qty`. Nested schemas
+    cannot be adaptive, generated or validated with `avalidate`.
+
+    Attributes:
+        fields (tuple[str]): The field names in the order they are validated.
+        adaptive (bool): Whether the rules are reordered from their runtime statistics.
+        hooks: The instrumentation hooks, or None.
+        name (str): The name reported to the hooks, or None.
+        codegen (bool): Whether the schema runs a generated validation function.
+        source (str): The source of the generated function, or None without `codegen`.
+
+    Example:
+        signup = compile_schema({
+            'username': [NotBlank(), Length(min=3, max=20)],
+            'email': [NotBlank(), Email()],
+        })
+        validated, err = signup.validate({'username': 'agung', 'email': 'agung@example.com'})
+    """
+
+    __slots__ = (
+        "_schema",
+        "_plan",
+        "_slots",
+        "_adaptive",
+        "_hooks",
+        "_name",
+        "_generated",
+        "_source",
+        "_nodes",
+        "_nested",
+        "_limited",
+    )
+
+    def __init__(self, schema: dict, adaptive=False, hooks=None, name=None, codegen=False):
+        if adaptive and hooks is not None:
+            raise ValueError("hooks cannot be used with adaptive=True")
+        nodes = tuple((field_name,) + _node(rules) for field_name, rules in schema.items())
+        nested = any(kind is not _RULES for _, kind, _ in nodes)
+        if nested and (adaptive or codegen):
+            raise ValueError("nested schemas cannot be compiled with adaptive=True or codegen=True")
+        # the rules as tuples, nested fields as they were written
+        schema = tuple(
+            (field_name, payload if kind is _RULES else schema[field_name]) for field_name, kind, payload in nodes
+        )
+        plan = tuple(
+            (field_name, tuple(rule.validate for rule in rules))
+            for field_name, kind, rules in nodes
+            if kind is _RULES
+        )
+        object.__setattr__(self, "_schema", schema)
+        object.__setattr__(self, "_plan", plan)
+        object.__setattr__(self, "_nodes", nodes)
+        object.__setattr__(self, "_nested", nested)
+        # every call goes through `_validate_limited`
+        object.__setattr__(self, "_limited", nested or hooks is not None)
+        object.__setattr__(self, "_slots", dict.fromkeys(field_name for field_name, _ in schema))
+        object.__setattr__(self, "_adaptive", AdaptivePlan(schema) if adaptive else None)
+        object.__setattr__(self, "_hooks", hooks)
+        object.__setattr__(self, "_name", name)
+        generated = source = None
+        if codegen:
+            from .codegen import build_validator
+
+            generated, source = build_validator(schema)
+        object.__setattr__(self, "_generated", generated)
+        object.__setattr__(self, "_source", source)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompiledSchema is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("CompiledSchema is immutable")
+
+    def __reduce__(self):
+        # only the rules are shipped, the bound methods are rebuilt on the other side. The hooks
+        # collect in this process, they are not sent
+        return CompiledSchema, (self.schema, self.adaptive, None, self._name, self.codegen)
+
+    def __repr__(self):
+        options = ""
+        if self._name is not None:
+            options += ", name={!r}".format(self._name)
+        if self.adaptive:
+            options += ", adaptive=True"
+        if self.codegen:
+            options += ", codegen=True"
+        return "CompiledSchema(fields={!r}{})".format(self.fields, options)
+
+    @property
+    def fields(self) -> tuple:
+        return tuple(self._slots)
+
+    @property
+    def schema(self) -> dict:
+        """A copy of the schema this object was compiled from."""
+        return {
+            field_name: list(rules) if type(rules) is tuple else rules for field_name, rules in self._schema
+        }
+
+    @property
+    def adaptive(self) -> bool:
+        return self._adaptive is not None
+
+    @property
+    def hooks(self):
+        return self._hooks
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def codegen(self) -> bool:
+        return self._generated is not None
+
+    @property
+    def source(self) -> str:
+        return self._source
+
+    def rule_stats(self) -> list:
+        """
+        Return the runtime statistics of the rules of an adaptive schema.
+
+        Returns:
+            list[dict]: One dictionary per rule with the keys `field`, `rule`, `position`, `calls`,
+            `failures`, `failure_rate` and `cost` (seconds per call).
+
+        Raises:
+            ValueError: If the schema was not compiled with `adaptive=True`.
+        """
+        if self._adaptive is None:
+            raise ValueError("rule statistics are only recorded with adaptive=True")
+        return self._adaptive.stats()
+
+    def validate(self, values: dict, is_err_to_list=False, lazy=False, bail=False, max_errors=None):
+        """
+        Validate the provided values against the compiled schema.
+
+        Parameters:
+            values (dict): A dictionary where keys are field names and values are the values to be validated.
+            is_err_to_list (bool, optional): Return the errors as a single list of messages (default: False).
+            lazy (bool, optional): Keep the `ValidationError` records instead of rendering them to messages (default: False).
+            bail (bool, optional): Stop running the rules of a field after its first error (default: False).
+            max_errors (int, optional): Stop validating the record once this many errors have been collected (default: no limit).
+
+        Returns:
+            tuple: The same `(validated, errors)` tuple as `apn_validators.validate`.
+        """
+        if bail or max_errors is not None or self._limited:
+            _check_max_errors(max_errors)
+            validated, errors, _ = self._validate_limited(values, bail, max_errors)
+            if is_err_to_list:
+                errors = err_to_list(errors)
+            elif errors and not lazy:
+                errors = render_errors(errors)
+            return validated, errors
+
+        if self._generated is not None:
+            validated, errors = self._generated(values)
+            if is_err_to_list:
+                errors = err_to_list(errors)
+            elif errors and not lazy:
+                errors = render_errors(errors)
+            return validated, errors
+
+        errors = {}
+        validated = self._slots.copy()
+        get = values.get
+
+        for field_name, checks in self._plan:
+            value = get(field_name)
+            validated[field_name] = value
+
+            field_errors = None
+            for check in checks:
+                error_message = check(value, field_name)
+                if error_message is not None:
+                    if field_errors is None:
+                        field_errors = errors[field_name] = [error_message]
+                    else:
+                        field_errors.append(error_message)
+
+        if is_err_to_list:
+            errors = err_to_list(errors)
+        elif errors and not lazy:
+            errors = render_errors(errors)
+        return validated, errors
+
+    def _validate_limited(self, values, bail, max_errors):
+        """
+        The `validate` loop with `bail`, an error budget, hooks or nested fields.
+
+        Returns `(validated, errors, error_count)`. When the budget runs out, `validated` only has
+        the fields that were reached.
+        """
+        if self._nested:
+            return self._walk(values, bail, max_errors)
+        if self._hooks is not None:
+            return self._validate_hooked(values, bail, max_errors)
+        if bail and self._adaptive is not None:
+            return self._adaptive.validate(values, max_errors)
+
+        errors = {}
+        validated = {}
+        get = values.get
+        error_count = 0
+
+        for field_name, checks in self._plan:
+            value = get(field_name)
+            validated[field_name] = value
+
+            field_errors = None
+            for check in checks:
+                error_message = check(value, field_name)
+                if error_message is not None:
+                    if field_errors is None:
+                        field_errors = errors[field_name] = [error_message]
+                    else:
+                        field_errors.append(error_message)
+                    error_count += 1
+                    if bail or error_count == max_errors:
+                        break
+            if error_count == max_errors:
+                break
+
+        return validated, errors, error_count
+
+    def _walk(self, values, bail, max_errors):
+        """
+        `_validate_limited` for a schema with nested fields.
+
+        The nested objects and lists are walked depth first with a stack of frames instead of
+        recursive calls. The objects of a flat sub-schema, e.g. the lines of an order, are run
+        with the nodes it was compiled with, only deeper levels push a frame.
+        """
+        hooks = self._hooks
+        name = self._name
+        started = perf_counter() if hooks is not None else 0.0
+        errors = {}
+        error_count = 0
+        validated = {}
+
+        # a frame is [entries, validated container, path prefix, get, last key]: the entries of an
+        # object are its nodes and `get` reads its values, the entries of a list are
+        # `(index, (kind, payload, item))` and `get` is None
+        stack = [[iter(self._nodes), validated, None, values.get, None]]
+        while stack:
+            frame = stack[-1]
+            entry = next(frame[0], None)
+            if entry is None:
+                stack.pop()
+                continue
+            get = frame[3]
+            if get is not None:
+                key, kind, payload = entry
+                value = get(key)
+            else:
+                key, (kind, payload, value) = entry
+                frame[4] = key
+            container = frame[1]
+            path = key if frame[2] is None else "{}{}".format(frame[2], key)
+            left = None if max_errors is None else max_errors - error_count
+
+            if kind is _RULES:
+                container[key] = value
+                error_count += _run(payload, value, path, errors, left, bail, hooks, name)
+                if error_count == max_errors:
+                    break
+                continue
+
+            # the Nested or Each rule checks the type of the value
+            count = _run((payload,), value, path, errors, left, bail, hooks, name)
+            if count or (value is None and kind is _EACH):
+                container[key] = value
+                error_count += count
+                if error_count == max_errors:
+                    break
+                continue
+
+            prefix = "{}.".format(path)
+            if kind is _NESTED:
+                schema = payload._schema
+                child = container[key] = {}
+                get = (value or _EMPTY).get
+                if schema._nested:
+                    stack.append([iter(schema._nodes), child, prefix, get, None])
+                    continue
+                error_count += _run_object(schema._nodes, get, child, prefix, errors, left, bail, hooks, name)
+                if error_count == max_errors:
+                    break
+                continue
+
+            item_kind, item_payload = payload._kind, payload._payload
+            if item_kind is _RULES:
+                container[key] = value
+                for index, item in enumerate(value):
+                    left = None if max_errors is None else max_errors - error_count
+                    error_count += _run(item_payload, item, prefix + str(index), errors, left, bail, hooks, name)
+                    if error_count == max_errors:
+                        break
+            elif item_kind is _NESTED and not item_payload._schema._nested:
+                items = container[key] = []
+                nodes = item_payload._schema._nodes
+                check = (item_payload,)
+                for index, item in enumerate(value):
+                    item_path = prefix + str(index)
+                    left = None if max_errors is None else max_errors - error_count
+                    if type(item) is dict and hooks is None:
+                        count = 0
+                    else:
+                        count = _run(check, item, item_path, errors, left, bail, hooks, name)
+                    if count:
+                        items.append(item)
+                    else:
+                        child = {}
+                        items.append(child)
+                        count = _run_object(nodes, (item or _EMPTY).get, child, item_path + ".", errors, left, bail, hooks, name)
+                    error_count += count
+                    if error_count == max_errors:
+                        break
+            else:
+                items = container[key] = [None] * len(value)
+                entries = zip(range(len(value)), zip(repeat(item_kind), repeat(item_payload), value))
+                stack.append([entries, items, prefix, None, -1])
+                continue
+            if error_count == max_errors:
+                break
+
+        if error_count == max_errors:
+            # the lists walked with a frame only keep the items that were reached
+            for frame in stack:
+                if frame[3] is None:
+                    del frame[1][frame[4] + 1 :]
+
+        if hooks is not None:
+            hooks.after_record(name, validated, errors, perf_counter() - started)
+        return validated, errors, error_count
+
+    def _validate_hooked(self, values, bail, max_errors):
+        """`_validate_limited` reporting every rule call and the record to the hooks."""
+        hooks = self._hooks
+        before_rule = hooks.before_rule
+        after_rule = hooks.after_rule
+        name = self._name
+        clock = perf_counter
+
+        errors = {}
+        validated = {}
+        get = values.get
+        error_count = 0
+        started = clock()
+
+        for field_name, rules in self._schema:
+            value = get(field_name)
+            validated[field_name] = value
+
+            field_errors = None
+            for rule in rules:
+                before_rule(name, field_name, rule, value)
+                start = clock()
+                error_message = rule.validate(value, field_name)
+                after_rule(name, field_name, rule, value, error_message, clock() - start)
+                if error_message is not None:
+                    if field_errors is None:
+                        field_errors = errors[field_name] = [error_message]
+                    else:
+                        field_errors.append(error_message)
+                    error_count += 1
+                    if bail or error_count == max_errors:
+                        break
+            if error_count == max_errors:
+                break
+
+        hooks.after_record(name, validated, errors, clock() - started)
+        return validated, errors, error_count
+
+    async def avalidate(self, values: dict, is_err_to_list=False, concurrency=None, lazy=False):
+        """
+        Validate the provided values against the compiled schema, awaiting asynchronous rules.
+
+        A rule may return a coroutine (or any awaitable) from `validate`. Synchronous rules run
+        right away, the awaitables of all fields run concurrently.
+
+        Parameters:
+            values (dict): A dictionary where keys are field names and values are the values to be validated.
+            is_err_to_list (bool, optional): Return the errors as a single list of messages (default: False).
+            concurrency (int, optional): The maximum number of asynchronous rules awaited at the same time (default: no limit).
+            lazy (bool, optional): Keep the `ValidationError` records instead of rendering them to messages (default: False).
+
+        Returns:
+            tuple: The same `(validated, errors)` tuple as `validate`.
+
+        Raises:
+            ValueError: If the schema has nested fields, or `concurrency` is less than 1.
+        """
+        if self._nested:
+            raise ValueError("avalidate does not support nested schemas")
+        if concurrency is not None and concurrency < 1:
+            raise ValueError("concurrency must be greater than 0")
+        # imported here, asyncio is a large part of the import time of the package
+        import asyncio
+        import inspect
+
+        validated = self._slots.copy()
+        get = values.get
+        outcomes = []
+        pending = []
+
+        for field_name, checks in self._plan:
+            value = get(field_name)
+            validated[field_name] = value
+
+            results = []
+            for check in checks:
+                result = check(value, field_name)
+                if result is not None and inspect.isawaitable(result):
+                    pending.append((results, len(results), result))
+                results.append(result)
+            outcomes.append((field_name, results))
+
+        if pending:
+            awaitables = [awaitable for _, _, awaitable in pending]
+            if concurrency is not None:
+                semaphore = asyncio.Semaphore(concurrency)
+
+                async def limited(awaitable):
+                    async with semaphore:
+                        return await awaitable
+
+                awaitables = [limited(awaitable) for awaitable in awaitables]
+
+            for (results, index, _), result in zip(pending, await asyncio.gather(*awaitables)):
+                results[index] = result
+
+        errors = {}
+        for field_name, results in outcomes:
+            field_errors = [result for result in results if result is not None]
+            if field_errors:
+                errors[field_name] = field_errors
+
+        if is_err_to_list:
+            errors = err_to_list(errors)
+        elif errors and not lazy:
+            errors = render_errors(errors)
+        return validated, errors
+
+    def validate_many(self, rows, is_err_to_list=False, lazy=False, bail=False, max_errors=None):
+        """
+        Validate many records against the compiled schema.
+
+        Parameters:
+            rows (Iterable[dict]): The records to validate.
+            is_err_to_list (bool, optional): Return the errors of each record as a single list of messages (default: False).
+            lazy (bool, optional): Keep the `ValidationError` records instead of rendering them to messages (default: False).
+            bail (bool, optional): Stop running the rules of a field after its first error (default: False).
+            max_errors (int, optional): Stop validating the batch once this many errors have been collected.
+                The record that reaches the budget is returned partially validated, the remaining rows are not read (default: no limit).
+
+        Returns:
+            tuple: A tuple containing:
+                - results (list[tuple]): The `(validated, errors)` tuple of each record, in the order of `rows`.
+                - counts (dict): Aggregate counts with the keys `total`, `valid`, `invalid`, `errors` and
+                  `aborted` (True when `max_errors` stopped the batch).
+        """
+        if bail or max_errors is not None or self._limited:
+            _check_max_errors(max_errors)
+            return self._validate_many_limited(rows, is_err_to_list, lazy, bail, max_errors)
+        if self._generated is not None:
+            return self._validate_many_generated(rows, is_err_to_list, lazy)
+
+        plan = self._plan
+        slots = self._slots
+        results = []
+        append = results.append
+        invalid = 0
+        error_count = 0
+
+        for values in rows:
+            errors = {}
+            validated = slots.copy()
+            get = values.get
+
+            for field_name, checks in plan:
+                value = get(field_name)
+                validated[field_name] = value
+
+                field_errors = None
+                for check in checks:
+                    error_message = check(value, field_name)
+                    if error_message is not None:
+                        if field_errors is None:
+                            field_errors = errors[field_name] = [error_message]
+                        else:
+                            field_errors.append(error_message)
+                        error_count += 1
+
+            if errors:
+                invalid += 1
+                if is_err_to_list:
+                    errors = err_to_list(errors)
+                elif not lazy:
+                    errors = render_errors(errors)
+            elif is_err_to_list:
+                errors = []
+            append((validated, errors))
+
+        total = len(results)
+        counts = {
+            "total": total,
+            "valid": total - invalid,
+            "invalid": invalid,
+            "errors": error_count,
+            "aborted": False,
+        }
+        return results, counts
+
+    def _validate_many_generated(self, rows, is_err_to_list, lazy):
+        generated = self._generated
+        results = []
+        append = results.append
+        invalid = 0
+        error_count = 0
+
+        for values in rows:
+            validated, errors = generated(values)
+            if errors:
+                invalid += 1
+                error_count += sum(map(len, errors.values()))
+                if is_err_to_list:
+                    errors = err_to_list(errors)
+                elif not lazy:
+                    errors = render_errors(errors)
+            elif is_err_to_list:
+                errors = []
+            append((validated, errors))
+
+        total = len(results)
+        counts = {
+            "total": total,
+            "valid": total - invalid,
+            "invalid": invalid,
+            "errors": error_count,
+            "aborted": False,
+        }
+        return results, counts
+
+    def _validate_many_limited(self, rows, is_err_to_list, lazy, bail, max_errors):
+        results = []
+        append = results.append
+        invalid = 0
+        error_count = 0
+        aborted = False
+
+        for values in rows:
+            budget = None if max_errors is None else max_errors - error_count
+            validated, errors, row_errors = self._validate_limited(values, bail, budget)
+            error_count += row_errors
+
+            if errors:
+                invalid += 1
+                if is_err_to_list:
+                    errors = err_to_list(errors)
+                elif not lazy:
+                    errors = render_errors(errors)
+            elif is_err_to_list:
+                errors = []
+            append((validated, errors))
+
+            if error_count == max_errors:
+                aborted = True
+                break
+
+        total = len(results)
+        counts = {
+            "total": total,
+            "valid": total - invalid,
+            "invalid": invalid,
+            "errors": error_count,
+            "aborted": aborted,
+        }
+        return results, counts
+
+    def validate_many_parallel(
+        self, rows, is_err_to_list=False, workers=None, chunk_size=1000, bail=False, max_errors=None
+    ):
+        """
+        Validate many records in a pool of worker processes.
+
+        The records are split into chunks of `chunk_size` records, the schema is sent once to every
+        worker and the results come back in the order of `rows`. Custom rules must be importable by
+        the worker processes (defined in a module, not in `__main__` of an interactive session).
+
+        Parameters:
+            rows (Iterable[dict]): The records to validate.
+            is_err_to_list (bool, optional): Return the errors of each record as a single list of messages (default: False).
+            workers (int, optional): The number of worker processes (default: the number of CPUs).
+            chunk_size (int, optional): The number of records sent to a worker at once (default: 1000).
+            bail (bool, optional): Stop running the rules of a field after its first error (default: False).
+            max_errors (int, optional): Stop validating the batch once this many errors have been collected,
+                with the same results as `validate_many` (default: no limit).
+
+        Returns:
+            tuple: The same `(results, counts)` tuple as `validate_many`.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be greater than 0")
+        _check_max_errors(max_errors)
+        from concurrent.futures import ProcessPoolExecutor
+
+        rows = iter(rows)
+        chunks = iter(lambda: list(islice(rows, chunk_size)), [])
+        results = []
+        counts = {"total": 0, "valid": 0, "invalid": 0, "errors": 0, "aborted": False}
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(self,)
+        ) as executor:
+            # keep a bounded number of chunks in flight so large inputs are not read at once
+            max_pending = 2 * (workers or os.cpu_count() or 1)
+            pending = deque()
+            for chunk in chunks:
+                future = executor.submit(_validate_chunk, chunk, is_err_to_list, bail, max_errors)
+                pending.append((chunk, future))
+                if len(pending) >= max_pending:
+                    _collect(self, pending.popleft(), results, counts, is_err_to_list, bail, max_errors)
+                    if counts["aborted"]:
+                        break
+            while pending and not counts["aborted"]:
+                _collect(self, pending.popleft(), results, counts, is_err_to_list, bail, max_errors)
+            for _, future in pending:
+                future.cancel()
+
+        return results, counts
+
+
+def _init_worker(schema):
+    global _worker_schema
+    _worker_schema = schema
+
+
+def _validate_chunk(rows, is_err_to_list, bail, max_errors):
+    return _worker_schema.validate_many(rows, is_err_to_list, False, bail, max_errors)
+
+
+def _collect(schema, pending, results, counts, is_err_to_list, bail, max_errors):
+    chunk, future = pending
+    chunk_results, chunk_counts = future.result()
+    if max_errors is not None and counts["errors"] + chunk_counts["errors"] >= max_errors:
+        # the worker did not know what was left of the budget, redo the last chunk with it
+        chunk_results, chunk_counts = schema.validate_many(
+            chunk, is_err_to_list, False, bail, max_errors - counts["errors"]
+        )
+    results.extend(chunk_results)
+    for key in ("total", "valid", "invalid", "errors"):
+        counts[key] += chunk_counts[key]
+    counts["aborted"] = chunk_counts["aborted"]
+
+
+def _check_max_errors(max_errors):
+    if max_errors is not None and max_errors < 1:
+        raise ValueError("max_errors must be greater than 0")
+
+
+def compile_schema(schema, adaptive=False, intern=False, hooks=None, name=None, codegen=False) -> CompiledSchema:
+    """
+    Compile a validation schema into a reusable `CompiledSchema`.
+
+    Parameters:
+        schema (dict | CompiledSchema): A dictionary where keys are field names and values are lists of validation rule objects.
+        adaptive (bool, optional): Reorder the rules of each field from their measured cost and failure rate
+            when validating with `bail=True` (default: False).
+        intern (bool, optional): Replace the built-in rules by the instance shared with every other schema
+            using an identical rule, see `apn_validators.rules.intern_rule` (default: False).
+        hooks (Hooks, optional): Report every rule call and every record to these hooks, e.g. a
+            `MetricsCollector` (default: None). Cannot be used with `adaptive`.
+        name (str, optional): The name of the schema reported to the hooks (default: None).
+        codegen (bool, optional): Generate and compile one Python function with the checks of the
+            built-in rules inlined, see `apn_validators.codegen` (default: False).
+
+    Returns:
+        CompiledSchema: The compiled schema. An already compiled schema is returned as is, unless
+        `adaptive`, `intern`, `hooks`, `name` or `codegen` ask for something it was compiled without:
+        it is then compiled again with these options added to its own.
+
+    Example:
+        compiled = compile_schema({'email': [NotBlank(), Email()]})
+        for payload in payloads:
+            validated, err = compiled.validate(payload)
+    """
+    if isinstance(schema, CompiledSchema):
+        # the options that are not given are the ones the schema was compiled with
+        adaptive = adaptive or schema.adaptive
+        codegen = codegen or schema.codegen
+        if hooks is None:
+            hooks = schema.hooks
+        if name is None:
+            name = schema.name
+        if (
+            not intern
+            and adaptive == schema.adaptive
+            and codegen == schema.codegen
+            and hooks is schema.hooks
+            and name == schema.name
+        ):
+            return schema
+        schema = schema.schema
+    if intern:
+        from .rules.base import intern_rule
+
+        schema = {
+            field_name: [intern_rule(rule) for rule in rules] if isinstance(rules, (list, tuple)) else intern_rule(rules)
+            for field_name, rules in schema.items()
+        }
+    return CompiledSchema(schema, adaptive, hooks, name, codegen)
+
+
+_EMPTY = {}
+
+
+def _run(rules, value, path, errors, left, bail, hooks, name):
+    """Run the rules of one value of a nested schema, return the number of errors (at most `left`)."""
+    count = 0
+    for rule in rules:
+        if hooks is None:
+            error_message = rule.validate(value, path)
+        else:
+            hooks.before_rule(name, path, rule, value)
+            start = perf_counter()
+            error_message = rule.validate(value, path)
+            hooks.after_rule(name, path, rule, value, error_message, perf_counter() - start)
+        if error_message is not None:
+            field_errors = errors.get(path)
+            if field_errors is None:
+                errors[path] = [error_message]
+            else:
+                field_errors.append(error_message)
+            count += 1
+            if bail or count == left:
+                break
+    return count
+
+
+def _run_object(nodes, get, validated, prefix, errors, left, bail, hooks, name):
+    """Run the nodes of a flat sub-schema on one object, return the number of errors (at most `left`)."""
+    count = 0
+    for key, _, rules in nodes:
+        value = get(key)
+        validated[key] = value
+        path = prefix + key if type(key) is str else "{}{}".format(prefix, key)
+        if hooks is not None:
+            count += _run(rules, value, path, errors, None if left is None else left - count, bail, hooks, name)
+            if count == left:
+                break
+            continue
+
+        field_errors = None
+        for rule in rules:
+            error_message = rule.validate(value, path)
+            if error_message is not None:
+                if field_errors is None:
+                    field_errors = errors[path] = [error_message]
+                else:
+                    field_errors.append(error_message)
+                count += 1
+                if bail or count == left:
+                    break
+        if count == left:
+            break
+    return count
+
+
+def _node(spec):
+    """Return the `(kind, payload)` of a field of a schema."""
+    if isinstance(spec, (list, tuple)):
+        return _RULES, tuple(spec)
+    from .rules.nested_validators import _node as nested_node
+
+    return nested_node(spec)
@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+import os
+
+from .errors import err_to_list
+from .schema import compile_schema
+
+_FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+
+def _guess_format(source):
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", None)
+    extension = ""
+    if isinstance(name, (str, os.PathLike)):
+        extension = os.path.splitext(os.fspath(name))[1].lower()
+    if extension not in _FORMATS:
+        raise ValueError(
+            "cannot guess the format of {!r}, pass format='csv' or format='jsonl'".format(name)
+        )
+    return _FORMATS[extension]
+
+
+def _read_rows(file, format, delimiter):
+    if format == "csv":
+        yield from csv.DictReader(file, delimiter=delimiter)
+    elif format == "jsonl":
+        loads = json.loads
+        for line_number, line in enumerate(file, 1):
+            if line.strip():
+                row = loads(line)
+                if not isinstance(row, dict):
+                    raise ValueError("line {} is not a JSON object: {}".format(line_number, line.strip()[:40]))
+                yield row
+    else:
+        raise ValueError("unknown format {!r}, expected 'csv' or 'jsonl'".format(format))
+
+
+def validate_stream(
+    schema,
+    source,
+    format=None,
+    skip_valid=False,
+    max_errors=None,
+    is_err_to_list=False,
+    buffer_size=io.DEFAULT_BUFFER_SIZE,
+    encoding="utf-8",
+    delimiter=",",
+    bail=False,
+):
+    """
+    Validate the rows of a CSV or JSON-Lines file one at a time.
+
+    Only one row is held in memory at a time, so the memory use does not depend on the size of the file.
+
+    Parameters:
+        schema (dict | CompiledSchema): A dictionary where keys are field names and values are lists of validation rule objects.
+        source (str | os.PathLike | file object): The path of the file, or an open text file.
+        format (str, optional): "csv" or "jsonl". Guessed from the file extension when not set (default: None).
+        skip_valid (bool, optional): Only yield the rows that have errors (default: False).
+        max_errors (int, optional): Stop reading once this many error messages have been collected. The row that
+            reaches the budget is returned partially validated (default: no limit).
+        is_err_to_list (bool, optional): Return the errors of each row as a single list of messages (default: False).
+        buffer_size (int, optional): The read buffer size in bytes used when `source` is a path (default: io.DEFAULT_BUFFER_SIZE).
+        encoding (str, optional): The encoding used when `source` is a path (default: utf-8).
+        delimiter (str, optional): The CSV delimiter (default: ",").
+        bail (bool, optional): Stop running the rules of a field after its first error (default: False).
+
+    Yields:
+        tuple: `(row_number, validated, errors)` for each row, where `row_number` starts at 1 for the first record.
+
+    Raises:
+        ValueError: If a line of a JSON-Lines file is not a JSON object, e.g. `[1, 2]`.
+
+    Example:
+        for row_number, validated, err in validate_stream(schema, "partners.csv", skip_valid=True, max_errors=1000):
+            print(row_number, err)
+    """
+    if format is None:
+        format = _guess_format(source)
+    if max_errors is not None and max_errors < 1:
+        raise ValueError("max_errors must be greater than 0")
+
+    compiled = compile_schema(schema)
+    if isinstance(source, (str, os.PathLike)):
+        file = open(source, newline="", encoding=encoding, buffering=buffer_size)
+    else:
+        file = None
+
+    try:
+        error_count = 0
+        rows = _read_rows(file if file is not None else source, format, delimiter)
+        for row_number, row in enumerate(rows, 1):
+            # a row with more errors than are left stops at the budget, like `validate`
+            budget = None if max_errors is None else max_errors - error_count
+            validated, errors = compiled.validate(row, bail=bail, max_errors=budget)
+            if not errors:
+                if not skip_valid:
+                    yield row_number, validated, [] if is_err_to_list else errors
+                continue
+
+            error_count += sum(map(len, errors.values()))
+            if is_err_to_list:
+                errors = err_to_list(errors)
+            yield row_number, validated, errors
+
+            if max_errors is not None and error_count >= max_errors:
+                return
+    finally:
+        if file is not None:
+            file.close()
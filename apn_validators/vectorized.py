@@ -0,0 +1,148 @@
+"""
+Column based validation for the numeric and length rules.
+
+When NumPy is installed, a whole column is checked with array operations and error messages are
+only built for the rows that failed. The length rules are only checked that way for a NumPy array
+of strings. Without NumPy, or for rules that have no vectorized
+implementation, every value goes through `rule.validate`.
+"""
+
+from .rules.number_validators import (
+    GreaterThen,
+    GreaterThenOrEqual,
+    LessThen,
+    LessThenOrEqual,
+    NumberRange,
+)
+from .rules.string_validators import Length, MaxLength, MinLength
+from .rules.string_validators import _length as _value_length
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+
+def _to_float(values):
+    """Convert a column to a float array and a mask of the values `float()` rejects."""
+    if isinstance(values, np.ndarray):
+        if values.dtype.kind in "biuf":
+            return values.astype(np.float64, copy=False), np.zeros(values.shape, dtype=bool)
+        values = values.tolist()
+
+    numbers = np.empty(len(values), dtype=np.float64)
+    invalid = np.zeros(len(values), dtype=bool)
+    for index, value in enumerate(values):
+        try:
+            numbers[index] = float(value)
+        except ValueError:
+            numbers[index] = np.nan
+            invalid[index] = True
+    return numbers, invalid
+
+
+def _lengths(values):
+    """Length of every string of an array of strings, as the length rules count it."""
+    return np.char.str_len(values)
+
+
+def _greater_then_or_equal(rule, values):
+    numbers, invalid = _to_float(values)
+    return invalid | (numbers < rule.threshold)
+
+
+def _greater_then(rule, values):
+    numbers, invalid = _to_float(values)
+    return invalid | (numbers <= rule.threshold)
+
+
+def _less_then_or_equal(rule, values):
+    numbers, invalid = _to_float(values)
+    return invalid | (numbers > rule.threshold)
+
+
+def _less_then(rule, values):
+    numbers, invalid = _to_float(values)
+    return invalid | (numbers >= rule.threshold)
+
+
+def _number_range(rule, values):
+    numbers, invalid = _to_float(values)
+    return invalid | (numbers < rule.min) | (numbers > rule.max)
+
+
+def _length(rule, values):
+    lengths = _lengths(values)
+    return (lengths < rule.min_length) | (lengths > rule.max_length)
+
+
+def _min_length(rule, values):
+    return _lengths(values) < rule.min
+
+
+def _max_length(rule, values):
+    return _lengths(values) > rule.max
+
+
+_VECTORIZED = {
+    GreaterThenOrEqual: _greater_then_or_equal,
+    GreaterThen: _greater_then,
+    LessThenOrEqual: _less_then_or_equal,
+    LessThen: _less_then,
+    NumberRange: _number_range,
+    Length: _length,
+    MinLength: _min_length,
+    MaxLength: _max_length,
+}
+
+# counting the lengths of other columns is a loop over the values, as slow as the loop of `validate`
+_STRING_ARRAYS_ONLY = frozenset({Length, MinLength, MaxLength})
+
+
+def is_vectorized(rule) -> bool:
+    """
+    Return True when `rule` is checked with array operations by `validate_column`, the length rules
+    only for a NumPy array of strings.
+    """
+    return np is not None and type(rule) in _VECTORIZED
+
+
+def validate_column(rule, values, field_name: str):
+    """
+    Validate every value of a column with a single rule.
+
+    Parameters:
+        rule: The validation rule object.
+        values (list | numpy.ndarray): The column values.
+        field_name (str): The name of the field being validated.
+
+    Returns:
+        tuple: A tuple containing:
+            - mask (numpy.ndarray | list[bool]): True for every value that failed the rule.
+            - failed (numpy.ndarray | list[int]): The indices of the values that failed.
+            - errors (list[ValidationError]): The error of each failed value, in the order of `failed`.
+        Without NumPy, `mask` and `failed` are plain lists.
+
+    Example:
+        mask, failed, errors = validate_column(NumberRange(min=0, max=100), readings, "reading")
+    """
+    check = _VECTORIZED.get(type(rule)) if np is not None else None
+    if check is not None and type(rule) in _STRING_ARRAYS_ONLY:
+        if not (isinstance(values, np.ndarray) and values.dtype.kind in "US"):
+            check = None
+
+    if check is None:
+        validate = rule.validate
+        results = [validate(value, field_name) for value in values]
+        failed = [index for index, error in enumerate(results) if error is not None]
+        errors = [results[index] for index in failed]
+        if np is not None:
+            mask = np.zeros(len(results), dtype=bool)
+            mask[failed] = True
+            return mask, np.array(failed, dtype=np.intp), errors
+        return [error is not None for error in results], failed, errors
+
+    mask = check(rule, values)
+    failed = np.flatnonzero(mask)
+    errors = [rule.validate(values[index], field_name) for index in failed.tolist()]
+    return mask, failed, errors
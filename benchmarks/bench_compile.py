@@ -0,0 +1,61 @@
+"""
+Compare the interpreted `validate()` path against a `CompiledSchema` on a 40 field schema.
+
+Usage:
+    python benchmarks/bench_compile.py [--number 20000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apn_validators import compile_schema, validate  # noqa: E402
+from apn_validators.rules import (  # noqa: E402
+    Email,
+    InList,
+    Length,
+    NotBlank,
+    NumberRange,
+    StartsWith,
+)
+
+
+def build_schema(size=40):
+    kinds = [
+        [NotBlank(), Length(min=3, max=20)],
+        [NotBlank(), Email()],
+        [NumberRange(min=0, max=100)],
+        [InList(["admin", "member", "guest"])],
+        [StartsWith(("id-", "sku-"))],
+    ]
+    values = ["agung_pn", "agung@example.com", 42, "member", "sku-1234"]
+
+    schema, record = {}, {}
+    for i in range(size):
+        schema["field_{}".format(i)] = kinds[i % len(kinds)]
+        record["field_{}".format(i)] = values[i % len(values)]
+    return schema, record
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    schema, record = build_schema()
+    compiled = compile_schema(schema)
+    assert compiled.validate(record) == validate(schema, record)
+
+    interpreted = min(timeit.repeat(lambda: validate(schema, record), number=args.number, repeat=5))
+    fast = min(timeit.repeat(lambda: compiled.validate(record), number=args.number, repeat=5))
+
+    print("interpreted validate(): {:8.2f} us/call".format(interpreted / args.number * 1e6))
+    print("CompiledSchema.validate: {:8.2f} us/call".format(fast / args.number * 1e6))
+    print("speedup: {:.2f}x".format(interpreted / fast))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare `datetime.datetime.strptime` against `DateParser` for each kind of date format.
+
+Each format is measured with repeated values (a few hundred distinct dates, the cached case) and
+with unique values (every value parsed once, the uncached case).
+
+Usage:
+    python benchmarks/bench_dates.py [--number 100000]
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apn_validators.date_parser import DateParser  # noqa: E402
+
+FORMATS = [
+    ("%Y-%m-%d", "ISO, date.fromisoformat"),
+    ("%Y/%m/%d", "numeric, precompiled regex"),
+    ("%d-%m-%Y %H:%M", "numeric with time, precompiled regex"),
+    ("%b %d %Y", "named month, strptime fallback"),
+]
+
+
+def random_dates(count):
+    start = datetime.datetime(2000, 1, 1)
+    return [start + datetime.timedelta(minutes=random.randint(0, 20 * 365 * 24 * 60)) for _ in range(count)]
+
+
+def strptime_all(values, date_format):
+    strptime = datetime.datetime.strptime
+    for value in values:
+        strptime(value, date_format)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+
+    for date_format, label in FORMATS:
+        distinct = [date.strftime(date_format) for date in random_dates(300)]
+        repeated = [random.choice(distinct) for _ in range(args.number)]
+        unique = [date.strftime(date_format) for date in random_dates(args.number)]
+
+        print("{} ({})".format(date_format, label))
+        for case, values in (("repeated", repeated), ("unique", unique)):
+            baseline = timeit.timeit(lambda: strptime_all(values, date_format), number=1)
+            fast_parser = DateParser(date_format)
+            fast = timeit.timeit(lambda: list(map(fast_parser, values)), number=1)
+            print(
+                "  {:<9} strptime: {:6.3f}s  DateParser: {:6.3f}s  speedup: {:5.1f}x".format(
+                    case, baseline, fast, baseline / fast
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Compare `InList` / `NotInList` against a scan of the list for allow-lists from 10 to 1M values.
+
+The list scan is what the rules did before they were backed by a frozenset. Every check looks
+up a value that is found in the middle of the list and a value that is missing.
+
+Usage:
+    python benchmarks/bench_inlist.py [--number 2000] [--sizes 10,100,1000,10000,100000,1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apn_validators.rules import InList, NotInList  # noqa: E402
+
+
+def timed(func, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--sizes", default="10,100,1000,10000,100000,1000000")
+    args = parser.parse_args()
+
+    print("{:>9}  {:>10}  {:>12}  {:>12}  {:>12}".format("size", "build", "list scan", "InList", "NotInList"))
+    for size in map(int, args.sizes.split(",")):
+        values = ["SKU-{:08d}".format(i) for i in range(size)]
+        present = values[size // 2]
+        missing = "SKU-MISSING"
+
+        start = time.perf_counter()
+        in_list = InList(values)
+        build = time.perf_counter() - start
+        not_in_list = NotInList(values)
+
+        # fewer repetitions of the scan on large lists, it is linear
+        number = max(1, args.number * 1000 // max(size, 1000))
+        scan = timed(lambda: (present in values, missing in values), number)
+        indexed = timed(lambda: (in_list.validate(present, "sku"), in_list.validate(missing, "sku")), args.number)
+        not_indexed = timed(
+            lambda: (not_in_list.validate(present, "sku"), not_in_list.validate(missing, "sku")), args.number
+        )
+        print(
+            "{:>9}  {:>8.3f}ms  {:>10.2f}us  {:>10.2f}us  {:>10.2f}us".format(
+                size, build * 1e3, scan * 1e6, indexed * 1e6, not_indexed * 1e6
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Measure the memory footprint of one schema with tracemalloc.
+
+Builds many copies of a typical schema (the shape a multi-tenant service keeps per tenant) and
+reports the memory per schema, with and without interning the rules. With `--before REF` the same
+measurement runs on the tree of a git revision. Compare with the release being upgraded from rather
+than with the previous commit, which only shows the change of one commit.
+
+Usage:
+    python benchmarks/bench_memory.py [--schemas 2000] [--before RELEASE]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def tenant_schema(rules, tenant):
+    return {
+        "username": [rules.NotBlank(), rules.Length(min=3, max=20)],
+        "email": [rules.NotBlank(), rules.Email(), rules.MaxLength(120)],
+        "password": [rules.NotBlank(), rules.Password()],
+        "role": [rules.InList(["admin", "member", "guest"])],
+        "country": [rules.InList(["ID", "SG", "MY", "TH", "VN", "PH"])],
+        "phone": [rules.NotBlank(), rules.StartsWith(("62", "65", "60")), rules.DigitsBetween(8, 15)],
+        "age": [rules.Numeric(), rules.NumberRange(min=17, max=99)],
+        "code": [rules.MatchRegex(r"^[A-Z]{3}-\d{4}$")],
+        "birth_date": [rules.IsDate()],
+        # one rule differs per tenant, so interning cannot share everything
+        "limit": [rules.Numeric(), rules.Lte(1000 + tenant % 50)],
+    }
+
+
+def measure(root, count, intern):
+    sys.path.insert(0, root)
+    from apn_validators import rules
+
+    if intern and not hasattr(rules, "intern_rule"):
+        return None
+
+    tenant_schema(rules, 0)  # warm the shared caches (regex registry, templates, parsers)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    schemas = []
+    for tenant in range(count):
+        schema = tenant_schema(rules, tenant)
+        if intern:
+            schema = {field_name: [rules.intern_rule(rule) for rule in field_rules] for field_name, field_rules in schema.items()}
+        schemas.append(schema)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del schemas
+    return size / count
+
+
+def run(root, count, intern, label):
+    # a fresh interpreter for every measurement, so the imports and caches do not add up
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--measure", root, "--schemas", str(count)]
+        + (["--intern"] if intern else []),
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    value = result.stdout.strip()
+    if value == "None":
+        print("{:<28} not available".format(label))
+    else:
+        print("{:<28} {:>10.0f} bytes per schema".format(label, float(value)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schemas", type=int, default=2000)
+    parser.add_argument("--before", metavar="REF", help="also measure the tree of this git revision")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    parser.add_argument("--intern", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(measure(args.measure, args.schemas, args.intern))
+        return
+
+    if args.before:
+        with tempfile.TemporaryDirectory() as tree:
+            archive = subprocess.run(["git", "-C", ROOT, "archive", args.before], check=True, capture_output=True)
+            subprocess.run(["tar", "-x", "-C", tree], input=archive.stdout, check=True)
+            run(tree, args.schemas, False, "{} (plain rules)".format(args.before))
+    run(ROOT, args.schemas, False, "current (plain rules)")
+    run(ROOT, args.schemas, True, "current (interned rules)")
+
+
+if __name__ == "__main__":
+    main()
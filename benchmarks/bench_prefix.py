@@ -0,0 +1,59 @@
+"""
+Compare `StartsWith` / `EndsWith` against the previous implementation, which converted the
+prefixes to a tuple of strings on every call and scanned them with `str.startswith`.
+
+Usage:
+    python benchmarks/bench_prefix.py [--number 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apn_validators.rules import EndsWith, StartsWith  # noqa: E402
+
+
+def legacy_starts_with(value, list_prefix):
+    return str(value).startswith(tuple(map(str, list_prefix)))
+
+
+def legacy_ends_with(value, list_tail):
+    return str(value).endswith(tuple(map(str, list_tail)))
+
+
+def timed(func, values):
+    start = time.perf_counter()
+    for value in values:
+        func(value)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+
+    digits = "0123456789"
+    for count in (10, 100, 1000, 10000):
+        affixes = tuple({"".join(random.choices(digits, k=random.randint(1, 6))) for _ in range(count)})
+        values = ["".join(random.choices(digits, k=12)) for _ in range(args.number)]
+        starts, ends = StartsWith(affixes), EndsWith(affixes)
+
+        # only the check, the error of the failing values is built the same way by both
+        scan = timed(lambda value: legacy_starts_with(value, affixes), values)
+        indexed = timed(lambda value: starts._affixes().found(str(value)), values)
+        scan_end = timed(lambda value: legacy_ends_with(value, affixes), values)
+        indexed_end = timed(lambda value: ends._affixes().found(str(value)), values)
+        print(
+            "{:>6} affixes  before: {:6.3f}s  StartsWith: {:6.3f}s  before: {:6.3f}s  EndsWith: {:6.3f}s".format(
+                len(affixes), scan, indexed, scan_end, indexed_end
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Compare `validate_column` against calling `rule.validate` for every value of a large column.
+
+Usage:
+    python benchmarks/bench_vectorized.py [--size 1000000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apn_validators import vectorized  # noqa: E402
+from apn_validators.rules import Length, NumberRange  # noqa: E402
+from apn_validators.vectorized import validate_column  # noqa: E402
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1000000)
+    args = parser.parse_args()
+
+    if vectorized.np is None:
+        print("numpy is not installed, validate_column uses the pure Python path")
+
+    readings = [random.uniform(-5, 105) for _ in range(args.size)]
+    names = ["x" * random.randint(1, 30) for _ in range(args.size)]
+    columns = [("reading", NumberRange(min=0, max=100), readings), ("name", Length(min=3, max=20), names)]
+    if vectorized.np is not None:
+        columns.append(("reading (ndarray)", NumberRange(min=0, max=100), vectorized.np.array(readings)))
+        columns.append(("name (ndarray)", Length(min=3, max=20), vectorized.np.array(names)))
+
+    for label, rule, values in columns:
+        per_value = timed(lambda: [rule.validate(value, "data") for value in values])
+        column = timed(lambda: validate_column(rule, values, "data"))
+        print(
+            "{:<18} per value: {:7.3f}s  validate_column: {:7.3f}s  speedup: {:.1f}x".format(
+                label, per_value, column, per_value / column
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""
+Benchmark suite of every built-in rule and of the validation engine.
+
+- every rule is timed on a valid, an invalid and an edge input (None, very long strings, native
+  date objects, ...),
+- the engine is timed end to end on a sign-up schema: `validate`, `err_to_list`, `CompiledSchema`,
+  `bail`, `validate_many` and `validate_stream`,
+- the memory of a compiled schema and the peak memory of a batch are recorded with tracemalloc.
+
+The results are saved as JSON. Comparing two result files reports every case that got slower
+(or bigger) than the threshold and exits with status 1, so the suite can gate an upgrade.
+
+`--package` measures the apn_validators package of another checkout, e.g. the previous release.
+The cases whose rule or API that package does not have are skipped, and left out of the comparison.
+
+Usage:
+    python benchmarks/suite.py run --package ../apn-validators-release --output before.json
+    python benchmarks/suite.py run --output after.json --compare before.json --threshold 0.2
+    python benchmarks/suite.py compare before.json after.json [--threshold 0.2] [--memory-threshold 0.1]
+
+    # a quick, noisier run of some cases
+    python benchmarks/suite.py run --quick --filter Password
+"""
+
+import argparse
+import atexit
+import datetime
+import gc
+import importlib.metadata
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the engine API, set by load(); a name the measured package does not have is None
+ENGINE_API = ("compile_schema", "err_to_list", "validate", "validate_many", "validate_stream")
+compile_schema = err_to_list = validate = validate_many = validate_stream = None
+
+LONG = "x" * 10000
+_INDEXES = {}
+
+
+def index_path(values):
+    """Build the index file of the InIndex cases once, in a temporary directory."""
+    if values not in _INDEXES:
+        from apn_validators.index import build_index
+
+        if not _INDEXES:
+            _INDEXES[None] = tempfile.mkdtemp(prefix="apn-suite-")
+            atexit.register(shutil.rmtree, _INDEXES[None], True)
+        path = os.path.join(_INDEXES[None], "{}.idx".format(len(_INDEXES)))
+        build_index(["{}-{}".format(values, i) for i in range(50000)], path)
+        _INDEXES[values] = path
+    return _INDEXES[values]
+
+
+# (rule, factory, valid input, invalid input, edge input)
+RULES = [
+    ("Length", lambda: Length(min=3, max=20), "agung_pn", "ag", LONG),
+    ("MinLength", lambda: MinLength(3), "agung", "ag", None),
+    ("MaxLength", lambda: MaxLength(20), "agung", LONG, 12345),
+    ("NotBlank", lambda: NotBlank(), "agung", "", " \t\n "),
+    ("InList", lambda: InList(["admin", "member", "guest"]), "member", "root", 1),
+    ("InList.50k", lambda: InList(["sku-{}".format(i) for i in range(50000)]), "sku-49999", "sku-x", " sku-1 "),
+    ("NotInList", lambda: NotInList(["root", "admin"]), "member", "root", ["unhashable"]),
+    ("InIndex.50k", lambda: InIndex(index_path("sku")), "sku-49999", "sku-x", " sku-1 "),
+    ("NotInIndex.50k", lambda: NotInIndex(index_path("user")), "member", "user-42", None),
+    ("StartsWith", lambda: StartsWith(("62", "65", "60")), "628123456789", "12345", ""),
+    ("StartsWith.5k", lambda: StartsWith(tuple(str(i) for i in range(1000, 6000))), "4321-1", "999", LONG),
+    ("DoesntStartsWith", lambda: DoesntStartsWith(("tmp-", "test-")), "user-1", "tmp-1", 0),
+    ("EndsWith", lambda: EndsWith((".com", ".id")), "agung.id", "agung.org", ""),
+    ("DoesntEndsWith", lambda: DoesntEndsWith((".invalid",)), "agung.com", "x.invalid", LONG),
+    ("Equals", lambda: Equals("yes"), "yes", "no", None),
+    ("NotEquals", lambda: NotEquals("no"), "yes", "no", None),
+    ("Numeric", lambda: Numeric(), "12.5", "a12", "1e309"),
+    ("GreaterThenOrEqual", lambda: GreaterThenOrEqual(18), 20, 10, "18"),
+    ("GreaterThen", lambda: GreaterThen(18), 20, 18, "18.5"),
+    ("LessThenOrEqual", lambda: LessThenOrEqual(100), 100, 200, "99.999"),
+    ("LessThen", lambda: LessThen(100), 20, 200, 99.999),
+    ("NumberRange", lambda: NumberRange(min=17, max=99), 25, 100, "17"),
+    ("DecimalRange", lambda: DecimalRange(1, 2), "12.5", "12.555", "123456789.123456789"),
+    ("DigitsBetween", lambda: DigitsBetween(8, 15), "81234567", "123", "1" * 1000),
+    ("MatchRegex", lambda: MatchRegex(r"^[A-Z]{3}-\d{4}$"), "ABC-1234", "abc-1234", LONG),
+    ("NotMatchRegex", lambda: NotMatchRegex(r"\s"), "agung", "ag ung", LONG),
+    ("Password", lambda: Password(), "S3cr3t!pass", "secret", "Aa1!" * 250),
+    ("Email", lambda: Email(), "agung@example.com", "agung@", "a" * 5000 + "@example.com"),
+    ("IsDate", lambda: IsDate(), "2024-01-05", "2024-13-05", datetime.date(2024, 1, 5)),
+    ("IsDate.format", lambda: IsDate("%d/%m/%Y %H:%M"), "05/01/2024 10:30", "32/01/2024 10:30", 1704412800),
+    ("DateEquals", lambda: DateEquals("2024-01-05"), "2024-01-05", "2024-01-06", datetime.date(2024, 1, 5)),
+    ("DateAfter", lambda: DateAfter("2024-01-01"), "2024-06-01", "2023-06-01", datetime.datetime(2024, 6, 1, 10)),
+    ("DateBefore.relative", lambda: DateBefore("today+1w"), "2000-01-01", "2999-01-01", 0),
+    ("AllowedExtensions", lambda: AllowedExtensions(["pdf", "png"]), "report.pdf", "report.exe", ""),
+    ("Memoize.Email", lambda: Memoize(Email()), "agung@example.com", "agung@", ["unhashable"]),
+]
+
+
+
+def sign_up():
+    return {
+        "username": [NotBlank(), Length(min=3, max=20)],
+        "email": [NotBlank(), Email()],
+        "password": [NotBlank(), Password()],
+        "age": [Numeric(), NumberRange(min=17, max=99)],
+        "role": [InList(["admin", "member", "guest"])],
+        "phone": [StartsWith(("62", "65")), DigitsBetween(8, 15)],
+        "birth_date": [IsDate(), DateBefore("2010-01-01")],
+        "website": [MatchRegex(r"^https?://")],
+    }
+
+
+VALID = {
+    "username": "agung_pn",
+    "email": "agung@example.com",
+    "password": "S3cr3t!pass",
+    "age": 25,
+    "role": "member",
+    "phone": "628123456789",
+    "birth_date": "1995-04-12",
+    "website": "https://example.com",
+}
+INVALID = {
+    "username": "",
+    "email": "agung",
+    "password": "secret",
+    "age": "a10",
+    "role": "root",
+    "phone": "12",
+    "birth_date": "2015-13-01",
+    "website": "example.com",
+}
+
+
+def rows(count):
+    return [VALID if i % 4 else INVALID for i in range(count)]
+
+
+def csv_source(count):
+    lines = [",".join(VALID)]
+    for row in rows(count):
+        lines.append(",".join(str(row[field_name]) for field_name in VALID))
+    return "\n".join(lines) + "\n"
+
+
+def load(path):
+    """
+    Import apn_validators from `path` and make its rules and its engine API global.
+
+    A rule or a function that the package does not have is left out (None for the engine API), so
+    the cases using it are skipped instead of failing at import.
+    """
+    sys.path.insert(0, os.path.abspath(path))
+    package = importlib.import_module("apn_validators")
+    rules = importlib.import_module("apn_validators.rules")
+    globals().update((name, getattr(package, name, None)) for name in ENGINE_API)
+    globals().update((name, getattr(rules, name)) for name in dir(rules) if name[:1].isupper())
+    return package
+
+
+def skip(key, error):
+    print("{:<44} skipped ({}: {})".format(key, type(error).__name__, error), flush=True)
+
+
+def available(key, func):
+    """Call `func` once and return True, or print why the case is skipped and return False."""
+    try:
+        func()
+    except Exception as error:
+        skip(key, error)
+        return False
+    return True
+
+
+def engine_cases(schema):
+    compiled = compile_schema(schema) if compile_schema is not None else None
+    batch = rows(1000)
+    source = csv_source(1000)
+    # (name, function, number of records per call)
+    return [
+        ("validate.valid", lambda: validate(schema, VALID), 1),
+        ("validate.invalid", lambda: validate(schema, INVALID), 1),
+        ("validate.invalid.err_to_list", lambda: validate(schema, INVALID, True), 1),
+        ("err_to_list", lambda: err_to_list(validate(schema, INVALID, lazy=True)[1]), 1),
+        ("compiled.valid", lambda: compiled.validate(VALID), 1),
+        ("compiled.invalid", lambda: compiled.validate(INVALID), 1),
+        ("compiled.invalid.bail", lambda: compiled.validate(INVALID, bail=True), 1),
+        ("compiled.invalid.lazy", lambda: compiled.validate(INVALID, lazy=True), 1),
+        ("validate_many.1000", lambda: validate_many(compiled, batch), 1000),
+        ("validate_stream.csv.1000", lambda: list(validate_stream(compiled, io.StringIO(source), format="csv")), 1000),
+    ]
+
+
+def measure_memory(schema, selected):
+    batch = rows(10000)
+    source = csv_source(10000)
+    compiled = compile_schema(schema) if compile_schema is not None else None
+
+    def compiled_schema():
+        before = tracemalloc.take_snapshot()
+        schemas = [compile_schema(dict(schema)) for _ in range(100)]
+        after = tracemalloc.take_snapshot()
+        del schemas
+        return sum(stat.size_diff for stat in after.compare_to(before, "filename")) // 100
+
+    results = {}
+    # (name, function, whether the peak is recorded instead of the returned size)
+    for name, run, peak in (
+        ("compiled_schema", compiled_schema, False),
+        ("validate_many.10000.peak", lambda: validate_many(compiled, batch), True),
+        ("validate_many.10000.lazy.peak", lambda: validate_many(compiled, batch, lazy=True), True),
+        ("validate_stream.10000.peak", lambda: sum(1 for _ in validate_stream(compiled, io.StringIO(source), format="csv")), True),
+    ):
+        key = "memory.{}".format(name)
+        if not selected(key):
+            continue
+        gc.collect()
+        tracemalloc.start()
+        try:
+            size = run()
+        except Exception as error:
+            skip(key, error)
+            continue
+        finally:
+            highest = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        results[key] = highest if peak else size
+        print("{:<44} {:>12,d} bytes".format(key, results[key]), flush=True)
+    return results
+
+
+def package_version():
+    try:
+        return importlib.metadata.version("apn-validators")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def time_call(func, min_time, repeat):
+    """Return the best time of one call in nanoseconds, over `repeat` runs of about `min_time` seconds."""
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time / 5:
+            break
+        number *= 10 if elapsed < min_time / 50 else 2
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def run_suite(min_time, repeat, name_filter=None):
+    timings = {}
+
+    def selected(name):
+        return name_filter is None or name_filter.lower() in name.lower()
+
+    for name, factory, valid, invalid, edge in RULES:
+        cases = [
+            ("rule.{}.{}".format(name, case), value)
+            for case, value in (("valid", valid), ("invalid", invalid), ("edge", edge))
+        ]
+        cases = [(key, value) for key, value in cases if selected(key)]
+        if not cases:
+            continue
+        try:
+            rule = factory()
+        except Exception as error:
+            skip("rule.{}".format(name), error)
+            continue
+        for key, value in cases:
+            # render the message of an error, as the engine does by default
+            def call(rule=rule, value=value):
+                return str(rule.validate(value, "field"))
+
+            if available(key, call):
+                timings[key] = time_call(call, min_time, repeat)
+                print("{:<44} {:>12.1f} ns".format(key, timings[key]), flush=True)
+
+    schema = sign_up()
+    for name, func, records in engine_cases(schema):
+        key = "engine.{}".format(name)
+        if selected(key) and available(key, func):
+            timings[key] = time_call(func, min_time, repeat) / records
+            print("{:<44} {:>12.1f} ns per record".format(key, timings[key]), flush=True)
+
+    memory = measure_memory(schema, selected)
+
+    return {
+        "meta": {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "package": package_version(),
+            "package_path": os.path.dirname(sys.modules["apn_validators"].__file__),
+            "min_time": min_time,
+            "repeat": repeat,
+        },
+        "timings_ns": timings,
+        "memory_bytes": memory,
+    }
+
+
+def compare(base, new, threshold, memory_threshold):
+    """Print the change of every case found in both results and return the names of the regressions."""
+    regressions = []
+    for section, limit, unit in (("timings_ns", threshold, "ns"), ("memory_bytes", memory_threshold, "B")):
+        before, after = base.get(section, {}), new.get(section, {})
+        for key in sorted(before.keys() & after.keys()):
+            ratio = after[key] / before[key] if before[key] else 1.0
+            flag = ""
+            if ratio > 1 + limit:
+                flag = "REGRESSION"
+                regressions.append(key)
+            elif ratio < 1 - limit:
+                flag = "faster" if section == "timings_ns" else "smaller"
+            print(
+                "{:<44} {:>12.1f}{} -> {:>12.1f}{}  {:>+7.1%}  {}".format(
+                    key, before[key], unit, after[key], unit, ratio - 1, flag
+                )
+            )
+        for key in sorted(before.keys() - after.keys()):
+            print("{:<44} missing from the new results".format(key))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the suite")
+    run.add_argument("--output", help="save the results to this JSON file")
+    run.add_argument("--compare", metavar="BASE", help="compare the results with a saved JSON file")
+    run.add_argument(
+        "--package",
+        metavar="DIR",
+        default=ROOT,
+        help="directory holding the apn_validators package to measure (default: this repository)",
+    )
+    run.add_argument("--filter", help="only run the cases whose name contains this text")
+    run.add_argument("--quick", action="store_true", help="shorter, noisier measurements")
+    run.add_argument("--min-time", type=float, default=0.1, help="seconds per measurement (default: 0.1)")
+    run.add_argument("--repeat", type=int, default=5, help="measurements per case, the best is kept (default: 5)")
+
+    diff = commands.add_parser("compare", help="compare two saved JSON files")
+    diff.add_argument("base")
+    diff.add_argument("new")
+
+    for command in (run, diff):
+        command.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown (default: 0.2 = 20%%)")
+        command.add_argument(
+            "--memory-threshold", type=float, default=0.1, help="allowed memory growth (default: 0.1 = 10%%)"
+        )
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        load(args.package)
+        min_time, repeat = (0.02, 3) if args.quick else (args.min_time, args.repeat)
+        results = run_suite(min_time, repeat, args.filter)
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(results, file, indent=2, sort_keys=True)
+            print("results saved to {}".format(args.output))
+        if not args.compare:
+            return 0
+        with open(args.compare) as file:
+            base = json.load(file)
+    else:
+        with open(args.base) as file:
+            base = json.load(file)
+        with open(args.new) as file:
+            results = json.load(file)
+
+    regressions = compare(base, results, args.threshold, args.memory_threshold)
+    if regressions:
+        print("{} regression(s): {}".format(len(regressions), ", ".join(regressions)))
+        return 1
+    print("no regression")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
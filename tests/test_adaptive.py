@@ -0,0 +1,91 @@
+import pickle
+
+import pytest
+
+from apn_validators import compile_schema, validate
+from apn_validators.rules import *
+
+
+class NeverFails:
+    cost = 1
+
+    def validate(self, value, field_name):
+        return None
+
+
+class AlwaysFails:
+    cost = 2
+
+    def validate(self, value, field_name):
+        return "field {} always fails".format(field_name)
+
+
+class NoHint:
+    def validate(self, value, field_name):
+        return None
+
+
+def order(compiled, field_name):
+    return [stats["rule"] for stats in compiled.rule_stats() if stats["field"] == field_name]
+
+
+def test_hints_seed_the_order():
+    compiled = compile_schema(
+        {"email": [NotBlank(), Email(), Length(min=3, max=50)], "code": [Password(), NoHint(), MatchRegex("a"), InList(["a"])]},
+        adaptive=True,
+    )
+    assert compiled.adaptive
+    assert order(compiled, "email") == ["NotBlank", "Length", "Email"]
+    # NoHint keeps its place, the rules are only reordered on each side of it
+    assert order(compiled, "code") == ["Password", "NoHint", "InList", "MatchRegex"]
+
+
+def test_measured_failures_reorder_rules():
+    compiled = compile_schema({"name": [NeverFails(), AlwaysFails()]}, adaptive=True)
+    assert order(compiled, "name") == ["NeverFails", "AlwaysFails"]
+
+    for _ in range(600):
+        compiled.validate({"name": "agung"}, bail=True)
+
+    assert order(compiled, "name") == ["AlwaysFails", "NeverFails"]
+    stats = {stats["rule"]: stats for stats in compiled.rule_stats()}
+    assert stats["AlwaysFails"]["failure_rate"] == 1.0
+    # once reordered, NeverFails is no longer reached
+    assert stats["NeverFails"]["calls"] == 256
+
+
+def test_adaptive_same_errors_without_bail():
+    schema = {"username": [NotBlank(), Email(), Length(min=3, max=5)], "age": [Numeric(), NumberRange(min=17, max=99)]}
+    compiled = compile_schema(schema, adaptive=True)
+    for values in ({"username": "agung@example.com", "age": "a"}, {"username": "abcd", "age": 20}, {"username": "", "age": 30}):
+        assert compiled.validate(values) == validate(schema, values)
+
+
+def test_adaptive_bail_reports_one_error_per_field():
+    schema = {"username": [NotBlank(), Email(), Length(min=3, max=5)], "age": [Numeric(), NumberRange(min=17, max=99)]}
+    compiled = compile_schema(schema, adaptive=True)
+    validated, err = compiled.validate({"username": "agung@example.com", "age": "5"}, bail=True)
+    assert validated == {"username": "agung@example.com", "age": "5"}
+    assert err == {
+        "username": ["field username length must be between 3 and 5"],
+        "age": ["field age must be between from 17 and 99"],
+    }
+    validated, err = compiled.validate({"username": "", "age": "a"}, bail=True, max_errors=1)
+    assert validated == {"username": ""}
+    assert err == {"username": ["field username must not be blank"]}
+
+
+def test_adaptive_compile_and_pickle():
+    schema = {"username": [NotBlank()]}
+    compiled = compile_schema(schema)
+    with pytest.raises(ValueError):
+        compiled.rule_stats()
+    assert compile_schema(compiled) is compiled
+
+    adaptive = compile_schema(compiled, adaptive=True)
+    assert adaptive is not compiled and adaptive.adaptive
+    assert compile_schema(adaptive, adaptive=True) is adaptive
+
+    restored = pickle.loads(pickle.dumps(adaptive))
+    assert restored.adaptive
+    assert repr(restored) == "CompiledSchema(fields=('username',), adaptive=True)"
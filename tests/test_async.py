@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from apn_validators import avalidate, compile_schema, validate
+from apn_validators.rules import *
+
+
+class AsyncUnique:
+    def __init__(self, taken, delay=0.01):
+        self.taken = taken
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+
+    async def validate(self, value, field_name):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        if value in self.taken:
+            return "{} is not unique".format(field_name)
+        return None
+
+
+@pytest.mark.parametrize(
+    "values,expected_err",
+    [
+        ({"username": "agung_pn", "email": "new@example.com"}, {}),
+        (
+            {"username": "admin", "email": "taken@example.com"},
+            {"username": ["username is not unique"], "email": ["email is not unique"]},
+        ),
+        (
+            {"username": "", "email": "agung"},
+            {
+                "username": ["field username must not be blank", "field username length must be between 5 and 20"],
+                "email": ["field email is not a valid email address"],
+            },
+        ),
+        (
+            {"username": "", "email": "taken@example.com"},
+            {
+                "username": ["field username must not be blank", "field username length must be between 5 and 20"],
+                "email": ["email is not unique"],
+            },
+        ),
+    ],
+)
+def test_avalidate(values, expected_err):
+    unique = AsyncUnique({"admin", "taken@example.com"})
+    schema = {
+        "username": [NotBlank(), Length(min=5, max=20), unique],
+        "email": [unique, Email()],
+    }
+
+    validated, err = asyncio.run(avalidate(schema, values))
+    assert validated == values
+    assert err == expected_err
+
+    _, err = asyncio.run(avalidate(compile_schema(schema), values, True))
+    assert err == [message for messages in expected_err.values() for message in messages]
+
+
+def test_avalidate_sync_rules_same_as_validate():
+    schema = {"username": [NotBlank(), Length(min=5, max=20)], "email": [Email()]}
+    values = {"username": "agung", "email": "agung"}
+    assert asyncio.run(avalidate(schema, values)) == validate(schema, values)
+
+
+@pytest.mark.parametrize("concurrency,expected", [(None, 4), (2, 2), (1, 1)])
+def test_avalidate_concurrency(concurrency, expected):
+    unique = AsyncUnique(set())
+    schema = {"field_{}".format(i): [unique] for i in range(4)}
+    asyncio.run(avalidate(schema, {}, concurrency=concurrency))
+    assert unique.max_running == expected
+
+
+@pytest.mark.parametrize("concurrency", [0, -1])
+def test_avalidate_concurrency_below_one(concurrency):
+    unique = AsyncUnique(set())
+    with pytest.raises(ValueError):
+        # raised before a rule runs, an empty semaphore would never let one through
+        asyncio.run(asyncio.wait_for(avalidate({"username": [unique]}, {}, concurrency=concurrency), 5))
+    assert unique.max_running == 0
+    assert asyncio.run(asyncio.wait_for(avalidate({"username": [unique]}, {}, concurrency=1), 5)) == (
+        {"username": None},
+        {},
+    )
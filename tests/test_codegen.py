@@ -0,0 +1,195 @@
+import linecache
+import pickle
+
+import pytest
+
+from apn_validators import compile_schema, validate_many
+from apn_validators.codegen import generate_source
+from apn_validators.rules import *
+
+
+class Upper:
+    def validate(self, value, field_name):
+        if str(value) != str(value).upper():
+            return "{} must be upper case".format(field_name)
+        return None
+
+
+class StrictLength(Length):
+    def validate(self, value, field_name):
+        return "always fails"
+
+
+SCHEMA = {
+    "username": [NotBlank(), Length(min=3, max=20), MinLength(2), MaxLength(30)],
+    "role": [InList(["admin", "member"]), NotInList(["root"])],
+    "level": [InList(["Gold", "Silver"], ignore_case=True, strip=True)],
+    "phone": [StartsWith(("62", "65")), DoesntStartsWith("6299"), DigitsBetween(8, 15)],
+    "prefixes": [StartsWith(tuple(str(number) for number in range(100, 200)))],
+    "domain": [EndsWith([".com", ".id"]), DoesntEndsWith((".invalid",))],
+    "agree": [Equals("yes"), NotEquals("no")],
+    "age": [Numeric(), NumberRange(min=17, max=99.5), Gte(18), Gt(17), Lte(99), Lt(100)],
+    "price": [DecimalRange(1, 2), DigitsBetween(1, 5, decimal_include=False, dot_include=True)],
+    "code": [MatchRegex(r"[A-Z]{3}-\d{4}", fullmatch=True), NotMatchRegex(r"\s"), Upper()],
+    "email": [Email()],
+    "birth_date": [IsDate(), DateBefore("2010-01-01")],
+    "nick": [StrictLength(min=1, max=5)],
+}
+
+ROWS = [
+    {
+        "username": "agung",
+        "role": "admin",
+        "level": " gold ",
+        "phone": "628123456",
+        "prefixes": "150-1",
+        "domain": "agung.id",
+        "agree": "yes",
+        "age": "25",
+        "price": "12.5",
+        "code": "ABC-1234",
+        "email": "agung@example.com",
+        "birth_date": "1995-04-12",
+        "nick": "ag",
+    },
+    {
+        "username": " ",
+        "role": "root",
+        "level": "bronze",
+        "phone": "629912",
+        "prefixes": "250",
+        "domain": "agung.invalid",
+        "agree": "no",
+        "age": "a",
+        "price": "12.555",
+        "code": "abc 1234",
+        "email": 12,
+        "birth_date": "2015-13-01",
+    },
+    {
+        "username": "a" * 40,
+        "age": 17,
+        "price": "123456.7",
+        "code": "ABC-12345",
+        "email": "agung@",
+        "birth_date": "2012-01-01",
+    },
+    {"age": "nan", "phone": 62812345678, "agree": True, "username": 12, "code": "ABC-1234"},
+    {"username": b"ag", "age": "20", "role": bytearray(b"admin"), "prefixes": memoryview(b"150-1"), "domain": b"agung.com", "code": b"ABC-1234"},
+]
+
+
+@pytest.mark.parametrize("row", ROWS)
+@pytest.mark.parametrize("options", [{}, {"is_err_to_list": True}, {"lazy": True}])
+def test_same_results_as_the_interpreted_schema(row, options):
+    plain = compile_schema(SCHEMA)
+    generated = compile_schema(SCHEMA, codegen=True)
+    assert generated.validate(row, **options) == plain.validate(row, **options)
+
+
+def records(errors):
+    return {
+        field_name: [error if isinstance(error, str) else (error.rule, error.code, error.params) for error in field_errors]
+        for field_name, field_errors in errors.items()
+    }
+
+
+def test_same_error_records():
+    plain = compile_schema(SCHEMA)
+    generated = compile_schema(SCHEMA, codegen=True)
+    for row in ROWS:
+        assert records(generated.validate(row, lazy=True)[1]) == records(plain.validate(row, lazy=True)[1])
+
+
+def test_validate_many():
+    generated = compile_schema(SCHEMA, codegen=True)
+    assert validate_many(generated, ROWS * 3) == validate_many(SCHEMA, ROWS * 3)
+    assert generated.validate_many(ROWS, is_err_to_list=True) == compile_schema(SCHEMA).validate_many(ROWS, is_err_to_list=True)
+
+
+def test_bail_and_max_errors_use_the_rules():
+    generated = compile_schema(SCHEMA, codegen=True)
+    assert generated.validate(ROWS[1], bail=True, max_errors=3) == compile_schema(SCHEMA).validate(ROWS[1], bail=True, max_errors=3)
+
+
+def test_exceptions_are_the_same():
+    generated = compile_schema({"age": [Numeric()]}, codegen=True)
+    with pytest.raises(TypeError):
+        generated.validate({})
+    with pytest.raises(TypeError):
+        compile_schema({"age": [Numeric()]}).validate({})
+
+
+def test_source():
+    source = generate_source({"username": [NotBlank(), Length(min=3, max=20)], "code": [Upper()]})
+    assert source.startswith("def validate(values):")
+    assert "3 <= len(s) <= 20" in source
+    # a custom rule is called
+    assert "error = check_2(v, 'code')" in source
+    compile(source, "<test>", "exec")
+
+    compiled = compile_schema({"username": [NotBlank()]}, codegen=True)
+    assert compiled.codegen
+    assert compiled.source == generate_source(compiled)
+    assert compile_schema({"username": [NotBlank()]}).source is None
+
+
+def test_subclasses_are_not_inlined():
+    assert "len(s)" not in generate_source({"nick": [StrictLength(min=1, max=5)]})
+
+
+def test_field_names_are_escaped():
+    schema = {"it's\n": [NotBlank()], 3: [NotBlank()]}
+    generated = compile_schema(schema, codegen=True)
+    assert generated.validate({3: "x"}) == compile_schema(schema).validate({3: "x"})
+
+
+@pytest.mark.parametrize("line_break", ["\n", "\r", "\x0b", "\x0c", "\x1c", "\x85", "\u2028"])
+def test_field_names_cannot_inject_code(line_break):
+    field_name = "name{}raise SystemExit".format(line_break)
+    source = generate_source({field_name: [NotBlank()]})
+    assert "\n    # {}\n".format(ascii(field_name)) in source
+    generated = compile_schema({field_name: [NotBlank()]}, codegen=True)
+    assert generated.validate({field_name: "x"}) == ({field_name: "x"}, {})
+
+    class Key:
+        def __repr__(self):
+            return field_name
+
+    key = Key()
+    assert compile_schema({key: [NotBlank()]}, codegen=True).validate({key: "x"}) == ({key: "x"}, {})
+
+
+def test_code_is_shared_and_readable_in_tracebacks():
+    first = compile_schema({"username": [Length(min=3, max=20)]}, codegen=True)
+    second = compile_schema({"username": [Length(min=3, max=20)]}, codegen=True)
+    assert first._generated.__code__ is second._generated.__code__
+    filename = first._generated.__code__.co_filename
+    assert linecache.getline(filename, 1) == "def validate(values):\n"
+
+
+def test_linecache_is_bounded_like_the_code_cache():
+    from apn_validators import codegen
+
+    first = compile_schema({"username": [Length(min=1, max=1000)]}, codegen=True)
+    filename = first._generated.__code__.co_filename
+    # every schema has its own source, the oldest ones are evicted with their lines
+    for length in range(2, codegen._CACHE_SIZE + 50):
+        compile_schema({"username": [Length(min=length, max=1000)]}, codegen=True)
+    generated = [name for name in linecache.cache if name.startswith("<apn_validators.codegen")]
+    assert len(codegen._compiled) == codegen._CACHE_SIZE
+    assert len(generated) <= codegen._CACHE_SIZE
+    assert filename not in linecache.cache
+
+
+def test_compile_schema_keeps_codegen():
+    generated = compile_schema(SCHEMA, codegen=True)
+    assert compile_schema(generated) is generated
+    assert compile_schema(generated, codegen=True) is generated
+    assert compile_schema(compile_schema(SCHEMA), codegen=True).codegen
+    assert compile_schema(generated, intern=True).codegen
+    assert "codegen=True" in repr(generated)
+
+    restored = pickle.loads(pickle.dumps(compile_schema({"username": [NotBlank()]}, codegen=True)))
+    assert restored.codegen
+    assert restored.validate({"username": ""}) == ({"username": ""}, {"username": ["field username must not be blank"]})
@@ -3,6 +3,7 @@ from datetime import datetime
 import pytest
 
 from apn_validators import validate
+from apn_validators.date_parser import DateParser, get_parser
 from apn_validators.rules.date_validators import *
 
 todayDate = datetime.date.today()
@@ -161,3 +162,117 @@ def test_date_before(value, kargs, expected):
         assert err == []
     else:
         assert expected in err
+
+
+@pytest.mark.parametrize(
+    "date_format,values",
+    [
+        ("%Y-%m-%d", ["2024-12-24", "2024-1-5", "2024-02-30", "2024-12-24 ", "20241224", "0000-01-01", ""]),
+        ("%Y/%m/%d", ["2024/12/24", "2024/1/5", "2024/13/01", "2024-12-24"]),
+        ("%d-%m-%y %H:%M", ["24-12-24 10:30", "1-1-69 0:0", "24-12-24  10:30", "24-12-24 24:00"]),
+        ("%m%d%Y", ["12242024", "1242024", "02292023"]),
+        ("%b %d %Y", ["Dec 24 2024", "dec 24 2024", "Foo 24 2024"]),
+    ],
+)
+def test_date_parser_same_as_strptime(date_format, values):
+    parser = DateParser(date_format)
+    for value in values:
+        try:
+            expected = datetime.datetime.strptime(value, date_format).date()
+        except ValueError:
+            expected = None
+        assert parser(value) == expected
+        assert parser(value) == expected
+
+
+def test_date_parser_cache():
+    parser = DateParser("%Y-%m-%d", cache_size=2)
+    for value in ["2024-12-24", "2024-12-24", "2024-12-25", "2024-12-26"]:
+        parser(value)
+    info = parser.cache_info()
+    assert (info.hits, info.misses, info.currsize, info.maxsize) == (1, 3, 2, 2)
+    assert get_parser("%Y-%m-%d") is get_parser("%Y-%m-%d")
+
+
+@pytest.mark.parametrize(
+    "value,rule,expected",
+    [
+        (datetime.date(2024, 12, 24), IsDate(), None),
+        (datetime.datetime(2024, 12, 24, 23, 59), IsDate(date_format="%Y/%m/%d"), None),
+        (1735000000, IsDate(), None),
+        (None, IsDate(), "field data is not a valid date"),
+        (datetime.date(2024, 12, 24), DateEquals("2024-12-24"), None),
+        (datetime.datetime(2024, 12, 24, 10, 30), DateEquals("2024/12/24", "%Y/%m/%d"), None),
+        (datetime.date(2024, 12, 25), DateEquals("2024-12-24"), "field data must be equal to 2024-12-24"),
+        (datetime.date(2024, 12, 25), DateAfter("2024-12-24"), None),
+        (datetime.datetime(2024, 12, 24, 23, 59), DateAfter("2024-12-24"), "field data must be after 2024-12-24"),
+        (1735000000.5, DateAfter("2024-12-23"), None),
+        (1735000000, DateBefore(datetime.date(2024, 12, 24)), "field data must be before 2024-12-24"),
+        (datetime.date(2024, 12, 23), DateBefore(datetime.datetime(2024, 12, 24, 1, 0)), None),
+        (datetime.date(2024, 12, 23), DateBefore(1735000000), None),
+        (None, DateBefore("2024-12-24"), "Invalid date format: None"),
+        (True, DateBefore("2024-12-24"), "Invalid date format: True"),
+    ],
+)
+def test_date_native_values(value, rule, expected):
+    assert rule.validate(value, "data") == expected
+
+
+class FakeClock:
+    def __init__(self, today):
+        self.today = today
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.today
+
+
+def test_relative_target_follows_the_clock():
+    clock = FakeClock(datetime.date(2024, 12, 24))
+    rule = DateAfter("today-30d", clock=clock)
+
+    assert rule.validate("2024-11-25", "data") is None
+    assert rule.validate("2024-11-24", "data") == "field data must be after 2024-11-24"
+    assert rule.target_date == datetime.date(2024, 11, 24)
+
+    clock.today = datetime.date(2024, 12, 25)
+    assert rule.validate("2024-11-25", "data") == "field data must be after 2024-11-25"
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        ("today", datetime.date(2024, 12, 24)),
+        ("yesterday", datetime.date(2024, 12, 23)),
+        ("tomorrow", datetime.date(2024, 12, 25)),
+        ("today-30d", datetime.date(2024, 11, 24)),
+        ("today+2w", datetime.date(2025, 1, 7)),
+        ("yesterday-1w", datetime.date(2024, 12, 16)),
+    ],
+)
+def test_relative_date(expression, expected):
+    relative = RelativeDate(expression, clock=FakeClock(datetime.date(2024, 12, 24)))
+    assert relative.resolve() == expected
+    assert DateEquals(expression, clock=relative.clock).validate(expected, "data") is None
+
+
+def test_relative_date_invalid():
+    with pytest.raises(ValueError):
+        RelativeDate("today-30")
+    assert not RelativeDate.is_relative("2024-12-24")
+    assert system_today() == datetime.date.today()
+
+
+def test_system_today_is_computed_again_at_midnight(monkeypatch):
+    from apn_validators.rules import date_validators
+
+    today = system_today()
+    state = date_validators._today
+    assert system_today() == today and date_validators._today is state
+
+    # the date and its bounds are replaced together
+    monkeypatch.setattr(date_validators.time, "time", lambda: state[2])
+    assert system_today() == datetime.date.today()
+    assert date_validators._today is not state
+    assert date_validators._today[0] == datetime.date.today()
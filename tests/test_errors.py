@@ -0,0 +1,52 @@
+from collections import defaultdict
+
+import pytest
+
+from apn_validators import ValidationError, compile_schema, err_to_list, render_errors, validate
+from apn_validators.errors import MessageTemplate
+from apn_validators.rules import *
+
+
+@pytest.mark.parametrize(
+    "template,params",
+    [
+        ("field {field_name} must be between from {min} and {max}", {"field_name": "age", "min": 1, "max": 2}),
+        ("{field_name} is missing {unknown}", {"field_name": "age"}),
+        ("{value!r} is not {threshold:.2f}", {"value": "a", "threshold": 3}),
+        ("{{literal}} {value}", {"value": 1}),
+        ("{value[0]} {value.__class__}", {"value": [1]}),
+        ("no placeholders", {}),
+    ],
+)
+def test_message_template(template, params):
+    assert MessageTemplate(template).render(params) == template.format_map(defaultdict(str, params))
+
+
+def test_validation_error():
+    rule = GreaterThen(threshold=10)
+    err = rule.validate("5", "age")
+
+    assert isinstance(err, ValidationError)
+    assert (err.rule, err.field, err.code, err.params) == (rule, "age", "greater_then", {"value": "5", "threshold": 10})
+    assert err._message is None
+    assert err == "field age should be number and greater then 10"
+    assert str(err) == err.message == "field age should be number and greater then 10"
+    assert rule.validate("11", "age") is None
+
+
+def test_validate_lazy():
+    schema = {"age": [Numeric(), Gt(threshold=10)], "name": [NotBlank()]}
+    values = {"age": "a", "name": ""}
+    expected = {
+        "age": ["age only accept numbers", "field age should be number and greater then 10"],
+        "name": ["field name must not be blank"],
+    }
+
+    _, err = validate(schema, values)
+    assert err == expected
+    assert all(type(message) is str for messages in err.values() for message in messages)
+
+    for lazy_err in (validate(schema, values, lazy=True)[1], compile_schema(schema).validate(values, lazy=True)[1]):
+        assert [error.code for error in lazy_err["age"]] == ["numeric", "greater_then"]
+        assert render_errors(lazy_err) == expected
+        assert err_to_list(lazy_err) == err_to_list(expected)
@@ -0,0 +1,111 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import apn_validators.rules
+
+# importing one rule costs at most this share of importing every module of the package, measured
+# in the same runs: about 0.4 here, the pattern rules need `re` either way
+IMPORT_SHARE = 0.6
+
+EAGER = (
+    "from apn_validators.rules import *; "
+    "import apn_validators.stream, apn_validators.instrumentation, apn_validators.index, apn_validators.codegen"
+)
+
+
+def import_times(statement):
+    """
+    Return the cumulative import time of the modules imported by `statement`, in microseconds,
+    and the total time of the package (the modules of the package imported at the top level).
+    """
+    # the first run writes the bytecode of the package, the others do not compile it again
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=env,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    total = 0
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        times[module.strip()] = int(cumulative)
+        # the rule modules are imported after the package, by `from ... import`
+        if module.startswith(" apn_validators"):
+            total += int(cumulative)
+    return times, total
+
+
+def test_import_time_budget():
+    # a relative budget, a slow machine makes both imports slower; the best of a few interleaved
+    # runs, a busy machine only makes a run slower
+    lazy = eager = float("inf")
+    for _ in range(3):
+        lazy = min(lazy, import_times("from apn_validators.rules import Email")[1])
+        eager = min(eager, import_times(EAGER)[1])
+    assert lazy < eager * IMPORT_SHARE, "importing a rule took {:.1f} ms, importing everything {:.1f} ms".format(
+        lazy / 1000, eager / 1000
+    )
+
+
+# the modules a statement must not load, they belong to the parts of the package it does not use
+UNUSED = [
+    "apn_validators.rules.date_validators",
+    "apn_validators.rules.membership_validators",
+    "apn_validators.rules.nested_validators",
+    "apn_validators.index",
+    "apn_validators.date_parser",
+    "apn_validators.instrumentation",
+    "apn_validators.stream",
+    "asyncio",
+    "concurrent.futures.process",
+    "csv",
+    "json",
+]
+
+
+def test_only_the_used_modules_are_imported():
+    modules, _ = import_times("import apn_validators")
+    # nothing of the rules, and no regex: `re` is only needed by the rules that use one
+    for module in UNUSED + ["apn_validators.rules", "apn_validators.regex_registry", "re", "string"]:
+        assert module not in modules
+
+    modules, _ = import_times("from apn_validators.rules import Email")
+    assert "apn_validators.rules.pattern_validators" in modules
+    for module in UNUSED:
+        assert module not in modules
+
+    # the pattern of MetricsCollector goes through the registry when a collector is built
+    modules, _ = import_times("from apn_validators import Hooks")
+    assert "apn_validators.regex_registry" not in modules and "re" not in modules
+
+
+def test_lazy_names_of_the_package():
+    import apn_validators
+
+    assert apn_validators.validate_stream is apn_validators.stream.validate_stream
+    assert {"Hooks", "MetricsCollector", "validate_stream", "validate"} <= set(dir(apn_validators))
+    with pytest.raises(AttributeError):
+        apn_validators.NotAName
+
+
+def test_star_import():
+    namespace = {}
+    exec("from apn_validators.rules import *", namespace)
+    assert {"Rule", "Email", "IsDate", "InIndex", "Memoize", "Each", "intern_rule"} <= set(namespace)
+    assert namespace["Email"] is apn_validators.rules.pattern_validators.Email
+    assert set(apn_validators.rules.__all__) <= set(dir(apn_validators.rules))
+
+
+def test_unknown_name():
+    with pytest.raises(AttributeError):
+        apn_validators.rules.NotARule
+    with pytest.raises(ImportError):
+        from apn_validators.rules import NotARule  # noqa: F401
@@ -0,0 +1,140 @@
+import pickle
+import random
+import string
+
+import pytest
+
+from apn_validators import validate, validate_many
+from apn_validators.index import SortedIndex, build_index, get_index, main
+from apn_validators.rules import *
+
+domains = ["mailinator.com", "guerrillamail.com", "10minutemail.com", "trashmail.de", "yopmail.com", "ünï.example"]
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    path = tmp_path / "domains.idx"
+    build_index(domains, path)
+    return path
+
+
+@pytest.mark.parametrize("bloom", [True, False])
+def test_index_same_as_set(tmp_path, bloom):
+    values = {"".join(random.choices(string.ascii_lowercase, k=random.randint(0, 12))) for _ in range(5000)}
+    path = tmp_path / "random.idx"
+    assert build_index(values, path, bloom=bloom) == len(values)
+
+    index = SortedIndex(path)
+    assert len(index) == len(values)
+    for value in values:
+        assert value in index
+    for _ in range(5000):
+        value = "".join(random.choices(string.ascii_lowercase, k=random.randint(0, 12)))
+        assert (value in index) == (value in values)
+
+
+def test_empty_index(tmp_path):
+    path = tmp_path / "empty.idx"
+    assert build_index([], path) == 0
+    assert "a" not in SortedIndex(path)
+    assert "" not in SortedIndex(path)
+
+
+def test_index_lone_surrogate(tmp_path):
+    # e.g. a byte of an invalid file decoded with errors="surrogateescape"
+    path = tmp_path / "surrogates.idx"
+    assert build_index(["\ud800", "caf\udce9", "cafe"], path) == 3
+    index = SortedIndex(path)
+    assert "\ud800" in index
+    assert "caf\udce9" in index
+    assert "\udc00" not in index
+    assert InIndex(path).validate("\ud800", "value") is None
+
+
+def test_index_normalization(tmp_path):
+    path = tmp_path / "domains.idx"
+    build_index([" Mailinator.COM", "yopmail.com"], path, ignore_case=True, strip=True)
+    index = SortedIndex(path)
+    assert index.ignore_case and index.strip
+    assert "mailinator.com" in index
+    assert "  YOPMAIL.com " in index
+    assert "example.com" not in index
+
+
+def test_not_an_index(tmp_path):
+    path = tmp_path / "domains.txt"
+    path.write_text("mailinator.com\nyopmail.com\n")
+    with pytest.raises(ValueError):
+        SortedIndex(path)
+    (tmp_path / "empty").write_bytes(b"")
+    with pytest.raises(ValueError):
+        SortedIndex(tmp_path / "empty")
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("mailinator.com", None),
+        ("ünï.example", None),
+        ("example.com", "field domain is not an allowed value"),
+        (None, "field domain is not an allowed value"),
+    ],
+)
+def test_in_index(index_path, value, expected):
+    assert InIndex(index_path).validate(value, "domain") == expected
+    _, err = validate({"domain": [InIndex(str(index_path))]}, {"domain": value}, True)
+    assert err == ([] if expected is None else [expected])
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("example.com", None),
+        ("MAILINATOR.com", None),
+        (10, None),
+        ("yopmail.com", "field domain is not allowed"),
+    ],
+)
+def test_not_in_index(index_path, value, expected):
+    assert NotInIndex(index_path).validate(value, "domain") == expected
+
+
+def test_index_shared_and_pickled_as_path(index_path):
+    rule = NotInIndex(index_path)
+    assert InIndex(index_path).index is rule.index
+    assert rule.index is get_index(str(index_path))
+
+    data = pickle.dumps(rule.index)
+    assert len(data) < 200
+    assert pickle.loads(data) is rule.index
+
+
+def test_rebuilt_index_file(index_path):
+    old = get_index(index_path)
+    build_index(["example.com"], index_path)
+    # the old file is replaced, not truncated: the mapped index still reads it
+    assert "yopmail.com" in old
+    assert list(index_path.parent.iterdir()) == [index_path]
+
+    new = get_index(index_path)
+    assert new is not old and new is get_index(index_path)
+    assert "example.com" in new and "yopmail.com" not in new
+    assert InIndex(index_path).index is new
+
+
+def test_index_in_workers(index_path):
+    schema = {"domain": [NotInIndex(index_path)]}
+    rows = [{"domain": domain} for domain in domains + ["example.com", "example.org"]] * 5
+    assert validate_many(schema, rows, workers=2, chunk_size=4) == validate_many(schema, rows)
+
+
+def test_index_builder_cli(tmp_path, capsys):
+    source = tmp_path / "domains.txt"
+    source.write_text("Mailinator.com\nyopmail.com\n\nyopmail.com\n", encoding="utf-8")
+    output = tmp_path / "domains.idx"
+    main([str(source), str(output), "--ignore-case", "--no-bloom"])
+
+    assert "2 values written" in capsys.readouterr().out
+    index = SortedIndex(output)
+    assert "mailinator.com" in index
+    assert "example.com" not in index
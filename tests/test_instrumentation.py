@@ -0,0 +1,190 @@
+import pickle
+
+import pytest
+
+from apn_validators import Hooks, MetricsCollector, compile_schema, validate, validate_many, validate_stream
+from apn_validators.rules import *
+
+SCHEMA = {
+    "username": [NotBlank(), Length(min=3, max=20)],
+    "email": [NotBlank(), Email()],
+}
+ROWS = [
+    {"username": "agung", "email": "agung@example.com"},
+    {"username": "", "email": "agung"},
+    {"username": "ag", "email": "agung@example.com"},
+]
+
+
+class Recorder(Hooks):
+    def __init__(self):
+        self.events = []
+
+    def before_rule(self, schema_name, field_name, rule, value):
+        self.events.append(("before", schema_name, field_name, type(rule).__name__, value))
+
+    def after_rule(self, schema_name, field_name, rule, value, error, elapsed):
+        assert elapsed >= 0
+        self.events.append(("after", schema_name, field_name, type(rule).__name__, error is not None))
+
+    def after_record(self, schema_name, validated, errors, elapsed):
+        self.events.append(("record", schema_name, sorted(errors)))
+
+
+def test_hooks_are_called_around_every_rule():
+    recorder = Recorder()
+    compiled = compile_schema(SCHEMA, hooks=recorder, name="signup")
+    assert compiled.hooks is recorder
+    assert compiled.name == "signup"
+
+    compiled.validate({"username": "ag", "email": "agung@example.com"})
+    assert recorder.events == [
+        ("before", "signup", "username", "NotBlank", "ag"),
+        ("after", "signup", "username", "NotBlank", False),
+        ("before", "signup", "username", "Length", "ag"),
+        ("after", "signup", "username", "Length", True),
+        ("before", "signup", "email", "NotBlank", "agung@example.com"),
+        ("after", "signup", "email", "NotBlank", False),
+        ("before", "signup", "email", "Email", "agung@example.com"),
+        ("after", "signup", "email", "Email", False),
+        ("record", "signup", ["username"]),
+    ]
+
+
+def test_hooks_follow_bail_and_max_errors():
+    recorder = Recorder()
+    compiled = compile_schema(SCHEMA, hooks=recorder)
+    compiled.validate({"username": "", "email": ""}, bail=True, max_errors=1)
+    assert [event[:4] for event in recorder.events if event[0] == "after"] == [("after", None, "username", "NotBlank")]
+    assert recorder.events[-1] == ("record", None, ["username"])
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"is_err_to_list": True}, {"lazy": True}, {"bail": True}, {"max_errors": 2}],
+)
+def test_hooks_do_not_change_the_results(options):
+    plain = compile_schema(SCHEMA)
+    hooked = compile_schema(SCHEMA, hooks=MetricsCollector())
+    for values in ROWS:
+        assert hooked.validate(values, **options) == plain.validate(values, **options)
+    assert hooked.validate_many(ROWS, **options) == plain.validate_many(ROWS, **options)
+
+
+def test_collector_snapshot():
+    metrics = MetricsCollector()
+    compiled = compile_schema(SCHEMA, hooks=metrics, name="signup")
+    validate_many(compiled, ROWS)
+    validate(compiled, ROWS[1])
+
+    snapshot = metrics.snapshot()
+    assert list(snapshot) == ["signup"]
+    signup = snapshot["signup"]
+    assert (signup["records"], signup["invalid"], signup["errors"]) == (4, 3, 7)
+    assert signup["latency"]["count"] == 4
+    assert sum(signup["latency"]["counts"]) == 4
+
+    username = signup["fields"]["username"]
+    assert list(username["rules"]) == ["NotBlank", "Length"]
+    assert username["rules"]["NotBlank"]["calls"] == 4
+    assert username["rules"]["NotBlank"]["failures"] == 2
+    assert username["rules"]["Length"]["failures"] == 3
+    assert (username["calls"], username["failures"]) == (8, 5)
+    assert username["seconds"] == pytest.approx(
+        sum(rule["latency"]["sum"] for rule in username["rules"].values())
+    )
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_collector_tells_apart_rules_of_the_same_class():
+    metrics = MetricsCollector()
+    compiled = compile_schema({"code": [MatchRegex("^a"), MatchRegex("b$")]}, hooks=metrics)
+    compiled.validate({"code": "ab"})
+    assert list(metrics.snapshot()["default"]["fields"]["code"]["rules"]) == ["MatchRegex", "MatchRegex_2"]
+
+
+def test_collector_histogram_buckets():
+    metrics = MetricsCollector(buckets=(0.001, 1))
+    metrics.after_rule("s", "f", NotBlank(), "x", None, 0.0005)
+    metrics.after_rule("s", "f", NotBlank(), "x", None, 0.001)
+    metrics.after_rule("s", "f", NotBlank(), "x", None, 0.5)
+    metrics.after_rule("s", "f", NotBlank(), "x", "error", 5)
+    rules = metrics.snapshot()["s"]["fields"]["f"]["rules"]
+    # each NotBlank() is another rule object
+    assert [rule["latency"]["counts"] for rule in rules.values()] == [[1, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]]
+
+    with pytest.raises(ValueError):
+        MetricsCollector(buckets=(1, 0.1))
+
+
+def test_prometheus_format(tmp_path):
+    metrics = MetricsCollector(buckets=(0.001, 1))
+    metrics.after_rule('sign"up', "email", Email(), "x", "error", 0.002)
+    metrics.after_record('sign"up', {}, {"email": ["error"]}, 0.003)
+
+    text = metrics.prometheus()
+    lines = text.splitlines()
+    assert "# TYPE apn_validators_rule_calls_total counter" in lines
+    assert 'apn_validators_rule_calls_total{schema="sign\\"up",field="email",rule="Email"} 1' in lines
+    assert 'apn_validators_rule_failures_total{schema="sign\\"up",field="email",rule="Email"} 1' in lines
+    assert 'apn_validators_rule_duration_seconds_bucket{schema="sign\\"up",field="email",rule="Email",le="0.001"} 0' in lines
+    assert 'apn_validators_rule_duration_seconds_bucket{schema="sign\\"up",field="email",rule="Email",le="1.0"} 1' in lines
+    assert 'apn_validators_rule_duration_seconds_bucket{schema="sign\\"up",field="email",rule="Email",le="+Inf"} 1' in lines
+    assert 'apn_validators_rule_duration_seconds_count{schema="sign\\"up",field="email",rule="Email"} 1' in lines
+    assert 'apn_validators_records_total{schema="sign\\"up"} 1' in lines
+    assert 'apn_validators_invalid_records_total{schema="sign\\"up"} 1' in lines
+    assert 'apn_validators_errors_total{schema="sign\\"up"} 1' in lines
+    assert "# TYPE apn_validators_record_duration_seconds histogram" in lines
+
+    path = tmp_path / "validators.prom"
+    metrics.write_prometheus(path)
+    assert path.read_text() == text
+    assert [file.name for file in tmp_path.iterdir()] == ["validators.prom"]
+
+    # the temporary file was not created, the error of `open` is raised rather than the one of its cleanup
+    with pytest.raises(FileNotFoundError) as info:
+        metrics.write_prometheus(tmp_path / "missing" / "validators.prom")
+    assert info.value.__context__ is None
+
+
+def test_stream_reports_to_hooks(tmp_path):
+    path = tmp_path / "users.jsonl"
+    path.write_text('{"username": "agung", "email": "agung@example.com"}\n{"username": "", "email": "x"}\n')
+    metrics = MetricsCollector()
+    compiled = compile_schema(SCHEMA, hooks=metrics, name="import")
+    assert len(list(validate_stream(compiled, path))) == 2
+    assert metrics.snapshot()["import"]["records"] == 2
+
+
+def test_compile_schema_with_hooks():
+    compiled = compile_schema(SCHEMA)
+    assert compiled.hooks is None
+    assert compile_schema(compiled) is compiled
+
+    metrics = MetricsCollector()
+    hooked = compile_schema(compiled, hooks=metrics, name="signup")
+    assert hooked is not compiled
+    assert repr(hooked) == "CompiledSchema(fields=('username', 'email'), name='signup')"
+    # the hooks are kept when the schema is compiled again
+    interned = compile_schema(hooked, intern=True)
+    assert (interned.hooks, interned.name) == (metrics, "signup")
+    assert compile_schema(hooked, hooks=metrics, name="signup") is hooked
+    renamed = compile_schema(hooked, name="login")
+    assert (renamed.hooks, renamed.name) == (metrics, "login")
+    # an adaptive schema cannot have hooks, they are not dropped silently
+    with pytest.raises(ValueError):
+        compile_schema(compile_schema(SCHEMA, adaptive=True), hooks=metrics)
+    with pytest.raises(ValueError):
+        compile_schema(hooked, adaptive=True)
+
+    with pytest.raises(ValueError):
+        compile_schema(SCHEMA, adaptive=True, hooks=metrics)
+
+
+def test_hooks_are_not_pickled():
+    hooked = compile_schema(SCHEMA, hooks=MetricsCollector(), name="signup")
+    restored = pickle.loads(pickle.dumps(hooked))
+    assert restored.hooks is None
+    assert restored.name == "signup"
@@ -0,0 +1,130 @@
+import datetime
+import pickle
+from decimal import Decimal
+
+import pytest
+
+from apn_validators import compile_schema, validate
+from apn_validators.rules import *
+
+
+class CountingRule:
+    deterministic = True
+
+    def __init__(self):
+        self.calls = 0
+
+    def validate(self, value, field_name):
+        self.calls += 1
+        if value != "ok":
+            return "field {} is not ok".format(field_name)
+        return None
+
+
+class RandomRule:
+    def validate(self, value, field_name):
+        return None
+
+
+@pytest.mark.parametrize(
+    "rule,values",
+    [
+        (Email(), ["agung@example.com", "agung", "agung", "", None]),
+        (MatchRegex(r"^[A-Z]{2}$", fullmatch=True), ["ID", "id", "ID", "IDN"]),
+        (IsDate(), ["2024-01-05", "2024-13-05", "2024-01-05", datetime.date(2024, 1, 5), 1704412800]),
+        (DecimalRange(1, 2), ["1.5", "1.555", 1, "1.5"]),
+        (NumberRange(min=1, max=10), [0, 5, -0.0, 0.0, Decimal("1.00"), Decimal("1.0")]),
+        (DateAfter("2024-01-01"), ["2024-01-05", "2023-01-05", "2024-01-05"]),
+    ],
+)
+def test_memoize_same_outcome(rule, values):
+    memoized = Memoize(rule)
+    for _ in range(2):
+        for value in values:
+            for field_name in ("a", "b"):
+                expected = rule.validate(value, field_name)
+                outcome = memoized.validate(value, field_name)
+                assert outcome == expected
+                assert str(outcome) == str(expected)
+
+
+def test_memoize_hits_and_evictions():
+    rule = CountingRule()
+    memoized = Memoize(rule, maxsize=2)
+    for value in ["ok", "no", "ok", "no", "other", "ok"]:
+        memoized.validate(value, "status")
+
+    assert rule.calls == 4
+    assert memoized.cache_info() == {
+        "hits": 2,
+        "misses": 4,
+        "evictions": 2,
+        "expirations": 0,
+        "size": 2,
+        "maxsize": 2,
+    }
+    memoized.cache_clear()
+    assert memoized.cache_info()["size"] == 0
+
+
+def test_memoize_bypasses_other_types():
+    rule = CountingRule()
+    memoized = Memoize(rule)
+    for value in [["ok"], ["ok"], {"a": 1}, 1.5, 1.5]:
+        memoized.validate(value, "status")
+    assert rule.calls == 5
+    assert memoized.cache_info()["size"] == 0
+
+
+def test_memoize_ttl():
+    now = [0.0]
+    rule = CountingRule()
+    memoized = Memoize(rule, ttl=10, timer=lambda: now[0])
+    assert memoized.validate("ok", "status") is None
+    now[0] = 5
+    memoized.validate("ok", "status")
+    assert rule.calls == 1
+    now[0] = 11
+    memoized.validate("ok", "status")
+    assert rule.calls == 2
+    assert memoized.cache_info()["expirations"] == 1
+
+
+def test_memoize_refreshed_entry_is_the_most_recent():
+    now = [0.0]
+    rule = CountingRule()
+    memoized = Memoize(rule, maxsize=2, ttl=10, timer=lambda: now[0])
+    memoized.validate("a", "status")
+    now[0] = 5
+    memoized.validate("b", "status")
+    now[0] = 11
+    # "a" expired and is refreshed, "b" is now the oldest entry and is evicted first
+    memoized.validate("a", "status")
+    memoized.validate("c", "status")
+    assert memoized.cache_info()["evictions"] == 1
+    calls = rule.calls
+    memoized.validate("a", "status")
+    assert rule.calls == calls
+    memoized.validate("b", "status")
+    assert rule.calls == calls + 1
+
+
+def test_memoize_refuses_non_deterministic_rules():
+    with pytest.raises(ValueError):
+        Memoize(RandomRule())
+    with pytest.raises(ValueError):
+        Memoize(DateAfter("today"))
+    with pytest.raises(ValueError):
+        Memoize(DateBefore("tomorrow+2w"))
+    Memoize(DateBefore("2024-01-01"))
+
+
+def test_memoize_in_schema():
+    schema = {"email": [NotBlank(), Memoize(Email())], "country": [Memoize(InList(["ID", "SG"]))]}
+    values = {"email": "agung", "country": "US"}
+    assert validate(schema, values) == validate(
+        {"email": [NotBlank(), Email()], "country": [InList(["ID", "SG"])]}, values
+    )
+
+    compiled = pickle.loads(pickle.dumps(compile_schema(schema)))
+    assert compiled.validate(values) == validate(schema, values)
@@ -0,0 +1,172 @@
+import pickle
+
+import pytest
+
+from apn_validators import MetricsCollector, compile_schema, validate, validate_many
+from apn_validators.rules import *
+
+ORDER = {
+    "id": [NotBlank()],
+    "customer": {
+        "name": [NotBlank()],
+        "email": [NotBlank(), Email()],
+        "address": {"city": [NotBlank()], "zip": [DigitsBetween(5, 5)]},
+    },
+    "lines": Each({"sku": [NotBlank()], "qty": [Numeric(), Gte(1)]}),
+    "tags": Each([NotBlank(), MaxLength(5)]),
+}
+
+
+def order(count=2, **values):
+    data = {
+        "id": "A-1",
+        "customer": {"name": "agung", "email": "agung@example.com", "address": {"city": "Bandung", "zip": "40115"}},
+        "lines": [{"sku": "sku-{}".format(number), "qty": number + 1} for number in range(count)],
+        "tags": ["new"],
+    }
+    data.update(values)
+    return data
+
+
+def test_valid_order():
+    values = order()
+    validated, err = validate(ORDER, values)
+    assert err == {}
+    assert validated == values
+    assert validated["lines"] is not values["lines"]
+
+
+def test_errors_are_keyed_by_path():
+    values = order(
+        customer={"name": "", "email": "agung", "address": {"city": "", "zip": "123"}},
+        lines=[{"sku": "a", "qty": 1}, {"sku": "", "qty": "0"}],
+        tags=["new", "", "too-long"],
+    )
+    _, err = validate(ORDER, values)
+    assert err == {
+        "customer.name": ["field customer.name must not be blank"],
+        "customer.email": ["field customer.email is not a valid email address"],
+        "customer.address.city": ["field customer.address.city must not be blank"],
+        "customer.address.zip": ["field customer.address.zip must have a length between 5 and 5"],
+        "lines.1.sku": ["field lines.1.sku must not be blank"],
+        "lines.1.qty": ["field lines.1.qty should be number and greater then or equal to 1"],
+        "tags.1": ["field tags.1 must not be blank"],
+        "tags.2": ["field tags.2 must have a maximum length of 5"],
+    }
+
+
+def test_wrong_types():
+    validated, err = validate(ORDER, order(customer="agung", lines={"sku": "a"}, tags="new"))
+    assert err == {
+        "customer": ["field customer must be an object"],
+        "lines": ["field lines must be a list"],
+        "tags": ["field tags must be a list"],
+    }
+    assert validated["customer"] == "agung"
+
+    _, err = validate(ORDER, order(lines=[{"sku": "a", "qty": 1}, "b"]))
+    assert err == {"lines.1": ["field lines.1 must be an object"]}
+
+
+def test_missing_objects_and_lists():
+    validated, err = validate(ORDER, {"id": "A-1"})
+    assert validated == {
+        "id": "A-1",
+        "customer": {"name": None, "email": None, "address": {"city": None, "zip": None}},
+        "lines": None,
+        "tags": None,
+    }
+    assert list(err) == ["customer.name", "customer.email", "customer.address.city", "customer.address.zip"]
+
+
+def test_custom_messages_and_deep_nesting():
+    schema = {
+        "billing": Nested({"country": [InList(["ID", "SG"])]}, message="{field_name} is required as an object"),
+        "matrix": Each(Each([Numeric()]), message="{field_name} must be rows"),
+        "groups": Each({"members": Each({"name": [NotBlank()]})}),
+    }
+    values = {
+        "billing": 1,
+        "matrix": [[1, "x"], "y", [2]],
+        "groups": [{"members": [{"name": "a"}]}, {"members": [{"name": "b"}, {"name": ""}]}],
+    }
+    validated, err = validate(schema, values)
+    assert err == {
+        "billing": ["billing is required as an object"],
+        "matrix.0.1": ["matrix.0.1 only accept numbers"],
+        "matrix.1": ["field matrix.1 must be a list"],
+        "groups.1.members.1.name": ["field groups.1.members.1.name must not be blank"],
+    }
+    assert validated["groups"] == values["groups"]
+
+
+def test_max_errors_stops_descending():
+    values = order(lines=[{"sku": "", "qty": 1} for _ in range(5000)])
+    validated, err = validate(ORDER, values, max_errors=3)
+    assert list(err) == ["lines.0.sku", "lines.1.sku", "lines.2.sku"]
+    # only the items that were reached are returned
+    assert len(validated["lines"]) == 3
+    assert "tags" not in validated
+
+    schema = {"groups": Each({"members": Each({"name": [NotBlank()]})}), "id": [NotBlank()]}
+    values = {"groups": [{"members": [{"name": ""}, {"name": ""}, {"name": ""}]}, {"members": []}]}
+    validated, err = validate(schema, values, max_errors=2)
+    assert list(err) == ["groups.0.members.0.name", "groups.0.members.1.name"]
+    assert validated == {"groups": [{"members": [{"name": ""}, {"name": ""}]}]}
+
+
+@pytest.mark.parametrize("options", [{}, {"bail": True}, {"max_errors": 2}, {"max_errors": 4}, {"is_err_to_list": True}])
+def test_validate_matches_the_compiled_schema(options):
+    # the flat fields are checked in place, the nested ones by a compiled schema of the field
+    values = order(id="", customer={"email": "x"}, lines=[{"sku": "", "qty": 0}], tags=["toolong"])
+    assert validate(ORDER, values, **options) == compile_schema(ORDER).validate(values, **options)
+
+
+def test_bail():
+    _, err = validate(ORDER, order(customer={"email": ""}, lines=[{"sku": "a", "qty": "x"}]), bail=True)
+    assert err["customer.email"] == ["field customer.email must not be blank"]
+    assert err["lines.0.qty"] == ["lines.0.qty only accept numbers"]
+
+
+def test_compiled_sub_schemas_and_options():
+    customer = compile_schema({"name": [NotBlank()]})
+    compiled = compile_schema({"customer": customer, "lines": Each(customer)})
+    values = {"customer": {"name": ""}, "lines": [{"name": "a"}, {"name": ""}]}
+    validated, err = compiled.validate(values, lazy=True)
+    assert err["lines.1.name"][0].field == "lines.1.name"
+    assert compiled.validate(values, is_err_to_list=True)[1] == [
+        "field customer.name must not be blank",
+        "field lines.1.name must not be blank",
+    ]
+    assert compiled.schema == {"customer": customer, "lines": Each(customer)}
+
+    results, counts = validate_many(compiled, [values, {"customer": {"name": "a"}}])
+    assert counts == {"total": 2, "valid": 1, "invalid": 1, "errors": 2, "aborted": False}
+
+    restored = pickle.loads(pickle.dumps(compile_schema(ORDER)))
+    assert restored.validate(order(tags=[""])) == validate(ORDER, order(tags=[""]))
+
+
+def test_nested_schema_with_hooks():
+    metrics = MetricsCollector()
+    compiled = compile_schema(ORDER, hooks=metrics, name="order")
+    compiled.validate(order(3))
+    fields = metrics.snapshot()["order"]["fields"]
+    # the items of a list are counted together
+    assert "lines.2.qty" not in fields
+    assert fields["lines.*.qty"]["calls"] == 6
+    assert fields["customer.address.city"]["calls"] == 1
+
+
+def test_unsupported_options():
+    with pytest.raises(ValueError):
+        compile_schema(ORDER, adaptive=True)
+    with pytest.raises(ValueError):
+        compile_schema(ORDER, codegen=True)
+
+
+def test_interned_nested_schema():
+    first = compile_schema(ORDER, intern=True).schema
+    second = compile_schema(ORDER, intern=True).schema
+    assert first["lines"] is second["lines"]
+    assert first["id"][0] is second["id"][0]
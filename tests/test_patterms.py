@@ -1,6 +1,10 @@
+import re
+
 import pytest
 
+from apn_validators.regex_registry import RegexRegistry, regex_cache_info
 from apn_validators.rules.pattern_validators import *
+from apn_validators.rules.pattern_validators import _ascii, _ascii_without_separators
 
 
 @pytest.mark.parametrize(
@@ -10,7 +14,7 @@ from apn_validators.rules.pattern_validators import *
         (
             "Password123",
             {},
-            "password field must include at least one uppercase letter, one lowercase letter, one digit, one symbol, be at least 8 characters",
+            "password field must include at least one symbol",
         ),
         ("Password123", {"symbols": False}, None),
         (
@@ -26,7 +30,7 @@ from apn_validators.rules.pattern_validators import *
                     "length": "minimal {length} karakter",
                 },
             },
-            "password harus berisi setidaknya satu huruf besar, satu huruf kecil, satuan angka, minimal 8 karakter",
+            "password harus berisi setidaknya satu huruf besar, satuan angka, minimal 8 karakter",
         ),
         (
             "password",
@@ -38,12 +42,35 @@ from apn_validators.rules.pattern_validators import *
             {},
             "password field must include at least one uppercase letter, one lowercase letter, one digit, one symbol, be at least 8 characters",
         ),
+        ("pass", {}, "password field must include at least one uppercase letter, one digit, one symbol, be at least 8 characters"),
+        ("Password1+", {}, "password field must include at least one symbol"),
+        ("Password1+", {"symbol_set": "+"}, None),
+        ("PAssword12_", {"uppercase": 2, "numbers": 3}, "password field must include at least 3 digits"),
+        (
+            "Password123_",
+            {"uppercase": 2, "symbols": 2, "messages": {"uppercase": "{count} huruf besar"}},
+            "password field must include at least 2 huruf besar, 2 symbols",
+        ),
+        ("password", {"uppercase": 0, "numbers": False, "symbols": False}, None),
     ],
 )
 def test_password(value, kwargs, expected):
     assert Password(**kwargs).validate(value, "password") == expected
 
 
+def test_password_missing():
+    password = Password()
+    assert password.analyze("Pass_word12") == {
+        "uppercase": 1,
+        "lowercase": 7,
+        "numbers": 2,
+        "symbols": 1,
+        "length": 11,
+    }
+    assert password.missing("pass") == ["uppercase", "numbers", "symbols", "length"]
+    assert password.validate("pass", "password").params["missing"] == password.missing("pass")
+
+
 @pytest.mark.parametrize(
     "value,kwargs,expected",
     [
@@ -105,3 +132,95 @@ def test_match_regex(value, pattern, expected):
 )
 def test_not_match_regex(value, pattern, expected):
     assert NotMatchRegex(pattern).validate(value, "data") == expected
+
+
+@pytest.mark.parametrize(
+    "value,kwargs,expected",
+    [
+        ("abc123", {"pattern": r"[a-z]+"}, None),
+        (
+            "abc123",
+            {"pattern": r"[a-z]+", "fullmatch": True},
+            "data field must match with this pattern [a-z]+",
+        ),
+        ("abc", {"pattern": r"[a-z]+", "fullmatch": True}, None),
+        ("abc", {"pattern": re.compile(r"[A-Z]+", re.I), "fullmatch": True}, None),
+    ],
+)
+def test_match_regex_fullmatch(value, kwargs, expected):
+    assert MatchRegex(**kwargs).validate(value, "data") == expected
+    assert (NotMatchRegex(**kwargs).validate(value, "data") is None) == (expected is not None)
+
+
+def test_regex_registry():
+    registry = RegexRegistry(maxsize=2)
+    assert registry.compile(r"^a$") is registry.compile(r"^a$")
+    assert registry.compile(r"^a$", re.I) is not registry.compile(r"^a$")
+
+    first = registry.compile_dynamic(r"^1$")
+    assert registry.compile_dynamic(r"^1$") is first
+    registry.compile_dynamic(r"^2$")
+    registry.compile_dynamic(r"^3$")
+    assert registry.info() == {
+        "hits": 2,
+        "misses": 2,
+        "size": 2,
+        "dynamic_hits": 1,
+        "dynamic_misses": 3,
+        "dynamic_size": 2,
+        "maxsize": 2,
+        "evictions": 1,
+    }
+
+
+def test_rules_share_compiled_patterns():
+    Email()
+    before = regex_cache_info()
+    Email().validate("agung@example.com", "email")
+    Email().validate("agung@example.com", "email")
+    after = regex_cache_info()
+    assert after["misses"] == before["misses"]
+    assert MatchRegex(r"^\d+$")._match.__self__ is MatchRegex(r"^\d+$")._match.__self__
+
+
+@pytest.mark.parametrize("kind", [bytes, bytearray, memoryview])
+@pytest.mark.parametrize(
+    "rule,text",
+    [
+        (MatchRegex(r"[A-Z]{3}-\d{4}", fullmatch=True), "ABC-1234"),
+        (MatchRegex(r"[A-Z]{3}-\d{4}", fullmatch=True), "ABC-12345"),
+        (MatchRegex(r"^\w+$"), "café"),
+        (MatchRegex(r"^\w+$", message="{field_name} is not a word"), "caf-é"),
+        (MatchRegex(r"a\sb"), "a\x1cb"),
+        (MatchRegex(r"^café$"), "café"),
+        (MatchRegex(r"^café$"), "cafe"),
+        (MatchRegex(r"^caf\u00e9$"), "café"),
+        (MatchRegex(re.compile(r"^[a-z]+$", re.I)), "Agung"),
+        (NotMatchRegex(r"\s"), "agung pn"),
+        (NotMatchRegex(r"\s"), "agung"),
+    ],
+)
+def test_regex_bytes_like_values_as_text(rule, text, kind):
+    assert rule.validate(kind(text.encode()), "data") == rule.validate(text, "data")
+
+
+def test_regex_bytes_like_values_are_not_decoded():
+    rule = MatchRegex(r"^[a-z]+$")
+    assert rule._match_bytes.__self__.pattern == b"^[a-z]+$"
+    assert rule.validate(memoryview(b"agung"), "data") is None
+    # a bytes pattern matches the bytes as they are
+    assert MatchRegex(rb"^\xff").validate(b"\xff", "data") is None
+    assert MatchRegex(r"^café$")._match_bytes is None
+    assert MatchRegex(r"^caf\u00e9$")._match_bytes is None
+
+
+def test_regex_sliced_memoryview_is_checked_alone():
+    body = memoryview("é".encode() * 1000 + b"agung \x1c pn")
+    ascii_part = body[2000:]
+    # decided on the view, the bytes around it do not matter
+    assert _ascii(ascii_part) and not _ascii(body[:4])
+    assert not _ascii_without_separators(ascii_part) and _ascii_without_separators(ascii_part[:5])
+    assert MatchRegex(r"^[a-z]+").validate(ascii_part, "data") is None
+    assert MatchRegex(r"^\w+\s\S").validate(ascii_part, "data") == MatchRegex(r"^\w+\s\S").validate("agung \x1c pn", "data")
+    assert MatchRegex(r"^\w+$").validate(body[:4], "data") is None
+    assert NotMatchRegex(r"\s").validate(body[2000:2005], "data") is None
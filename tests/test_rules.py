@@ -0,0 +1,179 @@
+import gc
+import pickle
+
+import pytest
+
+from apn_validators import compile_schema
+from apn_validators.rules import *
+
+
+def all_rules():
+    return [
+        Length(min=3, max=20),
+        MinLength(3),
+        MaxLength(20),
+        NotBlank(),
+        InList(["admin", "member"]),
+        NotInList(["root", ["a"]]),
+        DoesntStartsWith(("tmp-", "test-")),
+        StartsWith(["62", "65"]),
+        DoesntEndsWith(".invalid"),
+        EndsWith((".com", ".id")),
+        Equals("yes"),
+        NotEquals("no"),
+        Numeric(),
+        Gte(1),
+        Gt(1),
+        Lte(10),
+        Lt(10),
+        NumberRange(min=1, max=10),
+        DecimalRange(1, 2),
+        DigitsBetween(1, 3),
+        MatchRegex(r"^[A-Z]+$", fullmatch=True),
+        NotMatchRegex(r"\s"),
+        Password(uppercase=2),
+        Email(),
+        IsDate("%d/%m/%Y"),
+        DateEquals("2024-01-01"),
+        DateAfter("today-30d"),
+        DateBefore("tomorrow"),
+        AllowedExtensions(["pdf"]),
+    ]
+
+
+@pytest.mark.parametrize("rule", all_rules(), ids=lambda rule: type(rule).__name__)
+def test_rules_are_slotted_and_immutable(rule):
+    assert not hasattr(rule, "__dict__")
+    with pytest.raises(AttributeError):
+        rule.message = "changed"
+    with pytest.raises(AttributeError):
+        rule.extra = 1
+    with pytest.raises(AttributeError):
+        del rule.message
+
+
+@pytest.mark.parametrize(
+    "first,second",
+    [(first, second) for first, second in zip(all_rules(), all_rules())],
+    ids=lambda rule: type(rule).__name__,
+)
+def test_identical_rules_are_equal(first, second):
+    assert first is not second
+    assert first == second
+    assert hash(first) == hash(second)
+    assert pickle.loads(pickle.dumps(first)) == first
+
+
+def test_rules_are_pickled_as_their_arguments():
+    values = [str(number) for number in range(50000)]
+    # the index and the preview are built again when the rule is unpickled
+    assert len(pickle.dumps(InList(values))) < len(pickle.dumps(values)) * 1.01
+
+    rule = pickle.loads(pickle.dumps(StartsWith(["62", "65"], message="{list_prefix}")))
+    assert rule.validate("1", "phone") == "['62', '65']"
+    assert rule._affixes().found("621")
+
+
+class Between(Length):
+    __slots__ = ()
+
+    def __init__(self, bounds):
+        super().__init__(*bounds)
+
+
+def test_rules_with_another_constructor_are_pickled_as_attributes():
+    assert Between._args is None
+    rule = pickle.loads(pickle.dumps(Between((3, 5))))
+    assert type(rule) is Between and rule == Between((3, 5))
+
+
+@pytest.mark.parametrize(
+    "first,second",
+    [
+        (Length(min=3, max=20), Length(min=3, max=21)),
+        (Length(min=3, max=20), Length(min=3, max=20, message="too long")),
+        (Length(min=1, max=20), Length(min=1.0, max=20)),
+        (MinLength(3), MaxLength(3)),
+        (InList(["a", "b"]), InList(["a", "b"], ignore_case=True)),
+        (StartsWith(("a",)), StartsWith(["a"])),
+        (DateAfter("today"), DateAfter("yesterday")),
+        (DateAfter("today"), DateAfter("today", clock=lambda: None)),
+    ],
+)
+def test_different_rules_are_not_equal(first, second):
+    assert first != second
+
+
+def test_intern_rule():
+    rule_registry.clear()
+    first = intern_rule(Length(min=3, max=20))
+    assert intern_rule(Length(min=3, max=20)) is first
+    assert intern_rule(Length(min=3, max=21)) is not first
+    assert rule_registry.info() == {"hits": 1, "misses": 2, "size": 1}
+
+    custom = object()
+    assert intern_rule(custom) is custom
+    memoized = Memoize(Email())
+    assert intern_rule(memoized) is memoized
+
+
+def test_intern_schema():
+    rule_registry.clear()
+    schemas = [
+        compile_schema({"username": [NotBlank(), Length(min=3, max=20)], "role": [InList(["admin", "member"])]}, intern=True)
+        for _ in range(3)
+    ]
+    first, second, _ = (schema.schema for schema in schemas)
+    assert all(a is b for a, b in zip(first["username"] + first["role"], second["username"] + second["role"]))
+    assert schemas[0].validate({"username": "ag", "role": "guest"}) == schemas[1].validate({"username": "ag", "role": "guest"})
+
+
+def test_registry_does_not_keep_rules_alive():
+    rule_registry.clear()
+    intern_rule(Length(min=100, max=200))
+    gc.collect()
+    assert rule_registry.info()["size"] == 0
+
+
+def test_memoize_is_slotted():
+    assert not hasattr(Memoize(Email()), "__dict__")
+
+
+@pytest.mark.parametrize(
+    "make,attribute",
+    [
+        (lambda values: InList(values), "valid_values"),
+        (lambda values: NotInList(values), "invalid_values"),
+        (lambda values: StartsWith(values), "list_prefix"),
+        (lambda values: DoesntEndsWith(values), "list_tail"),
+    ],
+)
+def test_rules_do_not_share_the_callers_list(make, attribute):
+    values = ["62", "65"]
+    rule = intern_rule(make(values))
+    key = hash(rule)
+    values.append("7")
+    assert getattr(rule, attribute) == ("62", "65")
+    assert hash(rule) == key
+    assert intern_rule(make(["62", "65"])) is rule
+
+
+def test_lists_and_tuples_are_still_told_apart():
+    assert NotInList(["a"]) != NotInList(("a",))
+    # the messages show the values as they were given
+    assert StartsWith(["62", "65"]).validate("7", "phone") == "field phone must be start with ['62', '65']"
+    assert StartsWith(("62", "65")).validate("7", "phone") == "field phone must be start with ('62', '65')"
+    assert StartsWith({"62"}).list_prefix == frozenset({"62"})
+    assert Password(symbol_set="#!")._symbols == frozenset("#!")
+
+
+def test_rules_with_the_same_parameters_share_their_derived_data():
+    first, second = Password(symbol_set="#!"), Password(symbol_set="#!")
+    assert first._symbols is second._symbols and first._texts is second._texts
+    assert MatchRegex(r"^\d+$")._match is MatchRegex(r"^\d+$")._match
+    assert InList(["ID", "SG"]).valid_values is InList(("ID", "SG")).valid_values
+    rule = NotInList({"root"})
+    assert rule._index is rule.invalid_values
+    # the messages still show a list, an index is only built when a rule is used
+    assert InList(["ID", "SG"]).validate("MY", "country") == "field country must be in ['ID', 'SG']"
+    assert EndsWith([".id"])._index is None
@@ -0,0 +1,149 @@
+import pickle
+
+import pytest
+
+from apn_validators import CompiledSchema, compile_schema, validate, validate_many
+from apn_validators.rules import *
+
+schema = {
+    "username": [NotBlank(), Length(min=5, max=20)],
+    "email": [NotBlank(), Email()],
+    "age": [Numeric(), NumberRange(min=17, max=99)],
+    "role": [InList(["admin", "member"])],
+}
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        {"username": "agung_pn", "email": "agung@example.com", "age": 25, "role": "admin"},
+        {"username": "", "email": "agung", "age": "a10", "role": "guest"},
+        {"username": "agung_pn", "age": "17"},
+        {"age": 100},
+    ],
+)
+def test_compiled_schema_same_as_validate(values):
+    compiled = compile_schema(schema)
+    assert compiled.validate(values) == validate(schema, values)
+    assert compiled.validate(values, True) == validate(schema, values, True)
+    assert validate(compiled, values) == validate(schema, values)
+
+
+def test_compiled_schema_keeps_field_order():
+    validated, err = compile_schema(schema).validate({"age": 20, "role": "admin"})
+    assert list(validated) == ["username", "email", "age", "role"]
+    assert list(err) == ["username", "email"]
+    assert err["username"] == [
+        "field username must not be blank",
+        "field username length must be between 5 and 20",
+    ]
+
+
+def test_compiled_schema_is_immutable():
+    source = {"username": [NotBlank()]}
+    compiled = compile_schema(source)
+    source["username"].append(Length(min=5, max=20))
+    source["email"] = [Email()]
+
+    assert compiled.fields == ("username",)
+    assert compiled.validate({"username": "abc"}) == ({"username": "abc"}, {})
+    with pytest.raises(AttributeError):
+        compiled.fields = ("email",)
+    assert compile_schema(compiled) is compiled
+    assert isinstance(compiled, CompiledSchema)
+
+
+def test_validate_many_same_as_validate():
+    rows = [
+        {"username": "agung_pn", "email": "agung@example.com", "age": 25, "role": "admin"},
+        {"username": "", "email": "agung", "age": "a10", "role": "guest"},
+        {"username": "agung_pn", "age": "17"},
+    ]
+    results, counts = validate_many(schema, iter(rows))
+    assert results == [validate(schema, row) for row in rows]
+    assert counts == {"total": 3, "valid": 1, "invalid": 2, "errors": 9, "aborted": False}
+
+    results, _ = validate_many(compile_schema(schema), rows, True)
+    assert results == [validate(schema, row, True) for row in rows]
+
+
+def test_validate_many_empty():
+    assert validate_many(schema, []) == ([], {"total": 0, "valid": 0, "invalid": 0, "errors": 0, "aborted": False})
+
+
+def test_compiled_schema_pickle():
+    compiled = compile_schema(
+        {
+            "password": [Password()],
+            "code": [MatchRegex(r"^[A-Z]{3}$")],
+            "role": [InList(["admin", "member"])],
+        }
+    )
+    restored = pickle.loads(pickle.dumps(compiled))
+    values = {"password": "secret", "code": "abc", "role": "admin"}
+    assert restored.fields == compiled.fields
+    assert restored.validate(values) == compiled.validate(values)
+
+
+@pytest.mark.parametrize("workers,chunk_size", [(2, 1), (2, 3), (3, 100)])
+def test_validate_many_parallel(workers, chunk_size):
+    rows = [
+        {"username": "user_{}".format(i), "email": "agung", "age": i, "role": "admin"}
+        for i in range(10, 30)
+    ]
+    expected = validate_many(schema, rows)
+    assert validate_many(schema, rows, workers=workers, chunk_size=chunk_size) == expected
+    assert validate_many(schema, iter(rows), True, workers, chunk_size) == validate_many(schema, rows, True)
+
+
+def test_bail_stops_at_first_error_of_field():
+    values = {"username": "", "email": "agung", "age": "a10", "role": "guest"}
+    for source in (schema, compile_schema(schema)):
+        validated, err = validate(source, values, bail=True)
+        assert validated == values
+        assert {field_name: len(messages) for field_name, messages in err.items()} == {
+            "username": 1,
+            "email": 1,
+            "age": 1,
+            "role": 1,
+        }
+        assert err["username"] == ["field username must not be blank"]
+
+
+def test_max_errors_aborts_record():
+    values = {"username": "", "email": "agung", "age": "a10", "role": "guest"}
+    for source in (schema, compile_schema(schema)):
+        validated, err = validate(source, values, max_errors=3)
+        assert list(validated) == ["username", "email"]
+        assert sum(map(len, err.values())) == 3
+
+        validated, err = validate(source, values, True, bail=True, max_errors=3)
+        assert list(validated) == ["username", "email", "age"]
+        assert len(err) == 3
+
+    with pytest.raises(ValueError):
+        validate(schema, values, max_errors=0)
+
+
+rows = [
+    {"username": "user_{}".format(i), "email": "agung" if i % 3 else "agung@example.com", "age": i, "role": "admin"}
+    for i in range(20, 50)
+]
+
+
+def test_max_errors_aborts_batch():
+    results, counts = validate_many(schema, rows, max_errors=5)
+    assert counts == {"total": 7, "valid": 2, "invalid": 5, "errors": 5, "aborted": True}
+    assert results[:6] == [validate(schema, row) for row in rows[:6]]
+    assert results[6] == validate(schema, rows[6], max_errors=1)
+    assert list(results[6][0]) == ["username", "email"]
+
+    results, counts = validate_many(schema, rows, max_errors=1000)
+    assert counts["aborted"] is False
+    assert results == validate_many(schema, rows)[0]
+
+
+@pytest.mark.parametrize("workers,chunk_size", [(2, 1), (2, 4), (3, 100)])
+def test_max_errors_parallel(workers, chunk_size):
+    expected = validate_many(schema, rows, max_errors=7, bail=True)
+    assert validate_many(schema, rows, workers=workers, chunk_size=chunk_size, max_errors=7, bail=True) == expected
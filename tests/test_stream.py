@@ -0,0 +1,76 @@
+import io
+import json
+
+import pytest
+
+from apn_validators import validate, validate_stream
+from apn_validators.rules import *
+
+schema = {
+    "username": [NotBlank(), Length(min=5, max=20)],
+    "age": [Numeric()],
+}
+rows = [
+    {"username": "agung_pn", "age": "25"},
+    {"username": "", "age": "a10"},
+    {"username": "agung", "age": "17"},
+    {"username": "pn", "age": "30"},
+]
+
+
+@pytest.fixture(params=["csv", "jsonl"])
+def source(request, tmp_path):
+    path = tmp_path / "rows.{}".format(request.param)
+    if request.param == "csv":
+        path.write_text("username,age\n" + "".join("{username},{age}\n".format(**row) for row in rows))
+    else:
+        path.write_text("".join(json.dumps(row) + "\n" for row in rows) + "\n")
+    return path
+
+
+def test_validate_stream(source):
+    expected = [(i, *validate(schema, row)) for i, row in enumerate(rows, 1)]
+    assert list(validate_stream(schema, source)) == expected
+    assert list(validate_stream(schema, str(source), buffer_size=16)) == expected
+
+    with open(source, newline="") as file:
+        assert list(validate_stream(schema, file)) == expected
+
+
+def test_validate_stream_skip_valid_and_max_errors(source):
+    assert [row[0] for row in validate_stream(schema, source, skip_valid=True)] == [2, 4]
+    assert [row[0] for row in validate_stream(schema, source, skip_valid=True, max_errors=3)] == [2]
+    assert [row[0] for row in validate_stream(schema, source, max_errors=4)] == [1, 2, 3, 4]
+
+    # the second row has 3 errors, only the first ones up to the budget are collected
+    assert list(validate_stream(schema, source, skip_valid=True, max_errors=2)) == [
+        (2, {"username": ""}, validate(schema, rows[1], max_errors=2)[1])
+    ]
+    assert validate(schema, rows[1], max_errors=2)[1] == {
+        "username": ["field username must not be blank", "field username length must be between 5 and 20"]
+    }
+
+    _, _, err = next(validate_stream(schema, source, skip_valid=True, is_err_to_list=True))
+    assert err == [
+        "field username must not be blank",
+        "field username length must be between 5 and 20",
+        "age only accept numbers",
+    ]
+
+
+def test_validate_stream_format():
+    file = io.StringIO('{"username": "agung_pn", "age": 25}\n')
+    with pytest.raises(ValueError):
+        list(validate_stream(schema, file))
+    assert list(validate_stream(schema, file, format="jsonl")) == [
+        (1, {"username": "agung_pn", "age": 25}, {})
+    ]
+
+
+@pytest.mark.parametrize("line", ["[1, 2]", '"agung"', "null"])
+def test_validate_stream_line_not_an_object(line):
+    file = io.StringIO('{"username": "agung_pn", "age": 25}\n\n' + line + "\n")
+    rows = validate_stream(schema, file, format="jsonl")
+    assert next(rows)[0] == 1
+    with pytest.raises(ValueError, match="line 3 is not a JSON object"):
+        next(rows)
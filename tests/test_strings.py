@@ -1,3 +1,5 @@
+import random
+
 import pytest
 
 from apn_validators import validate
@@ -108,6 +110,20 @@ def test_not_blank(value, kargs, expected):
             {"valid_values": ["hello", "world"]},
             "field data must be in ['hello', 'world']",
         ),
+        ("HELLO", {"valid_values": ["hello", "world"], "ignore_case": True}, None),
+        (" hello ", {"valid_values": ["hello", "world"], "strip": True}, None),
+        (" Hello", {"valid_values": ["hello ", "world"], "ignore_case": True, "strip": True}, None),
+        (
+            "HELLO",
+            {"valid_values": ["hello", "world"]},
+            "field data must be in ['hello', 'world']",
+        ),
+        ("sku-49999", {"valid_values": ["sku-{}".format(i) for i in range(50000)]}, None),
+        (
+            "sku-x",
+            {"valid_values": ["sku-{}".format(i) for i in range(12)]},
+            "field data must be in ['sku-0', 'sku-1', 'sku-2', 'sku-3', 'sku-4', 'sku-5', 'sku-6', 'sku-7', 'sku-8', 'sku-9', ... 2 more]",
+        ),
     ],
 )
 def test_in_list(value, kargs, expected):
@@ -129,7 +145,20 @@ def test_in_list(value, kargs, expected):
             "WORLD",
             {"invalid_values": ["hello", "world"]},
             None,
-        ),  # TODO: add new options to make case insensitive
+        ),
+        (
+            "WORLD ",
+            {"invalid_values": ["hello", "world"], "ignore_case": True, "strip": True},
+            "field data must not be in ['hello', 'world']",
+        ),
+        (1, {"invalid_values": ["1"], "ignore_case": True}, None),
+        ([1], {"invalid_values": ["hello", [1]]}, "field data must not be in ['hello', [1]]"),
+        ({"a": 1}, {"invalid_values": ["hello"]}, None),
+        (
+            "v11",
+            {"invalid_values": tuple("v{}".format(i) for i in range(20))},
+            "field data must not be in ['v0', 'v1', 'v2', 'v3', 'v4', 'v5', 'v6', 'v7', 'v8', 'v9', ... 10 more]",
+        ),
         (4, {"invalid_values": [1, 2, 3]}, None),
         (4, {"invalid_values": [1]}, None),
         (4, {"invalid_values": ["44"]}, None),
@@ -304,3 +333,96 @@ def test_ends_with(value, kargs, expected):
 
 
 # TODO: equals and not equals
+
+
+def test_affix_index_same_as_str_methods():
+    random.seed(7)
+    prefixes = {"".join(random.choices("0123456789", k=random.randint(0, 4))) for _ in range(300)}
+    values = ["".join(random.choices("0123456789", k=random.randint(0, 8))) for _ in range(2000)]
+    for affixes in (tuple(prefixes), tuple(prefixes - {""})):
+        starts, ends = StartsWith(affixes), EndsWith(affixes)
+        for value in values:
+            assert (starts.validate(value, "data") is None) == value.startswith(affixes)
+            assert (ends.validate(value, "data") is None) == value.endswith(affixes)
+
+
+@pytest.mark.parametrize(
+    "rule,value,expected",
+    [
+        (StartsWith(("1", "1242", "44")), "+1242", None),
+        (StartsWith(("1", "1242", "44")), "12425550100", "1242"),
+        (StartsWith(["1", "44"]), "4420", "44"),
+        (DoesntStartsWith({"tmp-", "test-"}), "test-42", "test-"),
+        (EndsWith(("com", ".co.id", "id")), "agung.co.id", ".co.id"),
+        (DoesntEndsWith(("", "x")), "abc", ""),
+        (EndsWith(7), 17, "7"),
+    ],
+)
+def test_affix_match(rule, value, expected):
+    assert rule.match(value) == expected
+
+
+def test_affix_matched_in_message():
+    rule = DoesntStartsWith(["tmp-", "test-"], "field {field_name} must not start with {matched}")
+    assert rule.validate("test-42", "id") == "field id must not start with test-"
+    err = DoesntEndsWith(("@mailinator.com", ".invalid")).validate("agung@mailinator.com", "email")
+    assert err.params["matched"] == "@mailinator.com"
+
+
+@pytest.mark.parametrize("kind", [bytes, bytearray, memoryview])
+@pytest.mark.parametrize(
+    "rule,text",
+    [
+        (StartsWith(("62", "65")), "628123"),
+        (StartsWith(("62", "65")), "6"),
+        (StartsWith(tuple(str(number) for number in range(100, 200))), "150-1"),
+        (StartsWith(tuple(str(number) for number in range(100, 200))), "250"),
+        (StartsWith("jalan"), "jalan sudirman"),
+        (StartsWith("é"), "été"),
+        (DoesntStartsWith(["tmp-", "test-"]), "test-42"),
+        (DoesntStartsWith(["tmp-", "test-"]), "prod-42"),
+        (EndsWith((".com", ".co.id")), "agung.co.id"),
+        (EndsWith((".com", ".co.id")), "c"),
+        (DoesntEndsWith(("@mailinator.com", ".invalid")), "agung@mailinator.com"),
+        (InList(["admin", "member", "café"]), "café"),
+        (InList(["admin", "member"]), "root"),
+        (InList(["Gold", "Silver"], ignore_case=True, strip=True), " gold "),
+        (NotBlank(), "agung"),
+    ],
+)
+def test_bytes_like_values_as_text(rule, text, kind):
+    assert rule.validate(kind(text.encode()), "data") == rule.validate(text, "data")
+
+
+@pytest.mark.parametrize("kind", [bytes, bytearray, memoryview])
+def test_length_of_bytes_like_values(kind):
+    value = kind("café".encode())
+    assert Length(min=5, max=5).validate(value, "data") is None
+    assert MinLength(6).validate(value, "data") == "field data must have a minimum length of 6"
+    assert MaxLength(4).validate(value, "data") == "field data must have a maximum length of 4"
+    # the size in bytes, whatever the format of the view
+    assert MaxLength(8).validate(memoryview(bytearray(8)).cast("I"), "data") is None
+
+
+def test_bytes_like_matched_and_value_in_message():
+    assert StartsWith(("1", "1242", "44")).match(b"12425550100") == "1242"
+    assert DoesntEndsWith(("", "x")).match(memoryview(b"abc")) == ""
+    err = EndsWith((".com", ".id")).validate(bytearray(b"agung.invalid\xff"), "email")
+    assert err.params["value"] == "agung.invalid�"
+    err = DoesntStartsWith({"tmp-", "test-"}).validate(memoryview(b"test-42")[1:], "id")
+    assert err is None
+
+
+def test_indexes_are_built_on_first_use():
+    # values no other test uses, the indexes are shared by the rules with the same values
+    roles, prefixes = InList(["owner", "viewer"]), StartsWith(["81", "82"])
+    assert prefixes._index is None
+    assert roles.validate("owner", "role") is None and prefixes.validate("818", "phone") is None
+    assert roles._encoded is None and prefixes._index.encoded is None
+    assert roles.validate(b"owner", "role") is None and prefixes.validate(b"818", "phone") is None
+    assert roles._encoded == {b"owner", b"viewer"}
+    assert prefixes._index.encoded.affixes == (b"81", b"82")
+    assert StartsWith(("81", "82")).validate("821", "phone") is None
+    assert StartsWith(("81", "82"))._affixes() is prefixes._index
+    assert InList(("owner", "viewer"))._index is roles._index
+    assert roles == InList(["owner", "viewer"])
@@ -0,0 +1,64 @@
+import pytest
+
+from apn_validators import vectorized
+from apn_validators.rules import *
+from apn_validators.vectorized import validate_column
+
+numbers = ["10", "-10", 10, -10.5, "10a", "a10", 0.0, 10.6, True, "nan"]
+texts = ["hello", "", "hello world", 1111, "hey", None, "a much longer value", b"bytes", bytearray(b"caf\xc3\xa9"), memoryview(b"hi")]
+
+
+def expected_result(rule, values):
+    results = [rule.validate(value, "data") for value in values]
+    failed = [index for index, error in enumerate(results) if error is not None]
+    return [error is not None for error in results], failed, [results[i] for i in failed]
+
+
+@pytest.mark.parametrize(
+    "rule,values",
+    [
+        (GreaterThenOrEqual(threshold=10), numbers),
+        (GreaterThen(threshold=-10), numbers),
+        (LessThenOrEqual(threshold=10), numbers),
+        (LessThen(threshold=0), numbers),
+        (NumberRange(min=-10, max=10), numbers),
+        (Length(min=3, max=11), texts),
+        (MinLength(min=4), texts),
+        (MaxLength(max=5), texts),
+        (NotBlank(), texts),
+    ],
+)
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_validate_column(rule, values, use_numpy, monkeypatch):
+    if use_numpy and vectorized.np is None:
+        pytest.skip("numpy is not installed")
+    if not use_numpy:
+        monkeypatch.setattr(vectorized, "np", None)
+
+    mask, failed, errors = validate_column(rule, values, "data")
+    assert (list(mask), list(failed), errors) == expected_result(rule, values)
+
+
+def test_validate_column_numpy_arrays():
+    np = pytest.importorskip("numpy")
+
+    readings = np.array([1.5, 20.0, -3.0, 7.25])
+    mask, failed, errors = validate_column(NumberRange(min=0, max=10), readings, "reading")
+    assert mask.tolist() == [False, True, True, False]
+    assert failed.tolist() == [1, 2]
+    assert errors == ["field reading must be between from 0 and 10"] * 2
+
+    names = np.array(["agung", "pn", "validators"])
+    mask, failed, errors = validate_column(Length(min=3, max=5), names, "name")
+    assert failed.tolist() == [1, 2]
+    assert errors == ["field name length must be between 3 and 5"] * 2
+    assert validate_column(MinLength(4), names, "name")[1].tolist() == [1]
+    assert validate_column(MaxLength(5), names, "name")[1].tolist() == [2]
+
+
+def test_length_rules_of_a_list_use_the_per_value_loop(monkeypatch):
+    pytest.importorskip("numpy")
+    # counting the lengths of a list is no faster than validating each value
+    monkeypatch.setattr(vectorized, "_lengths", None)
+    mask, failed, errors = validate_column(Length(min=3, max=5), ["agung", "pn"], "name")
+    assert mask.tolist() == [False, True] and failed.tolist() == [1]